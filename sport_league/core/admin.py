@@ -1,8 +1,12 @@
 from django.contrib import admin
 
-from core.models import Game, Team, User
+from core.models import Game, ImportedFile, ImportJob, League, Season, Standing, Team, User
 
 admin.site.register(User)
 admin.site.register(Game)
 admin.site.register(Team)
-
+admin.site.register(League)
+admin.site.register(Season)
+admin.site.register(Standing)
+admin.site.register(ImportJob)
+admin.site.register(ImportedFile)
@@ -0,0 +1,30 @@
+# Django Imports
+from django.conf import settings
+from django.core.checks import Error, Warning, register
+
+# App Imports
+from utils.ranking_utils import HEAD_TO_HEAD, STANDING_TIE_BREAKERS
+
+
+@register()
+def change_feed_cache_check(app_configs, **kwargs):
+    backend = settings.CACHES['default']['BACKEND']
+    if settings.CHANGE_FEED_ENABLED and backend.endswith('LocMemCache'):
+        return [Warning(
+            "The change feed is enabled with a process-local cache.",
+            hint="Set CACHE_DIR so changes written by one process reach streams served by the others.",
+            id='core.W001',
+        )]
+    return []
+
+
+@register()
+def league_ranking_check(app_configs, **kwargs):
+    unknown = set(settings.LEAGUE_RANKING['tie_breakers']) - set(STANDING_TIE_BREAKERS) - {HEAD_TO_HEAD}
+    if unknown:
+        return [Error(
+            f"Unknown LEAGUE_RANKING tie breakers: {', '.join(sorted(unknown))}.",
+            hint=f"Use {', '.join([*STANDING_TIE_BREAKERS, HEAD_TO_HEAD])}.",
+            id='core.E001',
+        )]
+    return []
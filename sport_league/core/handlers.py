@@ -1,34 +1,58 @@
 # Django Imports
+from django.db import transaction
 from django.http import JsonResponse
+from django.utils import timezone
 
 # App Imports
-from core.models import Game, Team
-from utils.ranking_utils import FirstStrategy, RankingSystem, get_filtered_games, get_ranked_teams
+from core.models import Game, Season, Team
+from utils.ranking_utils import FirstStrategy, RankingSystem, aget_filtered_games, aget_keyset_games, aget_ranked_teams, \
+    get_filtered_games, get_keyset_games, get_ranked_teams, parse_played_at, parse_season
+from utils.batch_utils import GameBatch
+from utils.cache_utils import acached_response, cached_response, get_cache_stats
+from utils.timing_utils import instrumented
 
 # 3r Party Imports
 from http import HTTPStatus
+from functools import partial
 from json import loads, dumps
 
 
 class GamesHandler:
 
+    @instrumented
     def list_games(request):
         request_body = loads(request.body)
-        response = get_filtered_games(
-            searchkey=request_body['search']['value'].strip(), start=request_body['start'],
-            length=request_body['length'], order_by=request_body['order'][0]
-        )
+        if request_body.get('pagination') == 'keyset':
+            compute = partial(
+                get_keyset_games, searchkey=request_body['search']['value'].strip(), length=request_body['length'],
+                order_by=request_body['order'][0], cursor=request_body.get('cursor'), season=request_body.get('season')
+            )
+        else:
+            compute = partial(
+                get_filtered_games, searchkey=request_body['search']['value'].strip(), start=request_body['start'],
+                length=request_body['length'], order_by=request_body['order'][0], season=request_body.get('season')
+            )
+        try:
+            response = cached_response('list_games', request_body, compute)
+        except ValueError as e:
+            return JsonResponse({'error': str(e)}, status=HTTPStatus.BAD_REQUEST)
         response['draw'] = request_body['draw']
         return JsonResponse(data=response, status=HTTPStatus.OK)
 
+    @instrumented
     def delete_game(request):
         request_body = loads(request.body)
         id = request_body.get('id', None)
-        if id:
+        if not id:
+            return JsonResponse({'error': 'Missing game ID'}, status=HTTPStatus.BAD_REQUEST)
+        try:
             game = Game.objects.get(id=id)
-            game.delete()
+        except Game.DoesNotExist:
+            return JsonResponse({'error': 'Game not found'}, status=HTTPStatus.NOT_FOUND)
+        game.delete()
         return JsonResponse(data={}, status=HTTPStatus.OK)
 
+    @instrumented
     def edit_game(request):
         request_body = loads(request.body)
         game_id = request_body.get('id')
@@ -38,21 +62,23 @@ class GamesHandler:
             game = Game.objects.get(id=game_id)
         except Game.DoesNotExist:
             return JsonResponse({'error': 'Game not found'}, status=HTTPStatus.NOT_FOUND)
-        try:
-            host_team = Team.objects.get(name=request_body.get('host_team', game.host_team))
-            game.host_team = host_team
-        except:
-            pass
-        try:
-            guest_team = Team.objects.get(name=request_body.get('guest_team', game.guest_team))
-            game.guest_team = guest_team
-        except:
-            pass
-        game.host_team_score = request_body.get('host_team_score', game.host_team_score)
-        game.guest_team_score = request_body.get('guest_team_score', game.guest_team_score)
-        game.save()
+        with transaction.atomic():
+            try:
+                host_team = Team.objects.get(name=request_body.get('host_team', game.host_team))
+                game.host_team = host_team
+            except:
+                pass
+            try:
+                guest_team = Team.objects.get(name=request_body.get('guest_team', game.guest_team))
+                game.guest_team = guest_team
+            except:
+                pass
+            game.host_team_score = request_body.get('host_team_score', game.host_team_score)
+            game.guest_team_score = request_body.get('guest_team_score', game.guest_team_score)
+            game.save()
         return JsonResponse({'message': 'Game updated successfully'}, status=HTTPStatus.OK)
 
+    @instrumented
     def add_game(request):
         request_body = loads(request.body)
         try:
@@ -63,20 +89,91 @@ class GamesHandler:
             guest_team, _ = Team.objects.get_or_create(name=request_body.get('guest_team'))
         except:
             return JsonResponse({'message': 'Guest team error'}, status=HTTPStatus.BAD_REQUEST)
+        try:
+            season_id = parse_season(request_body.get('season'))
+        except ValueError as e:
+            return JsonResponse({'message': str(e)}, status=HTTPStatus.BAD_REQUEST)
+        if season_id and not Season.objects.filter(id=season_id).exists():
+            return JsonResponse({'message': 'Season not found'}, status=HTTPStatus.BAD_REQUEST)
+        try:
+            played_at = parse_played_at(request_body.get('played_at'))
+        except ValueError as e:
+            return JsonResponse({'message': str(e)}, status=HTTPStatus.BAD_REQUEST)
         host_team_score = request_body.get('host_team_score')
         guest_team_score = request_body.get('guest_team_score')
-        game = Game.objects.create(host_team=host_team, host_team_score=host_team_score, guest_team=guest_team,
-                                   guest_team_score=guest_team_score)
-        game.clean()
-        game.save()
+        with transaction.atomic():
+            game = Game(host_team=host_team, host_team_score=host_team_score, guest_team=guest_team,
+                        guest_team_score=guest_team_score, season_id=season_id,
+                        played_at=played_at or timezone.now())
+            game.clean()
+            game.save()
         return JsonResponse({'message': 'Game updated successfully'}, status=HTTPStatus.OK)
 
+    @instrumented
+    def batch(request):
+        request_body = loads(request.body)
+        try:
+            applied, results = GameBatch(request_body.get('operations')).apply()
+        except ValueError as e:
+            return JsonResponse({'error': str(e)}, status=HTTPStatus.BAD_REQUEST)
+        status = HTTPStatus.OK if applied else HTTPStatus.BAD_REQUEST
+        return JsonResponse({'applied': applied, 'results': results}, status=status)
+
+    @instrumented
     def get_rankings(request):
         request_body = loads(request.body)
-        response = get_ranked_teams(
-            searchkey=request_body['search']['value'].strip(), start=request_body['start'],
-            length=request_body['length'], order_by=request_body['order'][0]
+        compute = partial(
+            get_ranked_teams, searchkey=request_body['search']['value'].strip(), start=request_body['start'],
+            length=request_body['length'], order_by=request_body['order'][0], as_of=request_body.get('as_of'),
+            season=request_body.get('season')
         )
+        try:
+            response = cached_response('get_rankings', request_body, compute)
+        except ValueError as e:
+            return JsonResponse({'error': str(e)}, status=HTTPStatus.BAD_REQUEST)
+        return JsonResponse(data=response)
+
+    @instrumented
+    def get_cache_stats(request):
+        return JsonResponse(data=get_cache_stats(), status=HTTPStatus.OK)
+
+
+# Read operations served from the async `async_handler` view; any other
+# operation falls back to GamesHandler in a worker thread.
+class AsyncGamesHandler:
+
+    @instrumented
+    async def list_games(request):
+        request_body = loads(request.body)
+        if request_body.get('pagination') == 'keyset':
+            compute = partial(
+                aget_keyset_games, searchkey=request_body['search']['value'].strip(), length=request_body['length'],
+                order_by=request_body['order'][0], cursor=request_body.get('cursor'), season=request_body.get('season')
+            )
+        else:
+            compute = partial(
+                aget_filtered_games, searchkey=request_body['search']['value'].strip(), start=request_body['start'],
+                length=request_body['length'], order_by=request_body['order'][0], season=request_body.get('season')
+            )
+        try:
+            response = await acached_response('list_games', request_body, compute)
+        except ValueError as e:
+            return JsonResponse({'error': str(e)}, status=HTTPStatus.BAD_REQUEST)
+        response['draw'] = request_body['draw']
+        return JsonResponse(data=response, status=HTTPStatus.OK)
+
+    @instrumented
+    async def get_rankings(request):
+        request_body = loads(request.body)
+        compute = partial(
+            aget_ranked_teams, searchkey=request_body['search']['value'].strip(), start=request_body['start'],
+            length=request_body['length'], order_by=request_body['order'][0], as_of=request_body.get('as_of'),
+            season=request_body.get('season')
+        )
+        try:
+            response = await acached_response('get_rankings', request_body, compute)
+        except ValueError as e:
+            return JsonResponse({'error': str(e)}, status=HTTPStatus.BAD_REQUEST)
         return JsonResponse(data=response)
 
 
@@ -0,0 +1,100 @@
+# Django Imports
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+# App Imports
+from core.models import Game
+from utils.benchmark_utils import SCORE_DISTRIBUTIONS, compare_results, generate_csv, generate_league, measure, \
+    rolled_back
+from utils.cache_utils import bump_data_version
+from utils.csv_utils import process_csv_file
+from utils.ranking_utils import get_filtered_games, get_ranked_teams, order_games
+
+# 3rd Party Imports
+from json import dump, load
+import io
+import subprocess
+
+
+def current_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+class Command(BaseCommand):
+    help = "Time the ranking, listing and import hot paths on synthetic leagues (rolled back afterwards)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 10000], help="Games per league.")
+        parser.add_argument("--teams", type=int, default=100)
+        parser.add_argument("--max-score", type=int, default=5)
+        parser.add_argument("--distribution", choices=sorted(SCORE_DISTRIBUTIONS), default="uniform")
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument("--page-length", type=int, default=25)
+        parser.add_argument("--output", help="Write the results as JSON to this file.")
+        parser.add_argument("--compare", help="Fail when results regress against this JSON file.")
+        parser.add_argument("--threshold", type=float, default=0.2, help="Allowed relative regression.")
+
+    def scenarios(self, games_count, team_names, options):
+        length = options["page_length"]
+        order_by = {'column': 1, 'dir': 'desc'}
+
+        def ranked_teams():
+            bump_data_version()
+            get_ranked_teams(searchkey='', start=0, length=length, order_by={'column': 0, 'dir': 'asc'})
+
+        def filtered_games():
+            get_filtered_games(searchkey='', start=games_count // 2, length=length, order_by=order_by)
+
+        def ordered_games():
+            list(order_games(query=Game.objects.all(), column_index=2, dir='desc').values_list('id', flat=True))
+
+        csv_data = generate_csv(team_names, games_count, options["max_score"], options["distribution"],
+                                seed=options["seed"]).encode()
+        return {
+            'get_ranked_teams': ranked_teams,
+            'get_filtered_games': filtered_games,
+            'order_games': ordered_games,
+            'process_csv_file': lambda: process_csv_file(io.BytesIO(csv_data)),
+        }
+
+    def handle(self, *args, **options):
+        results = []
+        for games_count in options["sizes"]:
+            with rolled_back():
+                self.stdout.write(f"Generating {options['teams']} teams and {games_count} games...")
+                teams = generate_league(options["teams"], games_count, max_score=options["max_score"],
+                                        seed=options["seed"], distribution=options["distribution"])
+                team_names = list(teams.values_list('name', flat=True))
+                for scenario, func in self.scenarios(games_count, team_names, options).items():
+                    result = {'scenario': scenario, 'games': games_count, **measure(func)}
+                    results.append(result)
+                    self.stdout.write(
+                        f"{scenario:<20} {games_count:>9} games {result['seconds'] * 1000:>10.1f} ms "
+                        f"{result['queries']:>6} queries {result['peak_memory'] / 1024:>10.0f} KiB"
+                    )
+        report = {
+            'commit': current_commit(),
+            'created_at': timezone.now().isoformat(),
+            'options': {key: options[key] for key in ("teams", "max_score", "distribution", "seed", "page_length")},
+            'results': results,
+        }
+        if options["output"]:
+            with open(options["output"], "w") as output:
+                dump(report, output, indent=2)
+            self.stdout.write(f"Results written to {options['output']}.")
+        if options["compare"]:
+            with open(options["compare"]) as baseline:
+                regressions = compare_results(load(baseline), report, options["threshold"])
+            for regression in regressions:
+                self.stdout.write(
+                    f"Regression: {regression['scenario']} at {regression['games']} games, {regression['metric']} "
+                    f"{regression['baseline']} -> {regression['current']}"
+                )
+            if regressions:
+                raise CommandError(f"{len(regressions)} benchmark regressions.")
+            self.stdout.write(self.style.SUCCESS("No regressions."))
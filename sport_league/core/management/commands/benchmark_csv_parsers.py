@@ -0,0 +1,42 @@
+# Django Imports
+from django.core.management.base import BaseCommand
+
+# App Imports
+from utils.benchmark_utils import read_with_blocks, read_with_csv_reader, timed, write_csv_file
+
+# 3rd Party Imports
+import os
+import tempfile
+
+
+class Command(BaseCommand):
+    help = "Compare the csv.reader and memory-mapped block CSV parsers on a large generated file."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--size-mb", type=float, default=1024, help="Size of the generated file.")
+        parser.add_argument("--path", help="Parse this file instead of generating one.")
+        parser.add_argument("--teams", type=int, default=1000)
+        parser.add_argument("--block-size", type=int, help="Bytes per parsed block.")
+        parser.add_argument("--seed", type=int, default=0)
+
+    def handle(self, *args, **options):
+        with tempfile.TemporaryDirectory() as directory:
+            path = options["path"]
+            if not path:
+                path = os.path.join(directory, "games.csv")
+                self.stdout.write(f"Generating a {options['size_mb']:.0f} MB file...")
+                write_csv_file(path, int(options["size_mb"] * 1024 * 1024), options["teams"], seed=options["seed"])
+            size_mb = os.path.getsize(path) / 1024 / 1024
+            parsers = {
+                "csv.reader": lambda: read_with_csv_reader(path),
+                "mmap blocks": lambda: read_with_blocks(path, options["block_size"]),
+            }
+            baseline = expected = None
+            for name, parse in parsers.items():
+                rows, elapsed = timed(parse)
+                expected, baseline = expected or rows, baseline or elapsed
+                matches = "ok" if rows == expected else "MISMATCH"
+                self.stdout.write(
+                    f"{name:<12} {rows:>11} rows {elapsed:>8.2f} s {size_mb / elapsed:>8.1f} MB/s "
+                    f"{rows / elapsed:>11.0f} rows/s {baseline / elapsed:>6.2f}x  {matches}"
+                )
@@ -0,0 +1,43 @@
+# Django Imports
+from django.core.management.base import BaseCommand
+
+# App Imports
+from utils.benchmark_utils import generate_league, rolled_back, timed
+from utils.league_utils import LeagueEngine
+from utils.ranking_utils import AggregateStrategy, FirstStrategy, NumpyStrategy, RankingSystem, StandingsStrategy, np
+
+
+class Command(BaseCommand):
+    help = "Time every ranking strategy on a synthetic league (rolled back afterwards)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--teams", type=int, default=500)
+        parser.add_argument("--games", type=int, default=20000)
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument(
+            "--first-strategy-limit", type=int, default=500,
+            help="Skip FirstStrategy above this many teams, it issues several queries per team."
+        )
+
+    def handle(self, *args, **options):
+        strategies = [StandingsStrategy(), AggregateStrategy()]
+        if options["teams"] <= options["first_strategy_limit"]:
+            strategies.insert(0, FirstStrategy())
+        with rolled_back():
+            self.stdout.write(f"Generating {options['teams']} teams and {options['games']} games...")
+            teams = generate_league(options["teams"], options["games"], seed=options["seed"])
+            runs = [(type(strategy).__name__, strategy, teams) for strategy in strategies]
+            if np is not None:
+                games, elapsed = timed(NumpyStrategy().load_games)
+                self.stdout.write(f"{'Loading game arrays':<32} {elapsed * 1000:>10.1f} ms")
+                runs += [("NumpyStrategy", NumpyStrategy(), teams),
+                         ("NumpyStrategy (preloaded)", NumpyStrategy(games=games), teams)]
+            engine, elapsed = timed(LeagueEngine.load)
+            self.stdout.write(f"{'Loading league engine':<32} {elapsed * 1000:>10.1f} ms")
+            runs.append(("FirstStrategy (engine)", FirstStrategy(), engine.teams))
+            expected = None
+            for name, strategy, run_teams in runs:
+                ranked_teams, elapsed = timed(RankingSystem(strategy).rank_teams, run_teams)
+                expected = expected or ranked_teams
+                matches = "ok" if ranked_teams == expected else "MISMATCH"
+                self.stdout.write(f"{name:<32} {elapsed * 1000:>10.1f} ms  {matches}")
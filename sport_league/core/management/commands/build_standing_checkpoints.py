@@ -0,0 +1,17 @@
+# Django Imports
+from django.core.management.base import BaseCommand
+
+# App Imports
+from utils.standings_utils import build_standing_checkpoints
+
+
+class Command(BaseCommand):
+    help = "Store cumulative standings checkpoints for point-in-time rankings."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--every", type=int, help="Games between two checkpoints.")
+        parser.add_argument("--rebuild", action="store_true", help="Drop existing checkpoints first.")
+
+    def handle(self, *args, **options):
+        created = build_standing_checkpoints(every=options["every"], rebuild=options["rebuild"])
+        self.stdout.write(self.style.SUCCESS(f"Created {created} checkpoints."))
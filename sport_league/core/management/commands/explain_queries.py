@@ -0,0 +1,40 @@
+# Django Imports
+from django.core.management.base import BaseCommand
+
+# App Imports
+from core.models import Game, Team
+from utils.ranking_utils import (
+    GAME_LIST_COLUMNS, GAME_ORDER_COLUMNS, AggregateStrategy, StandingsStrategy, order_games,
+    search_games_by_searchkey
+)
+
+
+class Command(BaseCommand):
+    help = "Print the query plan of every list_games and get_rankings query variant."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--search", default="team", help="Search key used for the filtered variants.")
+        parser.add_argument("--length", type=int, default=10, help="Page length used for the listing variants.")
+
+    def explain(self, title, queryset):
+        self.stdout.write(self.style.MIGRATE_HEADING(f"== {title}"))
+        self.stdout.write(queryset.explain())
+        self.stdout.write("")
+
+    def handle(self, *args, **options):
+        length = options["length"]
+        for searchkey in ("", options["search"]):
+            for column_index, column in GAME_ORDER_COLUMNS.items():
+                for dir in ("asc", "desc"):
+                    games = search_games_by_searchkey(query=Game.objects.all(), searchkey=searchkey)
+                    games = order_games(query=games, column_index=column_index, dir=dir)
+                    self.explain(
+                        f"list_games order={column} {dir} search={searchkey!r}",
+                        games.values_list(*GAME_LIST_COLUMNS)[:length]
+                    )
+            self.explain(
+                f"list_games count search={searchkey!r}",
+                search_games_by_searchkey(query=Game.objects.all(), searchkey=searchkey).values("id")
+            )
+        for strategy in (StandingsStrategy(), AggregateStrategy()):
+            self.explain(f"get_rankings {type(strategy).__name__}", strategy.ranked_queryset(Team.objects.all()))
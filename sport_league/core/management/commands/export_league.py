@@ -0,0 +1,30 @@
+# Django Imports
+from django.core.management.base import BaseCommand, CommandError
+
+# App Imports
+from core.models import Season
+from utils.export_utils import EXPORT_FORMATS, EXPORTS, export_chunks
+
+
+class Command(BaseCommand):
+    help = "Stream every game or the current standings as CSV or NDJSON."
+
+    def add_arguments(self, parser):
+        parser.add_argument("export", choices=list(EXPORTS))
+        parser.add_argument("--format", choices=list(EXPORT_FORMATS), default="csv")
+        parser.add_argument("--season", type=int, help="Only export this season.")
+        parser.add_argument("--chunk-size", type=int, help="Rows fetched and written per chunk.")
+        parser.add_argument("--output", help="File to write to instead of stdout.")
+
+    def handle(self, *args, **options):
+        season = options["season"]
+        if season and not Season.objects.filter(id=season).exists():
+            raise CommandError(f"Season {season} not found.")
+        chunks = export_chunks(options["export"], options["format"], season=season, chunk_size=options["chunk_size"])
+        if not options["output"]:
+            for chunk in chunks:
+                self.stdout.write(chunk, ending="")
+            return
+        with open(options["output"], "w", newline="") as output:
+            output.writelines(chunks)
+        self.stderr.write(self.style.SUCCESS(f"Exported {options['export']} to {options['output']}."))
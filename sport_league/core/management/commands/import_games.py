@@ -0,0 +1,38 @@
+# Django Imports
+from django.core.management.base import BaseCommand, CommandError
+
+# App Imports
+from core.models import Season
+from utils.import_utils import expand_paths, import_files
+
+MAX_ERRORS_SHOWN = 5
+
+
+class Command(BaseCommand):
+    help = "Import games from many CSV files or globs."
+
+    def add_arguments(self, parser):
+        parser.add_argument("paths", nargs="+", help="CSV files or glob patterns such as 'results/**/*.csv'.")
+        parser.add_argument("--season", type=int, help="Import every game into this season.")
+        parser.add_argument("--batch-size", type=int, help="Rows inserted per bulk batch.")
+
+    def handle(self, *args, **options):
+        season = options["season"]
+        if season and not Season.objects.filter(id=season).exists():
+            raise CommandError(f"Season {season} not found.")
+        paths = expand_paths(options["paths"])
+        report = import_files(paths, season=season, batch_size=options["batch_size"])
+
+        failed = [file for file in report["files"] if file["errors"]]
+        for file in failed:
+            self.stderr.write(f"{file['path']}: {len(file['errors'])} errors, file skipped")
+            for error in file["errors"][:MAX_ERRORS_SHOWN]:
+                self.stderr.write(f"  {error}")
+        self.stdout.write(self.style.SUCCESS(
+            f"Imported {report['rows']} games from {len(paths) - len(failed)} of {len(paths)} files "
+            f"in {report['seconds']:.2f}s ({report['rows_per_second']:.0f} rows/sec)."
+        ))
+        if report["skipped"] or report["duplicate_files"]:
+            self.stdout.write(
+                f"{report['skipped']} already imported rows and {report['duplicate_files']} identical files skipped."
+            )
@@ -0,0 +1,102 @@
+# Django Imports
+from django.core.management.base import BaseCommand
+from django.db import connections
+from django.test import AsyncClient, Client
+from django.test.utils import override_settings
+from django.urls import reverse
+
+# App Imports
+from core.models import User
+from utils.benchmark_utils import generate_league
+
+# 3rd Party Imports
+from concurrent.futures import ThreadPoolExecutor
+from json import dumps
+from statistics import quantiles
+from uuid import uuid4
+import asyncio
+import time
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare the throughput of read operations through the sync handler (WSGI, one thread per "
+        "request) and the async handler (ASGI, one event loop), both served in process."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--operation", choices=["get_rankings", "list_games"], default="get_rankings")
+        parser.add_argument("--requests", type=int, default=500)
+        parser.add_argument("--concurrency", type=int, default=20)
+        parser.add_argument("--distinct", action="store_true", help="Make every request miss the response cache.")
+        parser.add_argument("--teams", type=int, default=0, help="Generate a synthetic league first.")
+        parser.add_argument("--games", type=int, default=0)
+
+    def payloads(self, options):
+        for index in range(options["requests"]):
+            yield dumps({
+                'operation': options["operation"], 'draw': 1, 'search': {'value': ''},
+                'start': 0, 'length': 10 + index if options["distinct"] else 10, 'order': [{'column': 0, 'dir': 'asc'}],
+            })
+
+    def run_wsgi(self, cookies, payloads, concurrency):
+        url = reverse("core:handler")
+
+        def send(payload):
+            client = Client()
+            client.cookies = cookies
+            started = time.perf_counter()
+            status = client.post(url, data=payload, content_type="application/json").status_code
+            return time.perf_counter() - started, status
+
+        try:
+            with ThreadPoolExecutor(concurrency, initializer=connections.close_all) as pool:
+                return list(pool.map(send, payloads))
+        finally:
+            connections.close_all()
+
+    async def run_asgi(self, cookies, payloads, concurrency):
+        url = reverse("core:async_handler")
+        semaphore = asyncio.Semaphore(concurrency)
+        client = AsyncClient()
+        client.cookies = cookies
+
+        async def send(payload):
+            async with semaphore:
+                started = time.perf_counter()
+                response = await client.post(url, data=payload, content_type="application/json")
+                return time.perf_counter() - started, response.status_code
+
+        return await asyncio.gather(*(send(payload) for payload in payloads))
+
+    def report(self, name, results, elapsed):
+        latencies = sorted(latency for latency, _ in results)
+        errors = sum(status != 200 for _, status in results)
+        p50, p95 = (quantiles(latencies, n=20)[index] for index in (9, 18)) if len(latencies) > 1 else (0, 0)
+        self.stdout.write(
+            f"{name:<5} {len(results):>7} requests {elapsed:>8.2f}s {len(results) / elapsed:>9.1f} req/s "
+            f"p50 {p50 * 1000:>7.1f} ms  p95 {p95 * 1000:>7.1f} ms  {errors} errors"
+        )
+
+    def handle(self, *args, **options):
+        user = User.objects.create_user(email=f"load-test-{uuid4().hex}@example.com", password=uuid4().hex)
+        teams = None
+        try:
+            if options["games"]:
+                self.stdout.write(f"Generating {options['teams']} teams and {options['games']} games...")
+                teams = generate_league(max(options["teams"], 2), options["games"])
+            with override_settings(ALLOWED_HOSTS=["testserver"], REQUEST_TIMING_SAMPLE_RATE=0):
+                client = Client()
+                client.force_login(user)
+                for name, run in (("WSGI", self.run_wsgi), ("ASGI", self.run_asgi)):
+                    payloads = list(self.payloads(options))
+                    started = time.perf_counter()
+                    results = run(client.cookies, payloads, options["concurrency"])
+                    if asyncio.iscoroutine(results):
+                        results = asyncio.run(results)
+                    self.report(name, results, time.perf_counter() - started)
+                client.logout()
+        finally:
+            if teams is not None:
+                teams.delete()
+            user.delete()
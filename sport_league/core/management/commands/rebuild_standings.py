@@ -0,0 +1,15 @@
+# Django Imports
+from django.core.management.base import BaseCommand
+
+# App Imports
+from utils.feed_utils import record_changes
+from utils.standings_utils import rebuild_standings
+
+
+class Command(BaseCommand):
+    help = "Rebuild the standings table from scratch using every recorded game."
+
+    def handle(self, *args, **options):
+        teams_count = rebuild_standings()
+        record_changes()
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt standings for {teams_count} teams."))
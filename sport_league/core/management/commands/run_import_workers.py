@@ -0,0 +1,32 @@
+# Django Imports
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+# App Imports
+from utils.import_utils import run_worker
+
+# 3rd Party Imports
+from multiprocessing import Process
+
+
+class Command(BaseCommand):
+    help = "Process queued CSV import jobs with a pool of worker processes."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--workers", type=int, default=2, help="Number of worker processes.")
+        parser.add_argument("--poll-interval", type=float, default=2, help="Seconds to wait when the queue is empty.")
+        parser.add_argument("--once", action="store_true", help="Exit once the queue is empty.")
+
+    def handle(self, *args, **options):
+        worker_options = {"poll_interval": options["poll_interval"], "once": options["once"]}
+        if options["workers"] <= 1:
+            run_worker(**worker_options)
+            return
+        # Forked workers must open their own database connections.
+        connections.close_all()
+        workers = [Process(target=run_worker, kwargs=worker_options) for _ in range(options["workers"])]
+        for worker in workers:
+            worker.start()
+        self.stdout.write(f"Started {len(workers)} import workers.")
+        for worker in workers:
+            worker.join()
@@ -0,0 +1,63 @@
+# App Imports
+from utils.timing_utils import RequestTiming, current_query_timer, response_size, server_timing_header, \
+    should_sample
+
+# 3rd Party Imports
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from json import dumps
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class RequestTimingMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        if not should_sample():
+            return self.get_response(request)
+        timing = self.start(request)
+        try:
+            response = self.get_response(request)
+        finally:
+            current_query_timer.reset(timing.token)
+        return self.finish(request, response, timing)
+
+    async def __acall__(self, request):
+        if not should_sample():
+            return await self.get_response(request)
+        timing = self.start(request)
+        try:
+            response = await self.get_response(request)
+        finally:
+            current_query_timer.reset(timing.token)
+        return self.finish(request, response, timing)
+
+    def start(self, request):
+        request.timing = timing = RequestTiming()
+        timing.token = current_query_timer.set(timing.query_timer)
+        return timing
+
+    def finish(self, request, response, timing):
+        record = {
+            'method': request.method,
+            'path': request.path,
+            'status': response.status_code,
+            'duration_ms': timing.elapsed() * 1000,
+            'queries': timing.query_timer.queries,
+            'db_ms': timing.query_timer.db_seconds * 1000,
+            'response_bytes': response_size(response),
+            'operations': timing.operations,
+        }
+        response['Server-Timing'] = server_timing_header(record)
+        logger.info(dumps(record))
+        return response
@@ -0,0 +1,59 @@
+# Generated by Django 4.2 on 2026-10-18 17:54
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def build_standings(apps, schema_editor):
+    Game = apps.get_model('core', 'Game')
+    Standing = apps.get_model('core', 'Standing')
+    standings = {}
+    games = Game.objects.values_list('host_team_id', 'host_team_score', 'guest_team_id', 'guest_team_score')
+    for host_team_id, host_team_score, guest_team_id, guest_team_score in games.iterator():
+        sides = (
+            (host_team_id, host_team_score, guest_team_score),
+            (guest_team_id, guest_team_score, host_team_score),
+        )
+        for team_id, scored, conceded in sides:
+            standing = standings.setdefault(team_id, Standing(team_id=team_id))
+            standing.played += 1
+            standing.goals_for += scored
+            standing.goals_against += conceded
+            if scored > conceded:
+                standing.wins += 1
+                standing.points += 3
+            elif scored == conceded:
+                standing.draws += 1
+                standing.points += 1
+            else:
+                standing.losses += 1
+    Standing.objects.bulk_create(standings.values())
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Standing',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('played', models.IntegerField(default=0)),
+                ('wins', models.IntegerField(default=0)),
+                ('draws', models.IntegerField(default=0)),
+                ('losses', models.IntegerField(default=0)),
+                ('points', models.IntegerField(default=0)),
+                ('goals_for', models.IntegerField(default=0)),
+                ('goals_against', models.IntegerField(default=0)),
+                ('team', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='standing', to='core.team')),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='standing',
+            index=models.Index(fields=['-points'], name='standing_points_idx'),
+        ),
+        migrations.RunPython(build_standings, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,42 @@
+# Generated by Django 4.2 on 2026-10-18 18:01
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def index_team_names(apps, schema_editor):
+    Team = apps.get_model('core', 'Team')
+    TeamNameGram = apps.get_model('core', 'TeamNameGram')
+    grams = []
+    for team_id, name in Team.objects.values_list('id', 'name').iterator():
+        name = name.lower()
+        for gram in {name[index:index + 3] for index in range(len(name) - 2)}:
+            grams.append(TeamNameGram(team_id=team_id, gram=gram))
+    TeamNameGram.objects.bulk_create(grams, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0003_importjob'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TeamNameGram',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('gram', models.CharField(max_length=3)),
+                ('team', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='name_grams', to='core.team')),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='teamnamegram',
+            index=models.Index(fields=['gram', 'team'], name='team_name_gram_idx'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='teamnamegram',
+            unique_together={('team', 'gram')},
+        ),
+        migrations.RunPython(index_team_names, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 4.2 on 2026-10-18 18:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0004_teamnamegram'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='game',
+            index=models.Index(fields=['host_team_score', 'id'], name='game_host_score_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='game',
+            index=models.Index(fields=['guest_team_score', 'id'], name='game_guest_score_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='game',
+            index=models.Index(fields=['host_team', 'host_team_score', 'guest_team_score'], name='game_host_results_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='game',
+            index=models.Index(fields=['guest_team', 'guest_team_score', 'host_team_score'], name='game_guest_results_idx'),
+        ),
+    ]
@@ -0,0 +1,63 @@
+# Generated by Django 4.2 on 2026-10-18 18:17
+
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0005_game_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StandingCheckpoint',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('played_at', models.DateTimeField()),
+                ('last_game_id', models.BigIntegerField()),
+                ('games_count', models.PositiveIntegerField()),
+            ],
+        ),
+        migrations.CreateModel(
+            name='StandingCheckpointRow',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('played', models.IntegerField(default=0)),
+                ('wins', models.IntegerField(default=0)),
+                ('draws', models.IntegerField(default=0)),
+                ('losses', models.IntegerField(default=0)),
+                ('points', models.IntegerField(default=0)),
+                ('goals_for', models.IntegerField(default=0)),
+                ('goals_against', models.IntegerField(default=0)),
+            ],
+            options={
+                'abstract': False,
+            },
+        ),
+        migrations.AddField(
+            model_name='game',
+            name='played_at',
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+        migrations.AddIndex(
+            model_name='game',
+            index=models.Index(fields=['played_at', 'id'], name='game_played_at_idx'),
+        ),
+        migrations.AddField(
+            model_name='standingcheckpointrow',
+            name='checkpoint',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='rows', to='core.standingcheckpoint'),
+        ),
+        migrations.AddField(
+            model_name='standingcheckpointrow',
+            name='team',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='checkpoint_rows', to='core.team'),
+        ),
+        migrations.AddIndex(
+            model_name='standingcheckpoint',
+            index=models.Index(fields=['played_at', 'last_game_id'], name='checkpoint_position_idx'),
+        ),
+    ]
@@ -0,0 +1,99 @@
+# Generated by Django 4.2 on 2026-10-18 18:22
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0006_standing_checkpoints'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='League',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=255, unique=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='Season',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=255)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='SeasonStanding',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('played', models.IntegerField(default=0)),
+                ('wins', models.IntegerField(default=0)),
+                ('draws', models.IntegerField(default=0)),
+                ('losses', models.IntegerField(default=0)),
+                ('points', models.IntegerField(default=0)),
+                ('goals_for', models.IntegerField(default=0)),
+                ('goals_against', models.IntegerField(default=0)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='seasonstanding',
+            name='season',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='standings', to='core.season'),
+        ),
+        migrations.AddField(
+            model_name='seasonstanding',
+            name='team',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='season_standings', to='core.team'),
+        ),
+        migrations.AddField(
+            model_name='season',
+            name='league',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='seasons', to='core.league'),
+        ),
+        migrations.AddField(
+            model_name='season',
+            name='teams',
+            field=models.ManyToManyField(related_name='seasons', through='core.SeasonStanding', to='core.team'),
+        ),
+        migrations.AddField(
+            model_name='game',
+            name='season',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='games', to='core.season'),
+        ),
+        migrations.AddField(
+            model_name='importjob',
+            name='season',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='import_jobs', to='core.season'),
+        ),
+        migrations.AddIndex(
+            model_name='game',
+            index=models.Index(fields=['season', 'id'], name='game_season_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='game',
+            index=models.Index(fields=['season', 'host_team_score', 'id'], name='game_season_host_score_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='game',
+            index=models.Index(fields=['season', 'guest_team_score', 'id'], name='game_season_guest_score_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='game',
+            index=models.Index(fields=['season', 'played_at', 'id'], name='game_season_played_at_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='seasonstanding',
+            index=models.Index(fields=['season', '-points'], name='season_standing_points_idx'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='seasonstanding',
+            unique_together={('season', 'team')},
+        ),
+        migrations.AlterUniqueTogether(
+            name='season',
+            unique_together={('league', 'name')},
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 4.2 on 2026-10-18 19:42
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0008_import_fingerprints'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='game',
+            name='imported_file',
+            field=models.ForeignKey(blank=True, editable=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='games', to='core.importedfile'),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 4.2 on 2026-10-18 20:16
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0010_data_version'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='importedfile',
+            name='lineage',
+            field=models.CharField(blank=True, default='', max_length=64),
+        ),
+        migrations.AddField(
+            model_name='importedfile',
+            name='size',
+            field=models.PositiveBigIntegerField(blank=True, null=True),
+        ),
+    ]
@@ -3,6 +3,7 @@ from django.contrib.auth.base_user import BaseUserManager
 from django.contrib.auth.models import AbstractUser
 from django.db import models
 from django.forms import ValidationError
+from django.utils import timezone
 
 
 class UserManager(BaseUserManager):
@@ -73,7 +74,47 @@ class Team(models.Model):
         return self.name if self.name else str(self.id)
 
 
+class TeamNameGram(models.Model):
+    team = models.ForeignKey(
+        Team, related_name="name_grams", on_delete=models.CASCADE
+    )
+    gram = models.CharField(max_length=3)
+
+    class Meta:
+        unique_together = ("team", "gram")
+        indexes = [
+            models.Index(fields=["gram", "team"], name="team_name_gram_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.team} ({self.gram})"
+
+
+class League(models.Model):
+    name = models.CharField(max_length=255, unique=True)
+
+    def __str__(self):
+        return self.name
+
+
+class Season(models.Model):
+    league = models.ForeignKey(
+        League, related_name="seasons", on_delete=models.CASCADE
+    )
+    name = models.CharField(max_length=255)
+    teams = models.ManyToManyField(Team, through="SeasonStanding", related_name="seasons")
+
+    class Meta:
+        unique_together = ("league", "name")
+
+    def __str__(self):
+        return f"{self.league} {self.name}"
+
+
 class Game(models.Model):
+    season = models.ForeignKey(
+        Season, related_name="games", null=True, blank=True, on_delete=models.PROTECT
+    )
     host_team = models.ForeignKey(
         Team, related_name="host_games", on_delete=models.CASCADE
     )
@@ -82,6 +123,28 @@ class Game(models.Model):
         Team, related_name="guest_games", on_delete=models.CASCADE
     )
     guest_team_score = models.PositiveIntegerField()
+    played_at = models.DateTimeField(default=timezone.now)
+    # Set on imported games only, so re-imported rows and files can be recognised.
+    fingerprint = models.CharField(max_length=32, null=True, blank=True, unique=True, editable=False)
+    imported_file = models.ForeignKey(
+        "ImportedFile", related_name="games", null=True, blank=True, editable=False, on_delete=models.SET_NULL
+    )
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["played_at", "id"], name="game_played_at_idx"),
+            # Sort columns of the games listing, with id as the tie-break.
+            models.Index(fields=["host_team_score", "id"], name="game_host_score_idx"),
+            models.Index(fields=["guest_team_score", "id"], name="game_guest_score_idx"),
+            # Covering indexes for the per-team standings aggregation.
+            models.Index(fields=["host_team", "host_team_score", "guest_team_score"], name="game_host_results_idx"),
+            models.Index(fields=["guest_team", "guest_team_score", "host_team_score"], name="game_guest_results_idx"),
+            # The same sort columns inside one season.
+            models.Index(fields=["season", "id"], name="game_season_idx"),
+            models.Index(fields=["season", "host_team_score", "id"], name="game_season_host_score_idx"),
+            models.Index(fields=["season", "guest_team_score", "id"], name="game_season_guest_score_idx"),
+            models.Index(fields=["season", "played_at", "id"], name="game_season_played_at_idx"),
+        ]
 
     def __str__(self):
         return f"{self.host_team} ({self.host_team_score}) - {self.guest_team} ({self.guest_team_score})"
@@ -104,3 +167,138 @@ class Game(models.Model):
     def clean(self):
         if self.host_team.name == self.guest_team.name:
             raise ValidationError("Guest and Host teams must not be the same.")
+
+
+class StandingStats(models.Model):
+    played = models.IntegerField(default=0)
+    wins = models.IntegerField(default=0)
+    draws = models.IntegerField(default=0)
+    losses = models.IntegerField(default=0)
+    points = models.IntegerField(default=0)
+    goals_for = models.IntegerField(default=0)
+    goals_against = models.IntegerField(default=0)
+
+    class Meta:
+        abstract = True
+
+    @property
+    def goal_difference(self):
+        return self.goals_for - self.goals_against
+
+
+class Standing(StandingStats):
+    team = models.OneToOneField(
+        Team, related_name="standing", on_delete=models.CASCADE
+    )
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["-points"], name="standing_points_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.team} ({self.points})"
+
+
+# Standings of one season. A row also makes its team a member of the season.
+class SeasonStanding(StandingStats):
+    season = models.ForeignKey(
+        Season, related_name="standings", on_delete=models.CASCADE
+    )
+    team = models.ForeignKey(
+        Team, related_name="season_standings", on_delete=models.CASCADE
+    )
+
+    class Meta:
+        unique_together = ("season", "team")
+        indexes = [
+            models.Index(fields=["season", "-points"], name="season_standing_points_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.team} ({self.points})"
+
+
+class StandingCheckpoint(models.Model):
+    # Cumulative standings of every game up to (played_at, last_game_id).
+    played_at = models.DateTimeField()
+    last_game_id = models.BigIntegerField()
+    games_count = models.PositiveIntegerField()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["played_at", "last_game_id"], name="checkpoint_position_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.played_at} ({self.games_count} games)"
+
+
+class StandingCheckpointRow(StandingStats):
+    checkpoint = models.ForeignKey(
+        StandingCheckpoint, related_name="rows", on_delete=models.CASCADE
+    )
+    team = models.ForeignKey(
+        Team, related_name="checkpoint_rows", on_delete=models.CASCADE
+    )
+
+    def __str__(self):
+        return f"{self.team} ({self.points})"
+
+
+class ImportJob(models.Model):
+    PENDING = "pending"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+    STATUS_CHOICES = (
+        (PENDING, "Pending"),
+        (RUNNING, "Running"),
+        (SUCCEEDED, "Succeeded"),
+        (FAILED, "Failed"),
+    )
+
+    file_name = models.CharField(max_length=255)
+    path = models.CharField(max_length=1024)
+    status = models.CharField(max_length=16, choices=STATUS_CHOICES, default=PENDING, db_index=True)
+    rows_processed = models.PositiveIntegerField(default=0)
+    rows_per_second = models.FloatField(null=True, blank=True)
+    error = models.TextField(blank=True)
+    season = models.ForeignKey(
+        Season, related_name="import_jobs", null=True, blank=True, on_delete=models.SET_NULL
+    )
+    created_by = models.ForeignKey(
+        User, related_name="import_jobs", null=True, blank=True, on_delete=models.SET_NULL
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"{self.file_name} ({self.status})"
+
+
+class ImportedFile(models.Model):
+    digest = models.CharField(max_length=64, unique=True)
+    file_name = models.CharField(max_length=255, blank=True)
+    size = models.PositiveBigIntegerField(null=True, blank=True)
+    # Digest of the first file of the series this file extends; empty for files
+    # recorded before series were tracked, whose rows are matched by file name.
+    lineage = models.CharField(max_length=64, blank=True, default='')
+    season = models.ForeignKey(
+        Season, related_name="imported_files", null=True, blank=True, on_delete=models.SET_NULL
+    )
+    rows = models.PositiveIntegerField(default=0)
+    imported_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"{self.file_name} ({self.rows} rows)"
+
+
+# A single row whose version changes with every write to league data. It lives
+# in the database so that every worker process sees the same version.
+class DataVersion(models.Model):
+    version = models.CharField(max_length=32)
+
+    def __str__(self):
+        return self.version
@@ -0,0 +1,81 @@
+# Django Imports
+from django.db.backends.signals import connection_created
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+# App Imports
+from core.models import Game, Team
+from utils.cache_utils import bump_data_version
+from utils.feed_utils import record_changes
+from utils.search_utils import index_team_names
+from utils.standings_utils import invalidate_standing_checkpoints, record_game
+from utils.timing_utils import install_query_timer
+
+
+@receiver(post_save, sender=Team)
+def index_team_name(sender, instance, created, raw=False, **kwargs):
+    if not raw:
+        index_team_names([instance], replace=not created)
+
+
+@receiver(post_save, sender=Game)
+@receiver(post_delete, sender=Game)
+@receiver(post_save, sender=Team)
+@receiver(post_delete, sender=Team)
+def league_data_changed(sender, raw=False, **kwargs):
+    if not raw:
+        bump_data_version()
+
+
+@receiver(post_save, sender=Game)
+@receiver(post_delete, sender=Game)
+def game_changed(sender, instance, raw=False, **kwargs):
+    if not raw:
+        record_changes([instance.id])
+
+
+@receiver(post_save, sender=Team)
+@receiver(post_delete, sender=Team)
+def team_changed(sender, raw=False, created=False, **kwargs):
+    # A renamed or deleted team changes game rows that were not touched.
+    if not raw:
+        record_changes(reset=not created)
+
+
+# Standings follow every saved or deleted game, whoever writes it: the row as
+# it was before the save is subtracted and the saved one added. Bulk writers
+# (imports, batches) send no signals and apply their own deltas.
+@receiver(pre_save, sender=Game)
+def remember_recorded_game(sender, instance, raw=False, **kwargs):
+    instance._recorded_game = None
+    if not raw and instance.pk:
+        instance._recorded_game = Game.objects.filter(pk=instance.pk).only(
+            'season_id', 'host_team_id', 'host_team_score', 'guest_team_id', 'guest_team_score'
+        ).first()
+
+
+@receiver(post_save, sender=Game)
+def record_saved_game(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    with transaction.atomic():
+        if getattr(instance, '_recorded_game', None) is not None:
+            record_game(instance._recorded_game, sign=-1)
+        record_game(instance)
+    instance._recorded_game = None
+
+
+@receiver(post_delete, sender=Game)
+def record_deleted_game(sender, instance, **kwargs):
+    record_game(instance, sign=-1)
+
+
+@receiver(post_save, sender=Game)
+@receiver(post_delete, sender=Game)
+def game_history_changed(sender, instance, raw=False, **kwargs):
+    if not raw:
+        invalidate_standing_checkpoints(instance.played_at)
+
+
+connection_created.connect(install_query_timer)
@@ -0,0 +1,21 @@
+# Django Imports
+from django.test import override_settings
+from django.test.runner import DiscoverRunner
+
+# 3rd Party Imports
+import tempfile
+
+
+class TestRunner(DiscoverRunner):
+    """Runs the tests with metrics files in a temporary METRICS_DIR and no sampled request logs."""
+
+    def setup_test_environment(self, **kwargs):
+        super().setup_test_environment(**kwargs)
+        self.metrics_dir = tempfile.TemporaryDirectory()
+        self.test_settings = override_settings(METRICS_DIR=self.metrics_dir.name, REQUEST_TIMING_SAMPLE_RATE=0)
+        self.test_settings.enable()
+
+    def teardown_test_environment(self, **kwargs):
+        self.test_settings.disable()
+        self.metrics_dir.cleanup()
+        super().teardown_test_environment(**kwargs)
@@ -0,0 +1,192 @@
+# Django Imports
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase, TransactionTestCase
+
+# App Imports
+from core.models import Team, Game, Standing, User
+
+# 3rd Party Imports
+from io import StringIO
+from json import dump, load
+import os
+import tempfile
+from unittest import skipUnless
+
+# Optional Imports
+from utils.ranking_utils import np
+
+
+class RebuildStandingsCommandTestCase(TestCase):
+    def setUp(self):
+        self.team1 = Team.objects.create(name="Team 1")
+        self.team2 = Team.objects.create(name="Team 2")
+        Game.objects.create(host_team=self.team1, host_team_score=2, guest_team=self.team2, guest_team_score=0)
+
+    def test_rebuild_standings(self):
+        out = StringIO()
+        call_command("rebuild_standings", stdout=out)
+        self.assertIn("Rebuilt standings for 2 teams.", out.getvalue())
+        self.assertEqual(Standing.objects.get(team=self.team1).points, 3)
+
+
+class ExportLeagueCommandTestCase(TestCase):
+    def setUp(self):
+        self.team1 = Team.objects.create(name="Team 1")
+        self.team2 = Team.objects.create(name="Team 2")
+        for score in range(3):
+            Game.objects.create(host_team=self.team1, host_team_score=score, guest_team=self.team2, guest_team_score=1)
+
+    def test_export_games_to_stdout_in_chunks(self):
+        out = StringIO()
+        call_command("export_league", "games", "--format", "ndjson", "--chunk-size", "2", stdout=out)
+        self.assertEqual([load(StringIO(line))["host_team_score"] for line in out.getvalue().splitlines()], [0, 1, 2])
+
+    def test_export_standings_to_file(self):
+        call_command("rebuild_standings", stdout=StringIO())
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "standings.csv")
+            call_command("export_league", "standings", "--output", path, stderr=StringIO())
+            with open(path) as export:
+                lines = export.read().splitlines()
+        self.assertEqual(lines[0], "rank,team,played,wins,draws,losses,points,goals_for,goals_against,goal_difference")
+        self.assertEqual(lines[1], "1,Team 1,3,1,1,1,4,3,3,0")
+
+    def test_unknown_season(self):
+        with self.assertRaises(CommandError):
+            call_command("export_league", "games", "--season", "99")
+
+
+class ImportGamesCommandTestCase(TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        files = {
+            "2001/a.csv": "Team 1,2,Team 2,0\nTeam 2,1,Team 3,1\n",
+            "2002/b.csv": "Team 3,0,Team 1,1\n",
+            "2002/bad.csv": "Team 1,2,Team 4,0\nTeam 4,x,Team 1,0\nTeam 4\n",
+        }
+        for name, content in files.items():
+            os.makedirs(os.path.dirname(os.path.join(self.directory.name, name)), exist_ok=True)
+            with open(os.path.join(self.directory.name, name), "w") as csv_file:
+                csv_file.write(content)
+
+    def import_games(self, *args):
+        out, err = StringIO(), StringIO()
+        call_command("import_games", *args, stdout=out, stderr=err)
+        return out.getvalue(), err.getvalue()
+
+    def assert_imported(self, out, err):
+        self.assertIn("Imported 3 games from 2 of 3 files", out)
+        self.assertIn("bad.csv: 2 errors, file skipped", err)
+        self.assertIn("Line 2: scores must be integers.", err)
+        self.assertEqual(sorted(Team.objects.values_list("name", flat=True)), ["Team 1", "Team 2", "Team 3"])
+        self.assertEqual(Standing.objects.get(team__name="Team 1").points, 6)
+
+    def test_import_globs_inline(self):
+        self.assert_imported(*self.import_games(os.path.join(self.directory.name, "**", "*.csv")))
+
+    def test_import_listed_files_and_globs(self):
+        out, err = self.import_games(os.path.join(self.directory.name, "2001", "a.csv"),
+                                     os.path.join(self.directory.name, "2002", "*.csv"))
+        self.assert_imported(out, err)
+
+    def test_identical_files_are_imported_once(self):
+        a_copy = os.path.join(self.directory.name, "2002", "a_copy.csv")
+        with open(os.path.join(self.directory.name, "2001", "a.csv")) as source, open(a_copy, "w") as copy:
+            copy.write(source.read())
+        out, _ = self.import_games(os.path.join(self.directory.name, "200?", "a*.csv"))
+        self.assertIn("Imported 2 games from 2 of 2 files", out)
+        self.assertIn("1 identical files skipped", out)
+        out, _ = self.import_games(os.path.join(self.directory.name, "**", "*.csv"))
+        self.assertIn("Imported 1 games from 3 of 4 files", out)
+        self.assertIn("2 identical files skipped", out)
+        self.assertEqual(Game.objects.count(), 3)
+
+    def test_missing_file_is_reported(self):
+        out, err = self.import_games(os.path.join(self.directory.name, "missing.csv"))
+        self.assertIn("Imported 0 games from 0 of 1 files", out)
+        self.assertIn("missing.csv: 1 errors, file skipped", err)
+
+
+class ExplainQueriesCommandTestCase(TestCase):
+    def setUp(self):
+        Game.objects.create(host_team=Team.objects.create(name="Team 1"), host_team_score=1,
+                            guest_team=Team.objects.create(name="Team 2"), guest_team_score=1)
+
+    def test_explain_queries(self):
+        out = StringIO()
+        call_command("explain_queries", stdout=out)
+        output = out.getvalue()
+        self.assertIn("list_games order=host_team_score desc search='team'", output)
+        self.assertIn("get_rankings AggregateStrategy", output)
+        self.assertIn("game_host_results_idx", output)
+
+    def test_explain_queries_without_matches(self):
+        out = StringIO()
+        call_command("explain_queries", "--search", "nothing", stdout=out)
+        self.assertIn("count search='nothing'", out.getvalue())
+        self.assertIn("team_name_gram_idx", out.getvalue())
+
+
+class BenchmarkRankingsCommandTestCase(TestCase):
+    @skipUnless(np, "numpy is not installed")
+    def test_benchmark_rankings(self):
+        out = StringIO()
+        call_command("benchmark_rankings", "--teams", "6", "--games", "30", stdout=out)
+        output = out.getvalue()
+        self.assertIn("NumpyStrategy (preloaded)", output)
+        self.assertIn("FirstStrategy (engine)", output)
+        self.assertNotIn("MISMATCH", output)
+        self.assertEqual(Team.objects.count(), 0)
+
+
+class BenchmarkCsvParsersCommandTestCase(TestCase):
+    def test_benchmark_csv_parsers(self):
+        out = StringIO()
+        call_command("benchmark_csv_parsers", "--size-mb", "0.05", "--block-size", "4096", stdout=out)
+        lines = out.getvalue().splitlines()
+        self.assertTrue(lines[1].startswith("csv.reader"))
+        self.assertTrue(lines[2].startswith("mmap blocks"))
+        self.assertTrue(all(line.endswith("ok") for line in lines[1:]))
+
+
+class BenchmarkCommandTestCase(TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.output = os.path.join(self.directory.name, "results.json")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_benchmark_writes_results(self):
+        call_command("benchmark", "--sizes", "10", "20", "--teams", "4", "--distribution", "poisson",
+                     "--output", self.output, stdout=StringIO())
+        with open(self.output) as output:
+            report = load(output)
+        scenarios = {(result["scenario"], result["games"]) for result in report["results"]}
+        self.assertEqual(len(scenarios), 8)
+        self.assertIn(("process_csv_file", 20), scenarios)
+        self.assertTrue(all(result["queries"] > 0 for result in report["results"]))
+        self.assertEqual(Game.objects.count(), 0)
+
+    def test_benchmark_fails_on_regression(self):
+        baseline = os.path.join(self.directory.name, "baseline.json")
+        with open(baseline, "w") as baseline_file:
+            dump({"results": [{"scenario": "order_games", "games": 10, "seconds": 0, "queries": 0,
+                               "peak_memory": 0}]}, baseline_file)
+        out = StringIO()
+        with self.assertRaises(CommandError):
+            call_command("benchmark", "--sizes", "10", "--teams", "4", "--compare", baseline, stdout=out)
+        self.assertIn("Regression: order_games at 10 games, queries 0 -> 1", out.getvalue())
+
+
+class LoadTestCommandTestCase(TransactionTestCase):
+    def test_load_test_compares_wsgi_and_asgi(self):
+        out = StringIO()
+        call_command("load_test", "--teams", "4", "--games", "20", "--requests", "6", "--concurrency", "2",
+                     "--operation", "list_games", stdout=out)
+        lines = out.getvalue().splitlines()
+        self.assertTrue(lines[1].startswith("WSGI") and lines[2].startswith("ASGI"))
+        self.assertTrue(all(line.endswith(" 0 errors") for line in lines[1:]))
+        self.assertEqual((User.objects.count(), Game.objects.count()), (0, 0))
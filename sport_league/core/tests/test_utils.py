@@ -1,15 +1,35 @@
 # Django Imports
 import csv
 import io
+import os
+import sys
+import tempfile
+import threading
+from datetime import datetime, timedelta
 
+from django.core.cache import cache
 from django.core.files.uploadedfile import SimpleUploadedFile
 from django.urls import reverse
-from django.test import TestCase
+from django.utils import timezone
+from django.test import RequestFactory, TestCase, override_settings
+from unittest import mock, skipUnless
 
 # App Imports
-from core.models import User, Team, Game
-from utils.csv_utils import process_csv_file
-from utils.ranking_utils import RankingSystem, FirstStrategy, search_games_by_searchkey, order_games, get_ranked_teams
+from core.checks import change_feed_cache_check, league_ranking_check
+from core.models import DataVersion, User, Team, Game, Standing, StandingCheckpoint, ImportedFile, ImportJob, League, Season, \
+    SeasonStanding
+from utils.csv_utils import iter_blocks, parse_block, parse_csv_row, process_csv_file, process_csv_path, \
+    resolve_team_ids
+from utils.ranking_utils import RankingSystem, FirstStrategy, AggregateStrategy, NumpyStrategy, ConfigurableStrategy, \
+    search_games_by_searchkey, order_games, get_ranked_teams, get_filtered_games, get_keyset_games, np, \
+    _ranking_snapshots, RankingSnapshot, cached_ranking_snapshot, store_ranking_snapshot
+from utils.cache_utils import bump_data_version, cached_response, get_cache_stats, get_data_version
+from utils.feed_utils import ChangeCursor, _published_ranking, change_key, format_event
+from utils.search_utils import name_grams, search_team_ids
+from utils.league_utils import LeagueEngine
+from utils.import_utils import enqueue_import, read_progress, run_next_job, write_progress
+from utils.timing_utils import RequestTiming, instrumented
+from utils.standings_utils import record_game, rebuild_standings, build_standing_checkpoints, join_season, standings_as_of
 
 
 class ProcessCsvFileTestCase(TestCase):
@@ -56,6 +76,200 @@ class ProcessCsvFileTestCase(TestCase):
         self.assertEqual(game_1.guest_team_score, 1)
         self.assertEqual(game_2.host_team_score, 3)
         self.assertEqual(game_2.guest_team_score, 1)
+        self.assertEqual(Standing.objects.get(team=self.team_a).points, 3)
+        self.assertEqual(Standing.objects.get(team=self.team_d).losses, 1)
+
+    def test_process_csv_file_in_batches(self):
+        data = b"Team A,2,Team B,1\nTeam E,3,Team F,1\nTeam E,0,Team A,0\n"
+        report = process_csv_file(io.BytesIO(data), batch_size=2)
+        self.assertEqual(report['rows'], 3)
+        self.assertEqual(Game.objects.count(), 3)
+        self.assertEqual(Team.objects.filter(name='Team E').count(), 1)
+        self.assertEqual(Standing.objects.get(team__name='Team E').points, 4)
+        self.assertEqual(Standing.objects.get(team=self.team_a).points, 4)
+
+    def test_process_csv_file_query_count_is_constant(self):
+        data = "".join(f"Team A,{index},Team B,1\n" for index in range(50)).encode()
+        with self.assertNumQueries(18):
+            process_csv_file(io.BytesIO(data), batch_size=1000)
+
+    def test_reimporting_identical_file_is_skipped(self):
+        data = b"Team A,2,Team B,1\nTeam A,2,Team B,1\n"
+        self.assertEqual(process_csv_file(io.BytesIO(data))['rows'], 2)
+        version = get_data_version()
+        with self.assertNumQueries(3):
+            report = process_csv_file(io.BytesIO(data))
+        self.assertEqual((report['rows'], report['duplicate_files']), (0, 1))
+        self.assertEqual(get_data_version(), version)
+        self.assertEqual(Game.objects.count(), 2)
+        self.assertEqual(Standing.objects.get(team=self.team_a).points, 6)
+
+    def test_extended_file_only_imports_new_rows(self):
+        process_csv_file(io.BytesIO(b"Team A,2,Team B,1\nTeam A,2,Team B,1\n"), batch_size=1)
+        report = process_csv_file(io.BytesIO(b"Team A,2,Team B,1\nTeam A,2,Team B,1\nTeam A,2,Team B,1\n"),
+                                  batch_size=1)
+        self.assertEqual((report['rows'], report['skipped']), (1, 2))
+        self.assertEqual(Game.objects.count(), 3)
+        self.assertEqual(Standing.objects.get(team=self.team_a).points, 9)
+
+    def test_row_inserted_mid_file_only_imports_that_row(self):
+        process_csv_file(SimpleUploadedFile(
+            "games.csv", b"Team A,2,Team B,1,2024-05-01\nTeam C,3,Team D,1,2024-05-01\nTeam A,2,Team B,1,2024-05-08\n"
+        ))
+        report = process_csv_file(SimpleUploadedFile(
+            "fixed.csv", b"Team A,2,Team B,1,2024-05-01\nTeam B,0,Team C,0,2024-05-04\nTeam C,3,Team D,1,2024-05-01\n"
+                         b"Team A,2,Team B,1,2024-05-08\n"
+        ))
+        self.assertEqual((report['rows'], report['skipped']), (1, 3))
+        self.assertEqual(Game.objects.count(), 4)
+
+    def test_new_file_under_a_reused_name_keeps_rematches(self):
+        process_csv_file(SimpleUploadedFile("results.csv", b"Team A,2,Team B,1\n"))
+        report = process_csv_file(SimpleUploadedFile("results.csv", b"Team C,0,Team D,0\nTeam A,2,Team B,1\n"))
+        self.assertEqual((report['rows'], report['skipped']), (2, 0))
+        report = process_csv_file(SimpleUploadedFile(
+            "results.csv", b"Team C,0,Team D,0\nTeam A,2,Team B,1\nTeam B,1,Team A,1\n"
+        ))
+        self.assertEqual((report['rows'], report['skipped']), (1, 2))
+        self.assertEqual(Game.objects.count(), 4)
+        self.assertEqual(Standing.objects.get(team=self.team_a).points, 7)
+
+    def test_file_imports_again_after_its_games_are_deleted(self):
+        data = b"Team A,2,Team B,1\nTeam C,3,Team D,1\n"
+        process_csv_file(SimpleUploadedFile("games.csv", data))
+        Game.objects.filter(host_team=self.team_c).delete()
+        report = process_csv_file(SimpleUploadedFile("games.csv", data))
+        self.assertEqual((report['rows'], report['skipped'], report['duplicate_files']), (1, 1, 0))
+        self.assertEqual(process_csv_file(SimpleUploadedFile("games.csv", data))['duplicate_files'], 1)
+        self.assertEqual(ImportedFile.objects.get().rows, 2)
+
+    def test_import_invalidates_later_checkpoints(self):
+        Game.objects.create(host_team=self.team_a, host_team_score=1, guest_team=self.team_b, guest_team_score=0,
+                            played_at=timezone.now() + timedelta(days=1))
+        build_standing_checkpoints(every=1)
+        self.assertEqual(StandingCheckpoint.objects.count(), 1)
+        process_csv_file(io.BytesIO(b"Team A,2,Team B,1\n"))
+        self.assertEqual(StandingCheckpoint.objects.count(), 0)
+
+    def test_rows_may_carry_played_at(self):
+        Game.objects.create(host_team=self.team_a, host_team_score=1, guest_team=self.team_b, guest_team_score=0,
+                            played_at=timezone.make_aware(datetime(2024, 6, 1)))
+        build_standing_checkpoints(every=1)
+        report = process_csv_file(io.BytesIO(b"Team A,2,Team B,1,2024-05-01T18:00:00\nTeam C,3,Team D,1\n"))
+        self.assertEqual(report['rows'], 2)
+        self.assertEqual(Game.objects.get(host_team=self.team_a, host_team_score=2).played_at,
+                         timezone.make_aware(datetime(2024, 5, 1, 18)))
+        self.assertGreater(Game.objects.get(host_team=self.team_c).played_at, timezone.now() - timedelta(minutes=1))
+        self.assertEqual(StandingCheckpoint.objects.count(), 0)
+        with self.assertRaisesMessage(ValueError, "Line 1: invalid played_at 'soon'."):
+            process_csv_file(io.BytesIO(b"Team A,2,Team B,1,soon\n"))
+
+    def test_teams_created_concurrently_are_reused(self):
+        # Team A is created by someone else after the lookup, so its insert conflicts.
+        named = Team.objects.filter(name__in=['Team A', 'Team E'])
+        with mock.patch.object(Team.objects, 'filter', side_effect=[Team.objects.none(), named]):
+            team_ids = resolve_team_ids({'Team A', 'Team E'}, {})
+        self.assertEqual(team_ids, dict(named.values_list('name', 'id')))
+        self.assertEqual(Team.objects.filter(name='Team A').count(), 1)
+        self.assertEqual(list(search_team_ids('am e')), [team_ids['Team E']])
+
+    def test_block_parser_matches_csv_reader(self):
+        data = (b'Team A,2,Team B,1\r\n"Team, Quoted",3,Team B,0,extra\nTeam A, 4 ,Team C,1\n'
+                b'\nTeam A,x,Team B,1\nTeam A,-1,Team B,1\nTeam A,1\nTeam C,1,Team A,0,2024-05-01 18:00\r\n'
+                b'Team C,1,Team A,0,\n')
+        expected_rows, expected_errors = [], []
+        for line_number, row in enumerate(csv.reader(io.TextIOWrapper(io.BytesIO(data), encoding='utf-8')), start=1):
+            try:
+                expected_rows.append(parse_csv_row(row, line_number))
+            except ValueError as e:
+                expected_errors.append(str(e))
+        for block_size in (1, 16, len(data)):
+            names, line_number, columns, errors = {}, 0, None, []
+            for block in iter_blocks(data, block_size):
+                columns, block_errors, line_number = parse_block(block, line_number, names, columns)
+                errors.extend(block_errors)
+            self.assertEqual(list(zip(*columns)), expected_rows)
+            self.assertEqual(errors, expected_errors)
+
+    def test_process_csv_path_is_idempotent_with_uploads(self):
+        data = b"Team A,2,Team B,1\nTeam E,3,Team F,1\n"
+        with tempfile.NamedTemporaryFile(suffix='.csv') as csv_file:
+            csv_file.write(data)
+            csv_file.flush()
+            report = process_csv_path(csv_file.name, file_name='games.csv')
+            self.assertEqual(report['rows'], 2)
+            self.assertEqual(Standing.objects.get(team__name='Team E').points, 3)
+            report = process_csv_file(SimpleUploadedFile('games.csv', data))
+            self.assertEqual((report['rows'], report['duplicate_files']), (0, 1))
+            extended = process_csv_file(SimpleUploadedFile('games.csv', data + b"Team A,0,Team E,0\n"))
+            self.assertEqual((extended['rows'], extended['skipped']), (1, 2))
+
+    def test_equal_results_in_other_files_are_kept(self):
+        process_csv_file(SimpleUploadedFile("2001.csv", b"Team A,2,Team B,1\n"))
+        report = process_csv_file(SimpleUploadedFile("2002.csv", b"Team A,2,Team B,1\nTeam B,0,Team A,0\n"))
+        self.assertEqual((report['rows'], report['skipped']), (2, 0))
+
+    def test_same_file_imports_into_another_season(self):
+        season = Season.objects.create(league=League.objects.create(name="League"), name="2024")
+        process_csv_file(io.BytesIO(b"Team A,2,Team B,1\n"))
+        report = process_csv_file(io.BytesIO(b"Team A,2,Team B,1\n"), season=str(season.id))
+        self.assertEqual(report['rows'], 1)
+        self.assertEqual(ImportedFile.objects.count(), 2)
+
+    def test_process_csv_file_malformed_row_rolls_back(self):
+        data = b"Team A,2,Team B,1\nTeam E,3,Team F,1\nTeam C,x,Team D,1\n"
+        with self.assertRaises(ValueError):
+            process_csv_file(io.BytesIO(data), batch_size=2)
+        self.assertEqual(Game.objects.count(), 0)
+        self.assertFalse(Team.objects.filter(name='Team E').exists())
+
+
+class ImportJobTestCase(TestCase):
+    def setUp(self):
+        self.spool_dir = tempfile.TemporaryDirectory()
+        self.settings_override = override_settings(CSV_IMPORT_SPOOL_DIR=self.spool_dir.name)
+        self.settings_override.enable()
+
+    def tearDown(self):
+        self.settings_override.disable()
+        self.spool_dir.cleanup()
+
+    def test_run_next_job(self):
+        job = enqueue_import(SimpleUploadedFile("games.csv", b"Team A,2,Team B,1\nTeam C,3,Team D,1\n"))
+        self.assertTrue(os.path.exists(job.path))
+        self.assertEqual(read_progress(job)['status'], ImportJob.PENDING)
+        self.assertEqual(run_next_job().id, job.id)
+        job.refresh_from_db()
+        self.assertEqual(job.status, ImportJob.SUCCEEDED)
+        self.assertEqual(job.rows_processed, 2)
+        self.assertEqual(Game.objects.count(), 2)
+        self.assertFalse(os.path.exists(job.path))
+        self.assertIsNone(run_next_job())
+
+    def test_run_next_job_failure(self):
+        job = enqueue_import(SimpleUploadedFile("games.csv", b"Team A,2,Team B\n"))
+        run_next_job()
+        job.refresh_from_db()
+        self.assertEqual(job.status, ImportJob.FAILED)
+        self.assertEqual(read_progress(job)['errors'], ["Line 1: expected 4 columns, got 3."])
+        self.assertEqual(Game.objects.count(), 0)
+
+    def test_read_progress_of_running_job(self):
+        job = enqueue_import(SimpleUploadedFile("games.csv", b"Team A,2,Team B,1\n"))
+        job.status = ImportJob.RUNNING
+        write_progress(job, rows_processed=500, rows_per_second=250.0)
+        progress = read_progress(job)
+        self.assertEqual((progress['rows_processed'], progress['rows_per_second']), (500, 250.0))
+
+    @override_settings(IMPORT_JOB_STALE_TIMEOUT=60)
+    def test_stale_running_job_is_claimed_again(self):
+        job = enqueue_import(SimpleUploadedFile("games.csv", b"Team A,2,Team B,1\n"))
+        ImportJob.objects.filter(id=job.id).update(status=ImportJob.RUNNING, started_at=timezone.now())
+        self.assertIsNone(run_next_job())
+        ImportJob.objects.filter(id=job.id).update(started_at=timezone.now() - timedelta(minutes=5))
+        self.assertEqual(run_next_job().id, job.id)
+        job.refresh_from_db()
+        self.assertEqual((job.status, Game.objects.count()), (ImportJob.SUCCEEDED, 1))
 
 
 class RankingSystemTestCase(TestCase):
@@ -85,11 +299,104 @@ class RankingSystemTestCase(TestCase):
         ]
         self.assertEqual(ranked_teams, expected_ranking)
 
+    def test_aggregate_strategy_matches_first_strategy(self):
+        teams = [self.team1, self.team2, self.team3, self.team4]
+        scores = [(1, 0), (2, 2), (0, 3), (1, 1), (4, 2), (0, 0)]
+        for index, (host_team_score, guest_team_score) in enumerate(scores):
+            Game.objects.create(host_team=teams[index % 4], host_team_score=host_team_score,
+                                guest_team=teams[(index + 1) % 4], guest_team_score=guest_team_score)
+        expected_ranking = RankingSystem(FirstStrategy()).rank_teams(Team.objects.all())
+        self.assertEqual(RankingSystem(AggregateStrategy()).rank_teams(Team.objects.all()), expected_ranking)
+        self.assertEqual(RankingSystem(AggregateStrategy()).rank_teams(teams), expected_ranking)
+
+    def test_aggregate_strategy_query_count_is_constant(self):
+        ranking_system = RankingSystem(AggregateStrategy())
+        with self.assertNumQueries(1):
+            ranking_system.rank_teams(Team.objects.all())
+        for index in range(20):
+            team = Team.objects.create(name=f"Extra Team {index}")
+            Game.objects.create(host_team=team, host_team_score=index % 3, guest_team=self.team1, guest_team_score=1)
+        with self.assertNumQueries(1):
+            ranked_teams = ranking_system.rank_teams(Team.objects.all())
+        self.assertEqual(len(ranked_teams), 24)
+
+    @skipUnless(np, "numpy is not installed")
+    def test_numpy_strategy_matches_first_strategy(self):
+        teams = [self.team1, self.team2, self.team3, self.team4]
+        scores = [(1, 0), (2, 2), (0, 3), (1, 1), (4, 2), (0, 0), (3, 1)]
+        for index, (host_team_score, guest_team_score) in enumerate(scores):
+            Game.objects.create(host_team=teams[index % 4], host_team_score=host_team_score,
+                                guest_team=teams[(index + 2) % 4], guest_team_score=guest_team_score)
+        expected_ranking = RankingSystem(FirstStrategy()).rank_teams(Team.objects.all())
+        self.assertEqual(RankingSystem(NumpyStrategy()).rank_teams(Team.objects.all()), expected_ranking)
+        self.assertEqual(RankingSystem(NumpyStrategy()).rank_teams(teams[:2]),
+                         RankingSystem(FirstStrategy()).rank_teams(teams[:2]))
+        games = NumpyStrategy().load_games()
+        self.assertEqual(games.shape, (7, 4))
+        self.assertEqual(RankingSystem(NumpyStrategy(games=games)).rank_teams(teams), expected_ranking)
+
+    @skipUnless(np, "numpy is not installed")
+    def test_numpy_strategy_compute_table(self):
+        games = [[1, 2, 3, 1], [2, 3, 0, 0], [3, 1, 2, 1]]
+        table = NumpyStrategy(games=games).compute_table([1, 2, 3], games)
+        self.assertEqual(table['wins'].tolist(), [1, 0, 1])
+        self.assertEqual(table['draws'].tolist(), [0, 1, 1])
+        self.assertEqual(table['losses'].tolist(), [1, 1, 0])
+        self.assertEqual(table['points'].tolist(), [3, 1, 4])
+        self.assertEqual(table['goal_difference'].tolist(), [1, -2, 1])
+
     def test_rank_teams_with_wrong_strategy_type(self):
         with self.assertRaises(TypeError):
             RankingSystem('invalid_strategy')
 
 
+class ConfigurableStrategyTestCase(TestCase):
+    def setUp(self):
+        self.alpha = Team.objects.create(name='Alpha')
+        self.bravo = Team.objects.create(name='Bravo')
+        self.charlie = Team.objects.create(name='Charlie')
+        self.delta = Team.objects.create(name='Delta')
+        results = [
+            (self.bravo, 1, self.alpha, 0),
+            (self.alpha, 3, self.delta, 0),
+            (self.alpha, 2, self.charlie, 0),
+            (self.bravo, 1, self.charlie, 0),
+            (self.bravo, 0, self.delta, 1),
+        ]
+        for host_team, host_team_score, guest_team, guest_team_score in results:
+            Game.objects.create(host_team=host_team, host_team_score=host_team_score, guest_team=guest_team,
+                                guest_team_score=guest_team_score)
+
+    def rank(self, **config):
+        return [team['name'] for team in RankingSystem(ConfigurableStrategy(**config)).rank_teams(Team.objects.all())]
+
+    def test_default_configuration_matches_first_strategy(self):
+        self.assertEqual(RankingSystem(ConfigurableStrategy()).rank_teams(Team.objects.all()),
+                         RankingSystem(FirstStrategy()).rank_teams(Team.objects.all()))
+
+    def test_tie_breakers(self):
+        # Alpha (+4) and Bravo (+1) both have 6 points, but Bravo won their game.
+        self.assertEqual(self.rank(tie_breakers=['name']), ['Alpha', 'Bravo', 'Delta', 'Charlie'])
+        self.assertEqual(self.rank(tie_breakers=['head_to_head', 'name']), ['Bravo', 'Alpha', 'Delta', 'Charlie'])
+        self.assertEqual(self.rank(tie_breakers=['goal_difference', 'head_to_head']),
+                         ['Alpha', 'Bravo', 'Delta', 'Charlie'])
+        self.assertEqual(self.rank(tie_breakers=['goals_for', 'name']), ['Alpha', 'Bravo', 'Delta', 'Charlie'])
+        self.assertEqual(self.rank(tie_breakers=['goals_against', 'head_to_head']),
+                         ['Bravo', 'Alpha', 'Delta', 'Charlie'])
+
+    def test_points_configuration(self):
+        ranking = RankingSystem(ConfigurableStrategy(points={'win': 2, 'loss': -1})).rank_teams(Team.objects.all())
+        self.assertEqual(ranking[0], {'name': 'Alpha', 'points': 3})
+
+    def test_head_to_head_only_loads_games_once(self):
+        with self.assertNumQueries(2):
+            self.rank(tie_breakers=['goal_difference', 'head_to_head', 'wins', 'name'])
+
+    def test_unknown_tie_breaker(self):
+        with self.assertRaises(ValueError):
+            ConfigurableStrategy(tie_breakers=['coin_toss'])
+
+
 class TestUtils(TestCase):
 
     def setUp(self):
@@ -125,6 +432,147 @@ class TestUtils(TestCase):
         self.assertQuerysetEqual(result, expected_result, transform=lambda x: x)
 
 
+class InstrumentedTestCase(TestCase):
+    def test_operation_without_response(self):
+        @instrumented
+        def no_response(request):
+            return None
+
+        request = RequestFactory().get("/")
+        request.timing = RequestTiming()
+        self.assertIsNone(no_response(request))
+        self.assertEqual(request.timing.operations[0]['operation'], 'no_response')
+        self.assertIsNone(request.timing.operations[0]['response_bytes'])
+
+
+class ResponseCacheTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.request_body = {'search': {'value': ''}, 'start': 0, 'length': 10, 'order': [{'column': 0, 'dir': 'asc'}]}
+        self.calls = 0
+
+    def compute(self):
+        self.calls += 1
+        return {'data': [self.calls]}
+
+    def test_cached_response(self):
+        self.assertEqual(cached_response('get_rankings', self.request_body, self.compute), {'data': [1]})
+        self.assertEqual(cached_response('get_rankings', self.request_body, self.compute), {'data': [1]})
+        self.assertEqual(cached_response('list_games', self.request_body, self.compute), {'data': [2]})
+        self.assertEqual(get_cache_stats(), {'hits': 1, 'misses': 2, 'hit_ratio': 1 / 3})
+
+    def test_bump_data_version_invalidates(self):
+        version = get_data_version()
+        cached_response('get_rankings', self.request_body, self.compute)
+        bump_data_version()
+        self.assertNotEqual(get_data_version(), version)
+        self.assertEqual(cached_response('get_rankings', self.request_body, self.compute), {'data': [2]})
+
+    def test_import_bumps_data_version(self):
+        version = get_data_version()
+        process_csv_file(io.BytesIO(b"Team A,2,Team B,1\n"))
+        self.assertNotEqual(get_data_version(), version)
+
+
+class TeamSearchTestCase(TestCase):
+    def setUp(self):
+        self.barcelona = Team.objects.create(name='Barcelona')
+        self.bayern = Team.objects.create(name='Bayern Munich')
+        self.roma = Team.objects.create(name='AS Roma')
+
+    def test_name_grams(self):
+        self.assertEqual(name_grams('Roma'), {'rom', 'oma'})
+        self.assertEqual(name_grams('AS'), set())
+
+    def test_search_team_ids(self):
+        self.assertCountEqual(search_team_ids('BAR'), [self.barcelona.id])
+        self.assertCountEqual(search_team_ids('munich'), [self.bayern.id])
+        self.assertCountEqual(search_team_ids('rna'), [])
+        self.assertCountEqual(search_team_ids('a'), [self.barcelona.id, self.bayern.id, self.roma.id])
+
+    def test_search_games_filters_with_one_query(self):
+        Game.objects.create(host_team=self.barcelona, host_team_score=1, guest_team=self.roma, guest_team_score=0)
+        with self.assertNumQueries(1):
+            self.assertEqual(search_games_by_searchkey(Game.objects.all(), 'rom').count(), 1)
+
+    def test_index_follows_renames_and_imports(self):
+        self.roma.name = 'Lazio'
+        self.roma.save()
+        self.assertCountEqual(search_team_ids('roma'), [])
+        self.assertCountEqual(search_team_ids('azi'), [self.roma.id])
+        process_csv_file(io.BytesIO(b"Valencia,1,Sevilla,0\n"))
+        self.assertCountEqual(search_team_ids('vill'), [Team.objects.get(name='Sevilla').id])
+
+
+class GetFilteredGamesTestCase(TestCase):
+    def setUp(self):
+        self.team1 = Team.objects.create(name='Team 1')
+        self.team2 = Team.objects.create(name='Team 2')
+        self.game = Game.objects.create(host_team=self.team1, guest_team=self.team2, host_team_score=3,
+                                        guest_team_score=1)
+
+    def test_get_filtered_games_response_shape(self):
+        result = get_filtered_games(searchkey='', start=0, length=10, order_by={'column': 0, 'dir': 'asc'})
+        self.assertEqual(result, {
+            'data': [{'id': self.game.id, 'host_team_id': 'Team 1', 'host_team_score': 3,
+                      'guest_team_id': 'Team 2', 'guest_team_score': 1}],
+            'recordsFiltered': 1,
+            'recordsTotal': 1,
+        })
+
+    def test_get_filtered_games_query_count_is_constant(self):
+        with self.assertNumQueries(3):
+            get_filtered_games(searchkey='team', start=0, length=10, order_by={'column': 1, 'dir': 'asc'})
+        for index in range(20):
+            Game.objects.create(host_team=self.team2, guest_team=self.team1, host_team_score=index,
+                                guest_team_score=0)
+        with self.assertNumQueries(3):
+            result = get_filtered_games(searchkey='team', start=10, length=10, order_by={'column': 1, 'dir': 'asc'})
+        self.assertEqual(len(result['data']), 10)
+
+
+class GetKeysetGamesTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.team1 = Team.objects.create(name='Team 1')
+        self.team2 = Team.objects.create(name='Team 2')
+        for index in range(7):
+            Game.objects.create(host_team=self.team1 if index % 2 else self.team2, host_team_score=index % 3,
+                                guest_team=self.team2 if index % 2 else self.team1, guest_team_score=1)
+
+    def walk(self, order_by, length=3):
+        pages, cursor = [], None
+        while True:
+            result = get_keyset_games(searchkey='', length=length, order_by=order_by, cursor=cursor)
+            pages.append(result['data'])
+            cursor = result['cursor']
+            if not cursor:
+                return pages
+
+    def test_pages_match_offset_pagination(self):
+        for order_by in ({'column': 0, 'dir': 'asc'}, {'column': 1, 'dir': 'desc'}, {'column': 2, 'dir': 'asc'}):
+            pages = self.walk(order_by)
+            self.assertEqual(len(pages), 3)
+            for index, page in enumerate(pages):
+                expected = get_filtered_games(searchkey='', start=index * 3, length=3, order_by=order_by)['data']
+                self.assertEqual([game['id'] for game in page], [game['id'] for game in expected])
+
+    def test_counts_and_query_count(self):
+        first_page = get_keyset_games(searchkey='', length=3, order_by={'column': 0, 'dir': 'asc'})
+        self.assertEqual((first_page['recordsTotal'], first_page['recordsFiltered']), (7, 7))
+        with self.assertNumQueries(1):
+            get_keyset_games(searchkey='', length=3, order_by={'column': 0, 'dir': 'asc'},
+                             cursor=first_page['cursor'])
+
+    def test_invalid_cursor(self):
+        first_page = get_keyset_games(searchkey='', length=3, order_by={'column': 0, 'dir': 'asc'})
+        with self.assertRaises(ValueError):
+            get_keyset_games(searchkey='', length=3, order_by={'column': 0, 'dir': 'asc'}, cursor='not-a-cursor')
+        with self.assertRaises(ValueError):
+            get_keyset_games(searchkey='', length=3, order_by={'column': 2, 'dir': 'asc'},
+                             cursor=first_page['cursor'])
+
+
 class GetRankedTeamsTestCase(TestCase):
     def setUp(self):
         self.team1 = Team.objects.create(name='Barcelona')
@@ -150,3 +598,406 @@ class GetRankedTeamsTestCase(TestCase):
         self.assertEqual(data[3]['rank'], 4)
         self.assertEqual(data[4]['name'], self.team2.name)
         self.assertEqual(data[4]['rank'], 5)
+
+    def test_get_ranked_teams_serves_pages_from_snapshot(self):
+        get_ranked_teams(searchkey='', start=0, length=2, order_by={'column': 0, 'dir': 'asc'})
+        with self.assertNumQueries(0):
+            result = get_ranked_teams(searchkey='AR', start=0, length=1, order_by={'column': 0, 'dir': 'desc'})
+        self.assertEqual(result, {
+            'data': [{'name': 'Paris Saint-Germain', 'points': 0, 'rank': 4}],
+            'recordsFiltered': 2,
+            'recordsTotal': 5,
+        })
+
+    def test_get_ranked_teams_snapshot_follows_data_changes(self):
+        get_ranked_teams(searchkey='', start=0, length=5, order_by={'column': 0, 'dir': 'asc'})
+        Game.objects.create(host_team=self.team2, host_team_score=1, guest_team=self.team1, guest_team_score=0)
+        result = get_ranked_teams(searchkey='', start=0, length=1, order_by={'column': 0, 'dir': 'asc'})
+        self.assertEqual(result['data'], [{'name': 'Real Madrid', 'points': 3, 'rank': 1}])
+
+    def test_get_ranked_teams_follows_writes_of_other_processes(self):
+        get_ranked_teams(searchkey='', start=0, length=5, order_by={'column': 0, 'dir': 'asc'})
+        # Another process adds a team and bumps the shared version; this
+        # process sees it once its cached version expires.
+        Team.objects.bulk_create([Team(name='Ajax')])
+        DataVersion.objects.update(version='written-elsewhere')
+        cache.clear()
+        result = get_ranked_teams(searchkey='', start=0, length=5, order_by={'column': 0, 'dir': 'asc'})
+        self.assertEqual(result['recordsTotal'], 6)
+
+    @override_settings(RANKING_SNAPSHOT_SEASONS=2)
+    def test_get_ranked_teams_snapshots_are_bounded(self):
+        league = League.objects.create(name='League')
+        seasons = [Season.objects.create(league=league, name=str(year)).id for year in (2021, 2022, 2023)]
+        for season in seasons:
+            get_ranked_teams(searchkey='', start=0, length=1, order_by={'column': 0, 'dir': 'asc'}, season=str(season))
+        self.assertEqual(list(_ranking_snapshots), seasons[1:])
+        bump_data_version()
+        get_ranked_teams(searchkey='', start=0, length=1, order_by={'column': 0, 'dir': 'asc'}, season=seasons[0])
+        self.assertEqual(list(_ranking_snapshots), seasons[:1])
+
+    @override_settings(RANKING_SNAPSHOT_SEASONS=4)
+    def test_snapshots_are_shared_safely_between_threads(self):
+        errors = []
+
+        def use_snapshots(offset):
+            try:
+                for index in range(2000):
+                    season, version = (offset + index) % 8, index % 3
+                    if cached_ranking_snapshot(season, version) is None:
+                        store_ranking_snapshot(season, RankingSnapshot(version, []))
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=use_snapshots, args=(offset,)) for offset in range(8)]
+        switch_interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+        try:
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        finally:
+            sys.setswitchinterval(switch_interval)
+        self.assertEqual(errors, [])
+        self.assertLessEqual(len(_ranking_snapshots), 4)
+
+    @override_settings(LEAGUE_RANKING={'points': {'win': 3, 'draw': 1, 'loss': 0},
+                                       'tie_breakers': ['goal_difference', 'head_to_head', 'name']})
+    def test_get_ranked_teams_applies_tie_breakers(self):
+        season = Season.objects.create(league=League.objects.create(name='League'), name='2024')
+        for host, host_score, guest, guest_score in ((self.team2, 4, self.team3, 0), (self.team1, 1, self.team5, 0)):
+            Game.objects.create(host_team=host, host_team_score=host_score, guest_team=guest,
+                                guest_team_score=guest_score, season=season)
+        expected = ['Real Madrid', 'Barcelona', 'Manchester United', 'Bayern Munich']
+        order_by = {'column': 0, 'dir': 'asc'}
+        self.assertEqual([team['name'] for team in get_ranked_teams('', 0, 5, order_by)['data']],
+                         [*expected[:2], 'Paris Saint-Germain', *expected[2:]])
+        self.assertEqual([team['name'] for team in get_ranked_teams('', 0, 5, order_by, season=season.id)['data']],
+                         expected)
+        as_of = timezone.now().isoformat()
+        self.assertEqual([team['name'] for team in get_ranked_teams('', 0, 5, order_by, as_of=as_of)['data']],
+                         [*expected[:2], 'Paris Saint-Germain', *expected[2:]])
+
+        self.assertEqual(league_ranking_check(None), [])
+        with override_settings(LEAGUE_RANKING={'points': {}, 'tie_breakers': ['away_goals', 'name']}):
+            self.assertEqual([error.id for error in league_ranking_check(None)], ['core.E001'])
+
+    def test_get_ranked_teams_rejects_invalid_season(self):
+        for season in ('x', '-1', [1]):
+            with self.assertRaises(ValueError):
+                get_ranked_teams(searchkey='', start=0, length=1, order_by={'column': 0, 'dir': 'asc'}, season=season)
+
+
+class StandingsTestCase(TestCase):
+    def setUp(self):
+        self.team1 = Team.objects.create(name='Team 1')
+        self.team2 = Team.objects.create(name='Team 2')
+        self.game1 = Game.objects.create(host_team=self.team1, guest_team=self.team2, host_team_score=3,
+                                         guest_team_score=1)
+        self.game2 = Game.objects.create(host_team=self.team2, guest_team=self.team1, host_team_score=2,
+                                         guest_team_score=2)
+
+    def test_saved_games_are_recorded(self):
+        standing1 = Standing.objects.get(team=self.team1)
+        standing2 = Standing.objects.get(team=self.team2)
+        self.assertEqual((standing1.played, standing1.wins, standing1.draws, standing1.losses), (2, 1, 1, 0))
+        self.assertEqual((standing1.points, standing1.goals_for, standing1.goals_against), (4, 5, 3))
+        self.assertEqual((standing2.played, standing2.wins, standing2.draws, standing2.losses), (2, 0, 1, 1))
+        self.assertEqual((standing2.points, standing2.goal_difference), (1, -2))
+
+    def test_deleted_game_is_removed(self):
+        self.game1.delete()
+        standing1 = Standing.objects.get(team=self.team1)
+        self.assertEqual((standing1.played, standing1.wins, standing1.draws, standing1.points), (1, 0, 1, 1))
+
+    def test_edited_game_replaces_its_result(self):
+        self.game1.host_team_score = 0
+        self.game1.save()
+        self.assertEqual(Standing.objects.get(team=self.team1).points, 1)
+        self.assertEqual(Standing.objects.get(team=self.team2).points, 4)
+
+    def test_deleted_team_results_are_removed_from_opponents(self):
+        self.team1.delete()
+        standing2 = Standing.objects.get(team=self.team2)
+        self.assertEqual((standing2.played, standing2.points, standing2.goals_for), (0, 0, 0))
+        self.assertFalse(Standing.objects.filter(team_id=self.game1.host_team_id).exists())
+
+    def test_record_game(self):
+        Standing.objects.all().delete()
+        record_game(self.game1)
+        self.assertEqual(Standing.objects.get(team=self.team1).points, 3)
+
+    def test_rebuild_standings(self):
+        self.assertEqual(rebuild_standings(), 2)
+        self.assertEqual(Standing.objects.get(team=self.team1).points, self.team1.wins * 3 + self.team1.draws)
+        self.assertEqual(Standing.objects.get(team=self.team2).points, self.team2.wins * 3 + self.team2.draws)
+
+    @override_settings(LEAGUE_RANKING={'points': {'win': 2, 'draw': 1, 'loss': 1}, 'tie_breakers': ['name']})
+    def test_points_setting_is_shared(self):
+        rebuild_standings()
+        expected = [{'name': 'Team 1', 'points': 3}, {'name': 'Team 2', 'points': 2}]
+        self.assertEqual([{'name': standing.team.name, 'points': standing.points}
+                          for standing in Standing.objects.order_by('team__name')], expected)
+        self.assertEqual(FirstStrategy().rank_teams(Team.objects.all()), expected)
+        self.assertEqual(AggregateStrategy().rank_teams(Team.objects.all()), expected)
+        self.assertEqual(ConfigurableStrategy().rank_teams(Team.objects.all()), expected)
+        engine = LeagueEngine.load()
+        self.assertEqual([team.points for team in engine.ranked_teams()], [3, 2])
+
+    def test_get_ranked_teams_uses_standings(self):
+        rebuild_standings()
+        get_data_version()
+        with self.assertNumQueries(1):
+            result = get_ranked_teams(searchkey='', start=0, length=10, order_by={'column': 0, 'dir': 'asc'})
+        self.assertEqual(result['data'], [
+            {'name': 'Team 1', 'points': 4, 'rank': 1},
+            {'name': 'Team 2', 'points': 1, 'rank': 2},
+        ])
+
+
+class PointInTimeStandingsTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.team1 = Team.objects.create(name='Barcelona')
+        self.team2 = Team.objects.create(name='Real Madrid')
+        self.start = timezone.make_aware(datetime(2024, 1, 1))
+        for day in range(10):
+            Game.objects.create(host_team=self.team1, host_team_score=day % 3, guest_team=self.team2,
+                                guest_team_score=1, played_at=self.start + timedelta(days=day))
+
+    def replay(self, as_of):
+        points = {self.team1.id: 0, self.team2.id: 0}
+        for game in Game.objects.filter(played_at__lte=as_of):
+            if game.is_draw():
+                points[game.host_team_id] += 1
+                points[game.guest_team_id] += 1
+            else:
+                points[game.winner.id] += 3
+        return points
+
+    def test_checkpoints_match_full_replay(self):
+        self.assertEqual(build_standing_checkpoints(every=3), 3)
+        for day in range(-1, 11):
+            as_of = self.start + timedelta(days=day, hours=1)
+            totals = standings_as_of(as_of)
+            expected = self.replay(as_of)
+            self.assertEqual({team_id: totals[team_id]['points'] for team_id in expected}, expected)
+
+    def test_checkpoints_are_built_incrementally(self):
+        build_standing_checkpoints(every=3)
+        self.assertEqual(build_standing_checkpoints(every=3), 0)
+        self.assertEqual(StandingCheckpoint.objects.count(), 3)
+
+    def test_as_of_reads_nearest_checkpoint(self):
+        build_standing_checkpoints(every=3)
+        with self.assertNumQueries(3):
+            standings_as_of(self.start + timedelta(days=7, hours=1))
+
+    def test_changing_past_game_drops_later_checkpoints(self):
+        build_standing_checkpoints(every=3)
+        Game.objects.create(host_team=self.team2, host_team_score=5, guest_team=self.team1, guest_team_score=0,
+                            played_at=self.start + timedelta(days=4, hours=12))
+        self.assertEqual(StandingCheckpoint.objects.count(), 1)
+        as_of = self.start + timedelta(days=20)
+        totals = standings_as_of(as_of)
+        self.assertEqual(totals[self.team2.id]['points'], self.replay(as_of)[self.team2.id])
+
+    def test_get_ranked_teams_as_of(self):
+        as_of = (self.start + timedelta(days=1, hours=1)).isoformat()
+        result = get_ranked_teams(searchkey='', start=0, length=2, order_by={'column': 0, 'dir': 'asc'}, as_of=as_of)
+        self.assertEqual(result['data'], [
+            {'name': 'Real Madrid', 'points': 4, 'rank': 1},
+            {'name': 'Barcelona', 'points': 1, 'rank': 2},
+        ])
+
+    def test_get_ranked_teams_rejects_invalid_as_of(self):
+        with self.assertRaises(ValueError):
+            get_ranked_teams(searchkey='', start=0, length=2, order_by={'column': 0, 'dir': 'asc'}, as_of='yesterday')
+
+
+class SeasonPartitionTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        league = League.objects.create(name='Premier')
+        self.season = Season.objects.create(league=league, name='2024')
+        self.other_season = Season.objects.create(league=league, name='2025')
+        self.team1 = Team.objects.create(name='Barcelona')
+        self.team2 = Team.objects.create(name='Real Madrid')
+        self.team3 = Team.objects.create(name='Bayern Munich')
+        for season, host_team, guest_team in ((self.season, self.team1, self.team2),
+                                              (self.other_season, self.team3, self.team1),
+                                              (None, self.team2, self.team3)):
+            Game.objects.create(season=season, host_team=host_team, host_team_score=2, guest_team=guest_team,
+                                guest_team_score=0)
+
+    def test_season_standings_follow_season_games(self):
+        self.assertEqual(Standing.objects.get(team=self.team1).points, 3)
+        self.assertEqual(SeasonStanding.objects.get(season=self.season, team=self.team1).points, 3)
+        self.assertEqual(SeasonStanding.objects.get(season=self.other_season, team=self.team1).points, 0)
+        self.assertEqual(SeasonStanding.objects.filter(season=self.season).count(), 2)
+
+    def test_get_ranked_teams_in_season(self):
+        result = get_ranked_teams(searchkey='', start=0, length=10, order_by={'column': 0, 'dir': 'asc'},
+                                  season=self.other_season.id)
+        self.assertEqual(result['data'], [
+            {'name': 'Bayern Munich', 'points': 3, 'rank': 1},
+            {'name': 'Barcelona', 'points': 0, 'rank': 2},
+        ])
+        self.assertEqual(result['recordsTotal'], 2)
+
+    def test_get_ranked_teams_in_season_as_of(self):
+        as_of = timezone.now().isoformat()
+        result = get_ranked_teams(searchkey='', start=0, length=10, order_by={'column': 0, 'dir': 'asc'},
+                                  as_of=as_of, season=self.season.id)
+        self.assertEqual([team['name'] for team in result['data']], ['Barcelona', 'Real Madrid'])
+
+    def test_strategies_in_season(self):
+        expected = [{'name': 'Barcelona', 'points': 3}, {'name': 'Real Madrid', 'points': 0}]
+        teams = Team.objects.filter(seasons=self.season)
+        strategies = [AggregateStrategy(season=self.season.id), ConfigurableStrategy(season=self.season.id)]
+        if np is not None:
+            strategies.append(NumpyStrategy(season=self.season.id))
+        for strategy in strategies:
+            self.assertEqual(RankingSystem(strategy).rank_teams(teams), expected)
+
+    def test_games_in_season(self):
+        result = get_filtered_games(searchkey='', start=0, length=10, order_by={'column': 0, 'dir': 'asc'},
+                                    season=self.season.id)
+        self.assertEqual((result['recordsTotal'], result['data'][0]['host_team_id']), (1, 'Barcelona'))
+        result = get_keyset_games(searchkey='', length=10, order_by={'column': 0, 'dir': 'asc'},
+                                  season=self.other_season.id)
+        self.assertEqual((result['recordsTotal'], result['data'][0]['host_team_id']), (1, 'Bayern Munich'))
+
+    def test_process_csv_file_into_season(self):
+        csv_file = io.BytesIO(b"Barcelona,1,Juventus,1\n")
+        process_csv_file(csv_file, season=self.season.id)
+        standings = SeasonStanding.objects.filter(season=self.season)
+        self.assertEqual(dict(standings.values_list('team__name', 'points')),
+                         {'Barcelona': 4, 'Real Madrid': 0, 'Juventus': 1})
+        self.assertEqual(Game.objects.filter(season=self.season).count(), 2)
+
+    def test_rebuild_standings_keeps_season_members(self):
+        SeasonStanding.objects.update(points=99)
+        rebuild_standings()
+        self.assertEqual(dict(SeasonStanding.objects.filter(season=self.other_season)
+                              .values_list('team__name', 'points')), {'Bayern Munich': 3, 'Barcelona': 0})
+
+
+@override_settings(CHANGE_FEED_ENABLED=True)
+class ChangeFeedTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        _published_ranking.clear()
+        with self.captureOnCommitCallbacks(execute=True):
+            process_csv_file(io.BytesIO(b"Team A,1,Team B,0\nTeam C,0,Team D,0\n"))
+
+    def test_import_resets_clients(self):
+        self.assertEqual(cache.get(change_key(1)), {'id': 1, 'reset': True})
+
+    def test_change_carries_touched_game_rows(self):
+        game = Game.objects.get(host_team__name='Team A')
+        with self.captureOnCommitCallbacks(execute=True):
+            game.host_team_score, game.guest_team_score = 0, 2
+            game.save()
+        change = cache.get(change_key(2))
+        self.assertEqual(change['games'], [{'id': game.id, 'host_team_id': 'Team A', 'host_team_score': 0,
+                                            'guest_team_id': 'Team B', 'guest_team_score': 2}])
+
+        game_id = game.id
+        with self.captureOnCommitCallbacks(execute=True):
+            game.delete()
+        change = cache.get(change_key(3))
+        self.assertEqual(change['games'], [])
+        self.assertIn(game_id, change['deleted'])
+
+    def test_change_carries_moved_ranking_rows(self):
+        games = {game.host_team.name: game for game in Game.objects.select_related('host_team')}
+        with self.captureOnCommitCallbacks(execute=True):
+            games['Team A'].host_team_score = 0
+            games['Team A'].save()
+        self.assertIsNone(cache.get(change_key(2))['rankings'])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            games['Team C'].host_team_score = 1
+            games['Team C'].save()
+        self.assertEqual(cache.get(change_key(3))['rankings'], [
+            {'name': 'Team C', 'points': 3, 'rank': 1},
+            {'name': 'Team A', 'points': 1, 'rank': 2},
+            {'name': 'Team B', 'points': 1, 'rank': 3},
+            {'name': 'Team D', 'points': 0, 'rank': 4},
+        ])
+
+        with override_settings(CHANGE_FEED_RANKING_ROWS=1), self.captureOnCommitCallbacks(execute=True):
+            games['Team C'].host_team_score = 0
+            games['Team C'].save()
+        self.assertIsNone(cache.get(change_key(4))['rankings'])
+
+    @override_settings(CHANGE_FEED_ENABLED=False)
+    def test_nothing_is_published_when_disabled(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            Game.objects.all().delete()
+        self.assertIsNone(cache.get(change_key(2)))
+
+    def test_process_local_cache_is_reported(self):
+        self.assertEqual([warning.id for warning in change_feed_cache_check(None)], ['core.W001'])
+        with override_settings(CHANGE_FEED_ENABLED=False):
+            self.assertEqual(change_feed_cache_check(None), [])
+
+    @override_settings(CHANGE_FEED_BACKLOG=2)
+    def test_cursor_resets_lost_or_stale_clients(self):
+        stored = {change_key(2): {'id': 2, 'games': []}}
+        cursor = ChangeCursor(1)
+        self.assertEqual(cursor.advance(2, stored), format_event(stored[change_key(2)]))
+        self.assertEqual(cursor.advance(3, stored), '')
+        self.assertEqual(cursor.advance(3, stored), format_event({'id': 3, 'reset': True}))
+        self.assertEqual(ChangeCursor(1).advance(4, {}), format_event({'id': 4, 'reset': True}))
+        self.assertEqual(ChangeCursor(9).advance(0, {}), format_event({'id': 0, 'reset': True}))
+
+
+class LeagueEngineTestCase(TestCase):
+    def setUp(self):
+        self.teams = [Team.objects.create(name=f"Team {index}") for index in range(1, 5)]
+        scores = [(1, 0), (2, 2), (0, 3), (1, 1), (4, 2), (0, 0), (3, 1)]
+        for index, (host_team_score, guest_team_score) in enumerate(scores):
+            Game.objects.create(host_team=self.teams[index % 4], host_team_score=host_team_score,
+                                guest_team=self.teams[(index + 1) % 4], guest_team_score=guest_team_score)
+
+    def test_records_match_models(self):
+        with self.assertNumQueries(2):
+            engine = LeagueEngine.load()
+        for team in self.teams:
+            record = engine.team(team.id)
+            self.assertEqual((record.name, record.wins, record.loses, record.draws),
+                             (team.name, team.wins, team.loses, team.draws))
+            self.assertEqual(sorted(game.id for game in record.games), sorted(game.id for game in team.games))
+        with self.assertNumQueries(0):
+            game = engine.game(0)
+            self.assertEqual((game.winner.name, game.loser.name), ("Team 1", "Team 2"))
+            self.assertIsNone(engine.game(1).winner)
+            ranked_teams = RankingSystem(FirstStrategy()).rank_teams(engine.teams)
+        self.assertEqual(ranked_teams, RankingSystem(FirstStrategy()).rank_teams(Team.objects.all()))
+        self.assertEqual([team.name for team in engine.ranked_teams()], [team['name'] for team in ranked_teams])
+        self.assertEqual([team.name for team in engine.search("AM 3")], ["Team 3"])
+        self.assertFalse(hasattr(engine.teams[0], '__dict__'))
+
+    def test_simulated_games_stay_in_memory(self):
+        engine = LeagueEngine.load()
+        simulation = engine.copy()
+        game = simulation.add_game(self.teams[3].id, 5, self.teams[0].id, 0)
+        self.assertIsNone(game.id)
+        self.assertEqual(game.winner.name, "Team 4")
+        self.assertEqual(simulation.team(self.teams[3].id).wins, engine.team(self.teams[3].id).wins + 1)
+        self.assertEqual(len(simulation.team(self.teams[3].id).games), 4)
+        self.assertEqual((len(simulation), len(engine), Game.objects.count()), (8, 7, 7))
+        with self.assertRaises(ValueError):
+            simulation.add_game(self.teams[0].id, -1, self.teams[1].id, 0)
+
+    def test_load_season(self):
+        season = Season.objects.create(league=League.objects.create(name="League"), name="2024")
+        join_season(season.id, [self.teams[0].id, self.teams[1].id])
+        Game.objects.create(season=season, host_team=self.teams[0], host_team_score=0,
+                            guest_team=self.teams[1], guest_team_score=2)
+        engine = LeagueEngine.load(season=season.id)
+        self.assertEqual(len(engine), 1)
+        self.assertEqual([(team.name, team.points) for team in engine.ranked_teams()], [("Team 2", 3), ("Team 1", 0)])
@@ -4,12 +4,24 @@ from django.contrib.auth.models import AnonymousUser
 from django.urls import reverse
 from django.core.files.uploadedfile import SimpleUploadedFile
 from django.contrib.messages import get_messages
-from django.test import TestCase, Client
+from django.core.cache import cache
+from django.test import TestCase, Client, override_settings
+
+# 3rd Party Imports
+from asgiref.sync import sync_to_async
+from json import dump, dumps, loads
+import os
+import subprocess
+import sys
+import tempfile
+from unittest import mock
 
 # App Imports
 from core.forms import CustomUserCreationForm
-from core.models import User, Team, Game
+from core.models import User, Team, Game, Standing, ImportJob, League, Season
 from core.views import SigninView
+from utils.cache_utils import get_data_version
+from utils.metrics_utils import inc, reset_metrics
 
 
 class SignupViewTestCase(TestCase):
@@ -121,6 +133,14 @@ class UploadCSVViewTestCase(TestCase):
         response = self.client.post(self.url, {"csv_file": self.csv_file})
         self.assertEqual(response.status_code, 302)
 
+    def test_upload_csv_view_duplicate_file(self):
+        self.client.login(username="test@gmail.com", password="QAZ123zaq321?")
+        self.client.post(self.url, {"csv_file": self.csv_file})
+        self.csv_file.seek(0)
+        response = self.client.post(self.url, {"csv_file": self.csv_file})
+        self.assertIn("already%20imported", response.url)
+        self.assertEqual(Game.objects.count(), 2)
+
     def test_upload_csv_view_invalid_file(self):
         self.client.login(username="test@gmail.com", password="QAZ123zaq321?")
         response = self.client.post(self.url, {"csv_file": SimpleUploadedFile("test.txt", b"test data")})
@@ -133,6 +153,29 @@ class UploadCSVViewTestCase(TestCase):
         self.assertEqual(response.status_code, 200)
         self.assertTemplateUsed(response, "core/upload_csv.html")
 
+    def test_upload_csv_view_invalid_season(self):
+        self.client.login(username="test@gmail.com", password="QAZ123zaq321?")
+        response = self.client.post(self.url, {"csv_file": SimpleUploadedFile("games.csv", b"Team A,1,Team B,0\n"),
+                                               "season": "x"})
+        self.assertEqual(response.status_code, 400)
+        self.assertContains(response, "Unknown season.", status_code=400)
+        self.assertEqual(Game.objects.count(), 0)
+
+    def test_upload_csv_view_large_file_is_queued(self):
+        self.client.login(username="test@gmail.com", password="QAZ123zaq321?")
+        with tempfile.TemporaryDirectory() as spool_dir:
+            with override_settings(CSV_IMPORT_BACKGROUND_THRESHOLD=10, CSV_IMPORT_SPOOL_DIR=spool_dir):
+                response = self.client.post(self.url, {"csv_file": self.csv_file})
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(Game.objects.count(), 0)
+        job = ImportJob.objects.get()
+        self.assertEqual((job.status, job.created_by), (ImportJob.PENDING, self.user))
+        response = self.client.get(reverse("core:import_job", args=[job.id]))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["status"], ImportJob.PENDING)
+        self.client.force_login(User.objects.create_user(email="other@gmail.com", password="QAZ123zaq321?"))
+        self.assertEqual(self.client.get(reverse("core:import_job", args=[job.id])).status_code, 404)
+
 
 class HomeViewTestCase(TestCase):
     def setUp(self):
@@ -143,3 +186,395 @@ class HomeViewTestCase(TestCase):
         response = self.client.get(self.url)
         self.assertEqual(response.status_code, 200)
         self.assertTemplateUsed(response, "core/main.html")
+
+
+class HandlerViewTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.url = reverse("core:handler")
+        self.user = User.objects.create_user(email="test@gmail.com", password="QAZ123zaq321?")
+        self.client.force_login(self.user)
+        self.table_request = {'draw': 1, 'search': {'value': ''}, 'start': 0, 'length': 10,
+                              'order': [{'column': 0, 'dir': 'asc'}]}
+
+    def post(self, data):
+        return self.client.post(self.url, data=dumps(data), content_type="application/json")
+
+    def test_add_edit_delete_game_updates_standings(self):
+        self.post({'operation': 'add_game', 'host_team': 'Team A', 'host_team_score': '2',
+                   'guest_team': 'Team B', 'guest_team_score': '1'})
+        game = Game.objects.get()
+        self.assertEqual(Standing.objects.get(team__name='Team A').points, 3)
+        self.assertEqual(Standing.objects.get(team__name='Team B').points, 0)
+
+        self.post({'operation': 'edit_game', 'id': game.id, 'host_team_score': '1', 'guest_team_score': '1'})
+        self.assertEqual(Standing.objects.get(team__name='Team A').points, 1)
+        self.assertEqual(Standing.objects.get(team__name='Team B').points, 1)
+        self.assertEqual(Standing.objects.get(team__name='Team A').played, 1)
+
+        self.post({'operation': 'delete_game', 'id': game.id})
+        self.assertEqual(Game.objects.count(), 0)
+        self.assertEqual(Standing.objects.get(team__name='Team A').played, 0)
+        self.assertEqual(Standing.objects.get(team__name='Team B').points, 0)
+
+    def test_games_can_be_added_with_played_at(self):
+        self.post({'operation': 'add_game', 'host_team': 'Team A', 'host_team_score': '2',
+                   'guest_team': 'Team B', 'guest_team_score': '1', 'played_at': '2024-05-01T15:30:00+00:00'})
+        response = self.post({'operation': 'batch', 'operations': [
+            {'operation': 'add_game', 'host_team': 'Team B', 'host_team_score': 0,
+             'guest_team': 'Team A', 'guest_team_score': 0, 'played_at': '2024-05-08'},
+        ]})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([game.played_at.isoformat() for game in Game.objects.order_by('id')],
+                         ['2024-05-01T15:30:00+00:00', '2024-05-08T00:00:00+00:00'])
+
+        response = self.post({'operation': 'add_game', 'host_team': 'Team A', 'host_team_score': '2',
+                              'guest_team': 'Team B', 'guest_team_score': '1', 'played_at': 'yesterday'})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json()['message'], "Invalid played_at datetime: 'yesterday'.")
+        response = self.post({'operation': 'batch', 'operations': [
+            {'operation': 'add_game', 'host_team': 'Team B', 'host_team_score': 0,
+             'guest_team': 'Team A', 'guest_team_score': 0, 'played_at': 20240508},
+        ]})
+        self.assertEqual(response.json()['results'][0]['error'], "Invalid played_at datetime: 20240508.")
+        self.assertEqual(Game.objects.count(), 2)
+
+    def test_delete_game_without_a_valid_id(self):
+        self.assertEqual(self.post({'operation': 'delete_game'}).status_code, 400)
+        self.assertEqual(self.post({'operation': 'delete_game', 'id': 999}).status_code, 404)
+
+    def test_get_rankings_is_cached_until_data_changes(self):
+        self.post({'operation': 'add_game', 'host_team': 'Team A', 'host_team_score': '2',
+                   'guest_team': 'Team B', 'guest_team_score': '1'})
+        first = self.post({'operation': 'get_rankings', **self.table_request}).json()
+        with self.assertNumQueries(2):
+            cached = self.post({'operation': 'get_rankings', **self.table_request}).json()
+        self.assertEqual(cached, first)
+        self.post({'operation': 'add_game', 'host_team': 'Team B', 'host_team_score': '3',
+                   'guest_team': 'Team C', 'guest_team_score': '0'})
+        updated = self.post({'operation': 'get_rankings', **self.table_request}).json()
+        self.assertEqual(updated['data'][0], {'name': 'Team A', 'points': 3, 'rank': 1})
+        self.assertEqual(updated['recordsTotal'], 3)
+        stats = self.post({'operation': 'get_cache_stats'}).json()
+        self.assertEqual((stats['hits'], stats['misses']), (1, 2))
+
+    def test_list_games_keyset_pagination(self):
+        for score in range(3):
+            self.post({'operation': 'add_game', 'host_team': 'Team A', 'host_team_score': score,
+                       'guest_team': 'Team B', 'guest_team_score': 0})
+        request = {'operation': 'list_games', 'pagination': 'keyset', **self.table_request, 'length': 2}
+        first_page = self.post(request).json()
+        self.assertEqual(len(first_page['data']), 2)
+        second_page = self.post({**request, 'cursor': first_page['cursor']}).json()
+        self.assertEqual([game['host_team_score'] for game in second_page['data']], [2])
+        self.assertIsNone(second_page['cursor'])
+        self.assertEqual(self.post({**request, 'cursor': 'invalid'}).status_code, 400)
+
+    def test_season_scoped_operations(self):
+        season = Season.objects.create(league=League.objects.create(name='Premier'), name='2024')
+        self.post({'operation': 'add_game', 'host_team': 'Team A', 'host_team_score': '2',
+                   'guest_team': 'Team B', 'guest_team_score': '1', 'season': season.id})
+        self.post({'operation': 'add_game', 'host_team': 'Team C', 'host_team_score': '2',
+                   'guest_team': 'Team D', 'guest_team_score': '1'})
+        games = self.post({'operation': 'list_games', **self.table_request, 'season': season.id}).json()
+        self.assertEqual((games['recordsTotal'], games['data'][0]['host_team_id']), (1, 'Team A'))
+        rankings = self.post({'operation': 'get_rankings', **self.table_request, 'season': season.id}).json()
+        self.assertEqual([team['name'] for team in rankings['data']], ['Team A', 'Team B'])
+        response = self.post({'operation': 'add_game', 'host_team': 'Team A', 'host_team_score': '2',
+                              'guest_team': 'Team B', 'guest_team_score': '1', 'season': season.id + 1})
+        self.assertEqual(response.status_code, 400)
+
+    def test_invalid_season_is_a_bad_request(self):
+        response = self.post({'operation': 'add_game', 'host_team': 'Team A', 'host_team_score': '2',
+                              'guest_team': 'Team B', 'guest_team_score': '1', 'season': 'x'})
+        self.assertEqual((response.status_code, response.json()), (400, {'message': "Invalid season: 'x'."}))
+        for operation in ('list_games', 'get_rankings'):
+            response = self.post({'operation': operation, **self.table_request, 'season': '1 OR 1'})
+            self.assertEqual((response.status_code, response.json()), (400, {'error': "Invalid season: '1 OR 1'."}))
+        self.assertEqual(Game.objects.count(), 0)
+
+    def test_batch_applies_operations_in_one_transaction(self):
+        self.post({'operation': 'add_game', 'host_team': 'Team A', 'host_team_score': '2',
+                   'guest_team': 'Team B', 'guest_team_score': '1'})
+        self.post({'operation': 'add_game', 'host_team': 'Team A', 'host_team_score': '0',
+                   'guest_team': 'Team B', 'guest_team_score': '0'})
+        first, second = Game.objects.order_by('id')
+        with self.assertNumQueries(18):
+            response = self.post({'operation': 'batch', 'operations': [
+                {'operation': 'add_game', 'host_team': 'Team C', 'host_team_score': 3,
+                 'guest_team': 'Team A', 'guest_team_score': 0},
+                {'operation': 'edit_game', 'id': first.id, 'host_team_score': 0, 'guest_team_score': 1},
+                {'operation': 'delete_game', 'id': second.id},
+            ]})
+        self.assertEqual(response.status_code, 200)
+        results = response.json()['results']
+        self.assertEqual([result['status'] for result in results], ['ok', 'ok', 'ok'])
+        self.assertEqual(results[1]['id'], first.id)
+        self.assertEqual(Game.objects.count(), 2)
+        points = dict(Standing.objects.values_list('team__name', 'points'))
+        self.assertEqual(points, {'Team A': 0, 'Team B': 3, 'Team C': 3})
+        self.assertEqual(Standing.objects.get(team__name='Team A').played, 2)
+
+    def test_batch_rolls_back_when_an_item_fails(self):
+        response = self.post({'operation': 'batch', 'operations': [
+            {'operation': 'add_game', 'host_team': 'Team A', 'host_team_score': 1,
+             'guest_team': 'Team B', 'guest_team_score': 0},
+            {'operation': 'edit_game', 'id': 999, 'host_team_score': 1},
+            {'operation': 'add_game', 'host_team': 'Team A', 'host_team_score': -1,
+             'guest_team': 'Team C', 'guest_team_score': 0},
+            {'operation': 'rename_team'},
+        ]})
+        self.assertEqual(response.status_code, 400)
+        body = response.json()
+        self.assertFalse(body['applied'])
+        self.assertEqual([result.get('error') for result in body['results']], [
+            None, 'Game not found.', 'Scores must not be negative.',
+            'Operation must be one of add_game, edit_game, delete_game.',
+        ])
+        self.assertEqual((Game.objects.count(), Team.objects.count(), Standing.objects.count()), (0, 0, 0))
+        self.assertEqual(self.post({'operation': 'batch', 'operations': []}).status_code, 400)
+
+    def test_batch_rejects_malformed_values(self):
+        response = self.post({'operation': 'batch', 'operations': [
+            {'operation': 'delete_game', 'id': [1]},
+            {'operation': 'add_game', 'host_team': 'Team A', 'host_team_score': 1,
+             'guest_team': 'Team B', 'guest_team_score': 0, 'season': {'id': 1}},
+            {'operation': 'add_game', 'host_team': ['Team A'], 'host_team_score': 1,
+             'guest_team': 'Team B', 'guest_team_score': 0},
+            {'operation': ['add_game']},
+        ]})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual([result.get('error') for result in response.json()['results']], [
+            'id must be an integer id.', 'season must be an integer id.', 'Team names must be strings.',
+            'Operation must be one of add_game, edit_game, delete_game.',
+        ])
+
+    def test_batch_delete_sends_no_per_game_signals(self):
+        for score in range(3):
+            self.post({'operation': 'add_game', 'host_team': 'Team A', 'host_team_score': score,
+                       'guest_team': 'Team B', 'guest_team_score': 1})
+        version = get_data_version()
+        with mock.patch('core.signals.invalidate_standing_checkpoints') as invalidate:
+            response = self.post({'operation': 'batch', 'operations': [
+                {'operation': 'delete_game', 'id': game_id} for game_id in Game.objects.values_list('id', flat=True)
+            ]})
+        self.assertEqual(response.status_code, 200)
+        invalidate.assert_not_called()
+        self.assertNotEqual(get_data_version(), version)
+        self.assertEqual((Game.objects.count(), Standing.objects.get(team__name='Team B').points), (0, 0))
+
+class AsyncHandlerViewTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(email="test@gmail.com", password="QAZ123zaq321?")
+        self.client.force_login(self.user)
+        self.async_client.force_login(self.user)
+        self.table_request = {'draw': 1, 'search': {'value': 'team'}, 'start': 0, 'length': 10,
+                              'order': [{'column': 2, 'dir': 'desc'}]}
+        for score in range(3):
+            self.client.post(reverse("core:handler"), content_type="application/json", data=dumps({
+                'operation': 'add_game', 'host_team': 'Team A', 'host_team_score': score,
+                'guest_team': 'Team B', 'guest_team_score': 1,
+            }))
+
+    async def apost(self, data):
+        return await self.async_client.post(reverse("core:async_handler"), data=dumps(data),
+                                            content_type="application/json")
+
+    async def test_read_operations_match_sync_handler(self):
+        for operation in ('list_games', 'get_rankings'):
+            for extra in ({}, {'pagination': 'keyset'}):
+                request = {'operation': operation, **self.table_request, **extra}
+                response = await self.apost(request)
+                self.assertEqual(response.status_code, 200)
+                await cache.aclear()
+                expected = await sync_to_async(self.client.post)(
+                    reverse("core:handler"), data=dumps(request), content_type="application/json"
+                )
+                self.assertEqual(response.json(), expected.json())
+
+    async def test_other_operations_fall_back_to_sync_handler(self):
+        response = await self.apost({'operation': 'add_game', 'host_team': 'Team C', 'host_team_score': 1,
+                                     'guest_team': 'Team A', 'guest_team_score': 0})
+        self.assertEqual(response.status_code, 200)
+        rankings = (await self.apost({'operation': 'get_rankings', **self.table_request})).json()
+        self.assertEqual(rankings['recordsTotal'], 3)
+        self.assertEqual((await self.apost({'operation': 'unknown_operation'})).status_code, 422)
+
+    async def test_requires_login(self):
+        await sync_to_async(self.async_client.logout)()
+        response = await self.apost({'operation': 'get_rankings', **self.table_request})
+        self.assertEqual(response.status_code, 302)
+
+    @override_settings(REQUEST_TIMING_SAMPLE_RATE=1)
+    async def test_async_requests_are_timed(self):
+        with self.assertLogs("core.middleware", level="INFO") as logs:
+            response = await self.apost({'operation': 'get_rankings', **self.table_request})
+        self.assertIn("get_rankings;dur=", response["Server-Timing"])
+        record = loads(logs.records[0].getMessage())
+        self.assertGreater(record["operations"][0]["queries"], 0)
+
+class RequestTimingMiddlewareTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(email="test@gmail.com", password="QAZ123zaq321?")
+        self.client.force_login(self.user)
+        self.request = {'operation': 'get_rankings', 'draw': 1, 'search': {'value': ''}, 'start': 0, 'length': 10,
+                        'order': [{'column': 0, 'dir': 'asc'}]}
+
+    def post(self):
+        return self.client.post(reverse("core:handler"), data=dumps(self.request), content_type="application/json")
+
+    @override_settings(REQUEST_TIMING_SAMPLE_RATE=1)
+    def test_sampled_request_is_logged_with_server_timing(self):
+        with self.assertLogs("core.middleware", level="INFO") as logs:
+            response = self.post()
+        self.assertIn("get_rankings;dur=", response["Server-Timing"])
+        self.assertIn("queries", response["Server-Timing"])
+        record = loads(logs.records[0].getMessage())
+        self.assertEqual((record["path"], record["status"]), (reverse("core:handler"), 200))
+        self.assertEqual(record["operations"][0]["operation"], "get_rankings")
+        self.assertEqual(record["operations"][0]["response_bytes"], len(response.content))
+        self.assertGreater(record["queries"], record["operations"][0]["queries"])
+
+    @override_settings(REQUEST_TIMING_SAMPLE_RATE=0)
+    def test_unsampled_request_is_not_timed(self):
+        self.assertNotIn("Server-Timing", self.post())
+
+
+class MetricsViewTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        reset_metrics()
+        self.directory = tempfile.TemporaryDirectory()
+        self.settings = override_settings(METRICS_DIR=self.directory.name)
+        self.settings.enable()
+        self.user = User.objects.create_user(email="test@gmail.com", password="QAZ123zaq321?")
+        self.client.force_login(self.user)
+
+    def tearDown(self):
+        self.settings.disable()
+        self.directory.cleanup()
+        reset_metrics()
+
+    def test_metrics_expose_operations_imports_and_cache(self):
+        self.client.post(reverse("core:handler"), data=dumps({
+            'operation': 'get_rankings', 'draw': 1, 'search': {'value': ''}, 'start': 0, 'length': 10,
+            'order': [{'column': 0, 'dir': 'asc'}]
+        }), content_type="application/json")
+        self.client.post(reverse("core:upload_csv"), {
+            "csv_file": SimpleUploadedFile("games.csv", b"Team A,1,Team B,0\nTeam B,2,Team C,2\n")
+        })
+        response = self.client.get(reverse("core:metrics"))
+        self.assertEqual(response.status_code, 200)
+        body = response.content.decode()
+        self.assertIn('league_operation_duration_seconds_bucket{operation="get_rankings",le="+Inf"} 1', body)
+        self.assertIn('league_operation_duration_seconds_count{operation="get_rankings"} 1', body)
+        self.assertIn("league_games_imported_total 2", body)
+        self.assertIn("league_import_duration_seconds_count 1", body)
+        self.assertIn("league_response_cache_misses_total 1", body)
+
+    def test_metrics_are_summed_across_processes(self):
+        inc("league_games_imported_total", 5)
+        with open(os.path.join(self.directory.name, f"metrics_{os.getppid()}_parent.json"), "w") as other_process:
+            dump({"counters": [["league_games_imported_total", {}, 7]], "histograms": []}, other_process)
+        self.assertIn("league_games_imported_total 12", self.client.get(reverse("core:metrics")).content.decode())
+
+    def test_metrics_of_finished_processes_expire(self):
+        inc("league_games_imported_total", 5)
+        finished = subprocess.Popen([sys.executable, "-c", "pass"])
+        finished.wait()
+        path = os.path.join(self.directory.name, f"metrics_{finished.pid}_finished.json")
+        with open(path, "w") as finished_process:
+            dump({"counters": [["league_games_imported_total", {}, 7]], "histograms": []}, finished_process)
+        self.assertIn("league_games_imported_total 5", self.client.get(reverse("core:metrics")).content.decode())
+        self.assertFalse(os.path.exists(path))
+
+
+@override_settings(CHANGE_FEED_ENABLED=True, CHANGE_FEED_STREAM_TIMEOUT=0)
+class ChangesViewTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.url = reverse("core:changes")
+        self.user = User.objects.create_user(email="test@gmail.com", password="QAZ123zaq321?")
+        self.client.force_login(self.user)
+        self.async_client.force_login(self.user)
+        for score in range(2):
+            with self.captureOnCommitCallbacks(execute=True):
+                self.client.post(reverse("core:handler"), content_type="application/json", data=dumps({
+                    'operation': 'add_game', 'host_team': 'Team A', 'host_team_score': score,
+                    'guest_team': 'Team B', 'guest_team_score': 1,
+                }))
+
+    def events(self, body):
+        return [loads(line[len("data: "):]) for line in body.decode().splitlines() if line.startswith("data: ")]
+
+    def test_stream_replays_changes_after_last_event_id(self):
+        response = self.client.get(self.url, headers={"Last-Event-ID": "1"})
+        self.assertEqual(response["Content-Type"], "text/event-stream")
+        events = self.events(b"".join(response.streaming_content))
+        self.assertEqual([event['id'] for event in events], [2])
+        self.assertEqual(events[0]['games'][0]['host_team_score'], 1)
+
+    def test_new_stream_starts_at_latest_change(self):
+        response = self.client.get(self.url)
+        self.assertEqual(self.events(b"".join(response.streaming_content)), [])
+
+    async def test_async_stream(self):
+        response = await self.async_client.get(self.url, headers={"Last-Event-ID": "1"})
+        body = b"".join([chunk async for chunk in response.streaming_content])
+        self.assertEqual([event['id'] for event in self.events(body)], [2])
+
+    def test_requires_login(self):
+        self.client.logout()
+        self.assertEqual(self.client.get(self.url).status_code, 302)
+
+    @override_settings(CHANGE_FEED_ENABLED=False)
+    def test_disabled_feed(self):
+        self.assertEqual(self.client.get(self.url).status_code, 404)
+        self.assertNotContains(self.client.get(reverse("core:home")), 'id="changes_stream"')
+
+
+class ExportViewTestCase(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(email="test@gmail.com", password="QAZ123zaq321?")
+        self.client.force_login(self.user)
+        self.async_client.force_login(self.user)
+        self.client.post(reverse("core:upload_csv"), {
+            "csv_file": SimpleUploadedFile("games.csv", b"Team A,3,Team B,1\nTeam B,2,Team C,2\n")
+        })
+
+    def body(self, response):
+        return b"".join(response.streaming_content).decode()
+
+    @override_settings(EXPORT_CHUNK_SIZE=1)
+    def test_games_csv(self):
+        response = self.client.get(reverse("core:export", args=["games"]))
+        self.assertEqual(response["Content-Type"], "text/csv")
+        self.assertEqual(response["Content-Disposition"], 'attachment; filename="games.csv"')
+        rows = self.body(response).splitlines()
+        self.assertEqual(rows[0], "id,host_team,host_team_score,guest_team,guest_team_score,played_at,season")
+        self.assertEqual([row.split(",")[1:5] for row in rows[1:]],
+                         [["Team A", "3", "Team B", "1"], ["Team B", "2", "Team C", "2"]])
+
+    def test_standings_ndjson(self):
+        response = self.client.get(reverse("core:export", args=["standings"]), {"format": "ndjson"})
+        rows = [loads(line) for line in self.body(response).splitlines()]
+        self.assertEqual([(row["rank"], row["team"], row["points"]) for row in rows],
+                         [(1, "Team A", 3), (2, "Team B", 1), (3, "Team C", 1)])
+        self.assertEqual(rows[1]["goal_difference"], -2)
+
+    async def test_async_export(self):
+        response = await self.async_client.get(reverse("core:export", args=["games"]), {"format": "ndjson"})
+        body = b"".join([chunk async for chunk in response.streaming_content]).decode()
+        self.assertEqual([loads(line)["host_team"] for line in body.splitlines()], ["Team A", "Team B"])
+
+    def test_invalid_export(self):
+        self.assertEqual(self.client.get(reverse("core:export", args=["teams"])).status_code, 404)
+        response = self.client.get(reverse("core:export", args=["games"]), {"format": "xml"})
+        self.assertEqual(response.status_code, 400)
+        response = self.client.get(reverse("core:export", args=["games"]), {"season": 99})
+        self.assertEqual(response.json(), {"error": "Season not found"})
+        response = self.client.get(reverse("core:export", args=["games"]), {"season": "x"})
+        self.assertEqual((response.status_code, response.json()), (400, {"error": "Season not found"}))
+
@@ -2,14 +2,20 @@
 from django.urls import path
 
 # App Imports
-from core.views import HomeView, SignupView, SigninView, upload_csv, handler, logout_view
+from core.views import HomeView, SignupView, SigninView, upload_csv, import_job, handler, async_handler, logout_view, \
+    metrics, changes, export_data
 
 app_name = 'core'
 
 urlpatterns = [
     path('', HomeView.as_view(), name='home'),
     path('upload-csv/', upload_csv, name='upload_csv'),
+    path('import-jobs/<int:job_id>/', import_job, name='import_job'),
     path('handler/', handler, name='handler'),
+    path('handler/async/', async_handler, name='async_handler'),
+    path('metrics', metrics, name='metrics'),
+    path('changes/', changes, name='changes'),
+    path('export/<str:export>/', export_data, name='export'),
     path('sign-up/', SignupView.as_view(), name='sign_up'),
     path('sign-in/', SigninView.as_view(), name='sign_in'),
     path('logout-out/', logout_view, name='log_out'),
@@ -1,9 +1,11 @@
 # Django Imports
-
+from django.conf import settings
 from django.contrib.auth.forms import AuthenticationForm
-from django.shortcuts import render, redirect
-from django.http import JsonResponse
+from django.shortcuts import render, redirect, get_object_or_404
+from django.core.handlers.asgi import ASGIRequest
+from django.http import Http404, HttpResponse, HttpResponseNotAllowed, JsonResponse, StreamingHttpResponse
 from django.contrib.auth.decorators import login_required
+from django.contrib.auth.views import redirect_to_login
 from django.contrib.auth import authenticate, login, logout
 from django.urls import reverse_lazy, reverse
 from django.views.generic import FormView
@@ -12,10 +14,17 @@ from django.views.decorators.csrf import csrf_exempt
 
 # App Imports
 from utils.csv_utils import process_csv_file
-from core.handlers import GamesHandler
+from utils.export_utils import EXPORT_FORMATS, EXPORTS, aexport_chunks, export_chunks
+from utils.feed_utils import ChangeCursor, achange_stream, change_stream
+from utils.import_utils import enqueue_import, read_progress
+from utils.metrics_utils import render_metrics
+from utils.ranking_utils import parse_season
+from core.handlers import AsyncGamesHandler, GamesHandler
 from core.forms import CustomUserCreationForm, EventOperation
+from core.models import ImportJob, Season
 
 # 3rd Party Imports
+from asgiref.sync import sync_to_async
 from http import HTTPStatus
 from json import loads
 
@@ -98,11 +107,48 @@ def handler(request, *args, **kwargs):
             )
 
 
+# Django 4.2's login_required and csrf_exempt only wrap sync views, so this
+# async twin of `handler` checks both itself.
+async def async_handler(request, *args, **kwargs):
+    is_authenticated = await sync_to_async(lambda: request.user.is_authenticated)()
+    if not is_authenticated:
+        return redirect_to_login(request.get_full_path())
+    if request.method == "POST":
+        request_body = EventOperation(loads(request.body))
+        if not request_body.is_valid():
+            return JsonResponse(data=request_body.errors, status=HTTPStatus.UNPROCESSABLE_ENTITY)
+        operation = request_body.cleaned_data.get('operation', None)
+        method_handler = getattr(AsyncGamesHandler, operation, None)
+        if method_handler:
+            return await method_handler(request)
+        method_handler = getattr(GamesHandler, operation, None)
+        if not method_handler:
+            return JsonResponse(
+                data={"operation": [f"{operation} operation is not supported!"]},
+                status=HTTPStatus.UNPROCESSABLE_ENTITY,
+            )
+        return await sync_to_async(method_handler)(request)
+    return HttpResponseNotAllowed(["POST"])
+
+
+async_handler.csrf_exempt = True
+
+
+def season_exists(seasons, value):
+    try:
+        season = parse_season(value)
+    except ValueError:
+        return False
+    return season is None or seasons.filter(id=season).exists()
+
+
 @login_required
 def upload_csv(request):
+    seasons = Season.objects.select_related('league').order_by('league__name', 'name')
     if request.method == 'POST':
         csv_file = request.FILES.get('csv_file', None)
-        error = {"error": "No file provided."}
+        season = request.POST.get('season') or None
+        error = {"error": "No file provided.", "seasons": seasons}
         success = "CSV file uploaded successfully."
         # Check if file is provided
         if not csv_file:
@@ -110,21 +156,76 @@ def upload_csv(request):
 
         # Check if file is CSV
         if not csv_file.name.endswith('.csv'):
-            error = {"error": "File is not a CSV file."}
+            error = {"error": "File is not a CSV file.", "seasons": seasons}
             return render(request, 'core/upload_csv.html', context=error)
+        if not season_exists(seasons, season):
+            error = {"error": "Unknown season.", "seasons": seasons}
+            return render(request, 'core/upload_csv.html', context=error, status=HTTPStatus.BAD_REQUEST)
+        if csv_file.size > settings.CSV_IMPORT_BACKGROUND_THRESHOLD:
+            job = enqueue_import(csv_file, user=request.user, season=season)
+            success = f"Import job {job.id} queued, track it at {reverse('core:import_job', args=[job.id])}"
+            return redirect(reverse('core:home') + f"?success={success}")
         try:
-            process_csv_file(csv_file)
+            report = process_csv_file(csv_file, season=season)
+            if report['duplicate_files']:
+                success = "This CSV file was already imported."
+            elif report['skipped']:
+                success = f"CSV file uploaded successfully, {report['skipped']} already imported rows skipped."
             return redirect(reverse('core:home') + f"?success={success}")
         except Exception as e:
-            error = {"error": f'Error processing CSV file: {e}'}
+            error = {"error": f'Error processing CSV file: {e}', "seasons": seasons}
             return render(request, 'core/upload_csv.html', context=error)
-    return render(request, 'core/upload_csv.html')
+    return render(request, 'core/upload_csv.html', {"seasons": seasons})
+
+
+@login_required
+def import_job(request, job_id):
+    jobs = ImportJob.objects.all() if request.user.is_staff else ImportJob.objects.filter(created_by=request.user)
+    job = get_object_or_404(jobs, id=job_id)
+    return JsonResponse(data=read_progress(job), status=HTTPStatus.OK)
+
+
+# Server-sent events stream of league changes. Under ASGI the stream is an
+# async generator so idle viewers do not hold a worker thread.
+@login_required
+def changes(request):
+    if not settings.CHANGE_FEED_ENABLED:
+        raise Http404("The change feed is disabled.")
+    last_id = request.headers.get('Last-Event-ID') or request.GET.get('last_event_id')
+    cursor = ChangeCursor(int(last_id) if last_id and last_id.isdigit() else None)
+    stream = achange_stream(cursor) if isinstance(request, ASGIRequest) else change_stream(cursor)
+    response = StreamingHttpResponse(stream, content_type="text/event-stream")
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'
+    return response
+
+
+@login_required
+def export_data(request, export):
+    if export not in EXPORTS:
+        raise Http404(f"Unknown export {export}.")
+    format = request.GET.get('format', 'csv')
+    if format not in EXPORT_FORMATS:
+        return JsonResponse({'error': f"format must be one of {', '.join(EXPORT_FORMATS)}."},
+                            status=HTTPStatus.BAD_REQUEST)
+    season = request.GET.get('season') or None
+    if not season_exists(Season.objects.all(), season):
+        return JsonResponse({'error': 'Season not found'}, status=HTTPStatus.BAD_REQUEST)
+    chunks = aexport_chunks if isinstance(request, ASGIRequest) else export_chunks
+    response = StreamingHttpResponse(chunks(export, format, season=season), content_type=EXPORT_FORMATS[format])
+    response['Content-Disposition'] = f'attachment; filename="{export}.{format}"'
+    return response
+
+
+def metrics(request):
+    return HttpResponse(render_metrics(), content_type="text/plain; version=0.0.4; charset=utf-8")
 
 
 class HomeView(View):
 
     def get(self, request, *args, **kwargs):
+        context = {'change_feed_enabled': settings.CHANGE_FEED_ENABLED}
         success = request.GET.get('success')
         if success:
-            return render(request, 'core/main.html', {'success': success})
-        return render(request, "core/main.html")
+            context['success'] = success
+        return render(request, "core/main.html", context)
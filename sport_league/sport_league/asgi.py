@@ -12,5 +12,7 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'sport_league.settings')
+# Async views serve the change feed without holding a thread per viewer.
+os.environ.setdefault('CHANGE_FEED_ENABLED', '1')
 
 application = get_asgi_application()
@@ -51,6 +51,7 @@ INSTALLED_APPS = [
 AUTH_USER_MODEL = "core.User"
 
 MIDDLEWARE = [
+    'core.middleware.RequestTimingMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -89,10 +90,44 @@ DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        'OPTIONS': {
+            # Let concurrent writers (e.g. import workers) wait for the lock.
+            'timeout': 20,
+        },
     }
 }
 
 
+# Cache
+# Local memory by default; point CACHE_DIR at a shared directory to share the
+# response cache and hit/miss counters between worker processes.
+
+if os.getenv('CACHE_DIR'):
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+            'LOCATION': os.getenv('CACHE_DIR'),
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+    }
+
+# Seconds a cached list_games/get_rankings response is kept; entries are also
+# invalidated as soon as league data changes.
+
+RESPONSE_CACHE_TIMEOUT = int(os.getenv('RESPONSE_CACHE_TIMEOUT', 300))
+
+# League data changes are tracked by a version stored in the database. Each
+# process checks it at most every this many seconds, so cached responses and
+# ranking snapshots of other processes lag a write by no more than that.
+
+DATA_VERSION_CHECK_INTERVAL = float(os.getenv('DATA_VERSION_CHECK_INTERVAL', 1))
+
+
 # Password validation
 # https://docs.djangoproject.com/en/3.2/ref/settings/#auth-password-validators
 
@@ -135,6 +170,128 @@ STATICFILES_DIRS = [
 ]
 
 
+# Ranking
+# Points per result, used by the stored standings and every ranking strategy,
+# and ordered tie breakers for teams level on points. Tie breakers:
+# goal_difference, goals_for, goals_against, wins, head_to_head, name. Rankings
+# read from the stored standings apply all but head_to_head, which only
+# ConfigurableStrategy computes from the games; teams still level are ranked by
+# name. Stored standings keep the points they were written with, so run
+# `python manage.py rebuild_standings` after changing them.
+
+LEAGUE_RANKING = {
+    'points': {'win': 3, 'draw': 1, 'loss': 0},
+    'tie_breakers': ['name'],
+}
+
+# Number of seasons whose ranking snapshot each process keeps in memory.
+
+RANKING_SNAPSHOT_SEASONS = int(os.getenv('RANKING_SNAPSHOT_SEASONS', 32))
+
+
+# Number of games between two point-in-time standings checkpoints.
+
+STANDINGS_CHECKPOINT_INTERVAL = int(os.getenv('STANDINGS_CHECKPOINT_INTERVAL', 1000))
+
+
+# CSV import
+# Number of rows parsed, resolved and inserted per bulk batch.
+
+CSV_IMPORT_BATCH_SIZE = int(os.getenv('CSV_IMPORT_BATCH_SIZE', 1000))
+
+# Bytes of a server-side CSV file parsed per block by the memory-mapped importer.
+
+CSV_BLOCK_SIZE = int(os.getenv('CSV_BLOCK_SIZE', 8 * 1024 * 1024))
+
+# Kilobytes of SQLite page cache used while importing; 0 keeps the default.
+
+CSV_IMPORT_SQLITE_CACHE_KB = int(os.getenv('CSV_IMPORT_SQLITE_CACHE_KB', 64 * 1024))
+
+# Uploads larger than this many bytes are spooled to CSV_IMPORT_SPOOL_DIR and
+# imported by `python manage.py run_import_workers` instead of inside the request.
+
+CSV_IMPORT_BACKGROUND_THRESHOLD = int(os.getenv('CSV_IMPORT_BACKGROUND_THRESHOLD', 1024 * 1024))
+CSV_IMPORT_SPOOL_DIR = os.getenv('CSV_IMPORT_SPOOL_DIR', BASE_DIR / 'imports')
+
+# A running import job without progress for this many seconds is assumed to have
+# lost its worker and is claimed again by the next one.
+
+IMPORT_JOB_STALE_TIMEOUT = int(os.getenv('IMPORT_JOB_STALE_TIMEOUT', 600))
+
+
+# Games listing
+# Seconds the filtered/total game counts of keyset pagination are cached for
+# (they are also invalidated whenever league data changes).
+
+GAMES_COUNT_CACHE_TIMEOUT = int(os.getenv('GAMES_COUNT_CACHE_TIMEOUT', 30))
+
+
+# Handler batches
+# Maximum number of add/edit/delete operations accepted by one `batch` request.
+
+BATCH_MAX_OPERATIONS = int(os.getenv('BATCH_MAX_OPERATIONS', 1000))
+
+
+# Export
+# Rows fetched per database round trip and written per streamed chunk by the
+# games and standings exports.
+
+EXPORT_CHUNK_SIZE = int(os.getenv('EXPORT_CHUNK_SIZE', 2000))
+
+
+# Change feed
+# Off by default, as under WSGI every open stream holds a worker thread; asgi.py
+# turns it on and CHANGE_FEED_ENABLED=1 forces it on. Changes are shared between
+# processes through the cache, so more than one process needs CACHE_DIR set.
+# Every committed change is kept for CHANGE_FEED_TIMEOUT seconds as a compact
+# diff streamed by /changes/. Clients more than CHANGE_FEED_BACKLOG changes
+# behind are told to reload. A change carries at most CHANGE_FEED_RANKING_ROWS
+# moved ranking rows; larger moves make clients reload the rankings. Each stream
+# polls the cache every CHANGE_FEED_POLL_INTERVAL seconds and closes after
+# CHANGE_FEED_STREAM_TIMEOUT seconds, after which the browser reconnects where it
+# left off.
+
+CHANGE_FEED_ENABLED = os.getenv('CHANGE_FEED_ENABLED') == '1'
+CHANGE_FEED_TIMEOUT = int(os.getenv('CHANGE_FEED_TIMEOUT', 300))
+CHANGE_FEED_BACKLOG = int(os.getenv('CHANGE_FEED_BACKLOG', 1000))
+CHANGE_FEED_RANKING_ROWS = int(os.getenv('CHANGE_FEED_RANKING_ROWS', 100))
+CHANGE_FEED_POLL_INTERVAL = float(os.getenv('CHANGE_FEED_POLL_INTERVAL', 1))
+CHANGE_FEED_STREAM_TIMEOUT = float(os.getenv('CHANGE_FEED_STREAM_TIMEOUT', 60))
+CHANGE_FEED_RETRY_MS = int(os.getenv('CHANGE_FEED_RETRY_MS', 1000))
+
+
+# Request timing
+# Share of requests (0 to 1) whose wall time, query count, DB time and response
+# size are logged as JSON by core.middleware and sent in a Server-Timing header.
+
+REQUEST_TIMING_SAMPLE_RATE = float(os.getenv('REQUEST_TIMING_SAMPLE_RATE', 0.1))
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {'class': 'logging.StreamHandler'},
+    },
+    'loggers': {
+        'core.middleware': {'handlers': ['console'], 'level': os.getenv('REQUEST_TIMING_LOG_LEVEL', 'INFO')},
+    },
+}
+
+
+# Metrics
+# Every process writes its samples to its own file in METRICS_DIR at most every
+# METRICS_FLUSH_INTERVAL seconds; /metrics sums the files of running processes
+# and deletes the others.
+
+METRICS_DIR = os.getenv('METRICS_DIR', BASE_DIR / 'metrics')
+METRICS_FLUSH_INTERVAL = float(os.getenv('METRICS_FLUSH_INTERVAL', 5))
+
+
+# Tests
+
+TEST_RUNNER = 'core.test_runner.TestRunner'
+
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/4.2/ref/settings/#default-auto-field
 
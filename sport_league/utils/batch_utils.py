@@ -0,0 +1,206 @@
+# Django Imports
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils import timezone
+
+# App Imports
+from core.models import Game, Season, Team
+from utils.cache_utils import bump_data_version
+from utils.feed_utils import record_changes
+from utils.csv_utils import resolve_team_ids
+from utils.ranking_utils import parse_played_at
+from utils.standings_utils import add_game_result, apply_standings_deltas, invalidate_standing_checkpoints, \
+    join_season
+
+# 3rd Party Imports
+from collections import Counter, defaultdict
+from itertools import chain
+
+GAME_FIELDS = ['host_team', 'host_team_score', 'guest_team', 'guest_team_score']
+
+
+def parse_score(value):
+    try:
+        score = int(value)
+    except (TypeError, ValueError):
+        raise ValueError("Scores must be integers.")
+    if score < 0:
+        raise ValueError("Scores must not be negative.")
+    return score
+
+
+def parse_id(value, field='id'):
+    if isinstance(value, bool) or not isinstance(value, (int, str)) or not str(value).isdigit():
+        raise ValueError(f"{field} must be an integer id.")
+    return int(value)
+
+
+def parse_team_name(value):
+    if not isinstance(value, str):
+        raise ValueError("Team names must be strings.")
+    return value
+
+
+# QuerySet.delete sends post_delete for every game, and each one invalidates
+# checkpoints, bumps the data version and records a change; the batch does all
+# of that once for every game it touched.
+def delete_games(game_ids, batch_size=500):
+    table, column = connection.ops.quote_name(Game._meta.db_table), connection.ops.quote_name(Game._meta.pk.column)
+    with connection.cursor() as cursor:
+        for start in range(0, len(game_ids), batch_size):
+            chunk = game_ids[start:start + batch_size]
+            cursor.execute(f"DELETE FROM {table} WHERE {column} IN ({', '.join(['%s'] * len(chunk))})", chunk)
+
+
+class GameBatch:
+    def __init__(self, operations):
+        if not isinstance(operations, list) or not operations:
+            raise ValueError("operations must be a non-empty list.")
+        if len(operations) > settings.BATCH_MAX_OPERATIONS:
+            raise ValueError(f"A batch accepts at most {settings.BATCH_MAX_OPERATIONS} operations.")
+        self.operations = [item if isinstance(item, dict) else {} for item in operations]
+        self.handlers = {
+            'add_game': self.prepare_add,
+            'edit_game': self.prepare_edit,
+            'delete_game': self.prepare_delete,
+        }
+        self.added, self.edited, self.deleted = [], {}, []
+        self.deltas = defaultdict(Counter)
+        self.season_deltas = defaultdict(lambda: defaultdict(Counter))
+        self.earliest_change = None
+
+    # Invalid values are left out here and reported by their own operation.
+    def values(self, operations, fields, parse):
+        values = set()
+        for item in self.operations:
+            if item.get('operation') in operations:
+                for field in fields:
+                    if item.get(field):
+                        try:
+                            values.add(parse(item[field]))
+                        except ValueError:
+                            pass
+        return values
+
+    def load(self):
+        self.games = Game.objects.in_bulk(list(self.values(('edit_game', 'delete_game'), ('id',), parse_id)))
+        self.season_ids = set(
+            Season.objects.filter(id__in=self.values(('add_game',), ('season',), parse_id))
+            .values_list('id', flat=True)
+        )
+        # Teams named by added games are created like the CSV importer does, edits
+        # only accept existing teams. Both are rolled back if the batch fails.
+        team_fields = ('host_team', 'guest_team')
+        self.team_ids = resolve_team_ids(self.values(('add_game',), team_fields, parse_team_name), {})
+        self.existing_team_ids = dict(self.team_ids)
+        edited_names = self.values(('edit_game',), team_fields, parse_team_name) - self.team_ids.keys()
+        if edited_names:
+            self.existing_team_ids.update(Team.objects.filter(name__in=edited_names).values_list('name', 'id'))
+
+    def record(self, game, sign):
+        add_game_result(self.deltas, game.host_team_id, game.host_team_score, game.guest_team_id,
+                        game.guest_team_score, sign=sign)
+        if game.season_id:
+            add_game_result(self.season_deltas[game.season_id], game.host_team_id, game.host_team_score,
+                            game.guest_team_id, game.guest_team_score, sign=sign)
+        if self.earliest_change is None or game.played_at < self.earliest_change:
+            self.earliest_change = game.played_at
+
+    def team_id(self, name, team_ids):
+        if parse_team_name(name) not in team_ids:
+            raise ValueError(f"Team {name!r} not found.")
+        return team_ids[name]
+
+    def prepare_add(self, item):
+        if not item.get('host_team') or not item.get('guest_team'):
+            raise ValueError("host_team and guest_team are required.")
+        season_id = parse_id(item['season'], 'season') if item.get('season') else None
+        if season_id and season_id not in self.season_ids:
+            raise ValueError("Season not found.")
+        game = Game(
+            host_team_id=self.team_id(item['host_team'], self.team_ids),
+            host_team_score=parse_score(item.get('host_team_score')),
+            guest_team_id=self.team_id(item['guest_team'], self.team_ids),
+            guest_team_score=parse_score(item.get('guest_team_score')),
+            season_id=season_id, played_at=parse_played_at(item.get('played_at')) or timezone.now(),
+        )
+        if game.host_team_id == game.guest_team_id:
+            raise ValueError("Guest and Host teams must not be the same.")
+        self.record(game, sign=1)
+        self.added.append(game)
+        return game
+
+    def existing_game(self, item):
+        game = self.games.get(parse_id(item['id'], 'id')) if item.get('id') else None
+        if game is None:
+            raise ValueError("Game not found.")
+        return game
+
+    def prepare_edit(self, item):
+        game = self.existing_game(item)
+        host_team_id, guest_team_id = game.host_team_id, game.guest_team_id
+        if item.get('host_team'):
+            host_team_id = self.team_id(item['host_team'], self.existing_team_ids)
+        if item.get('guest_team'):
+            guest_team_id = self.team_id(item['guest_team'], self.existing_team_ids)
+        if host_team_id == guest_team_id:
+            raise ValueError("Guest and Host teams must not be the same.")
+        host_team_score = parse_score(item.get('host_team_score', game.host_team_score))
+        guest_team_score = parse_score(item.get('guest_team_score', game.guest_team_score))
+        self.record(game, sign=-1)
+        game.host_team_id, game.host_team_score = host_team_id, host_team_score
+        game.guest_team_id, game.guest_team_score = guest_team_id, guest_team_score
+        self.record(game, sign=1)
+        self.edited[game.id] = game
+        return game
+
+    def prepare_delete(self, item):
+        game = self.existing_game(item)
+        self.record(game, sign=-1)
+        del self.games[game.id]
+        self.edited.pop(game.id, None)
+        self.deleted.append(game)
+        return game
+
+    def prepare(self):
+        self.load()
+        results, games = [], []
+        for index, item in enumerate(self.operations):
+            result = {'index': index, 'operation': item.get('operation'), 'status': 'ok'}
+            try:
+                operation = item.get('operation')
+                handler = self.handlers.get(operation) if isinstance(operation, str) else None
+                if handler is None:
+                    raise ValueError(f"Operation must be one of {', '.join(self.handlers)}.")
+                games.append(handler(item))
+            except ValueError as e:
+                result.update(status='error', error=str(e))
+                games.append(None)
+            results.append(result)
+        return results, games
+
+    @transaction.atomic
+    def apply(self):
+        results, games = self.prepare()
+        if any(result['status'] == 'error' for result in results):
+            transaction.set_rollback(True)
+            return False, results
+        Game.objects.bulk_create(self.added, batch_size=500)
+        Game.objects.bulk_update(self.edited.values(), GAME_FIELDS, batch_size=500)
+        delete_games([game.id for game in self.deleted])
+        season_teams = defaultdict(set)
+        for game in self.added:
+            if game.season_id:
+                season_teams[game.season_id].update((game.host_team_id, game.guest_team_id))
+        for season_id, team_ids in season_teams.items():
+            join_season(season_id, team_ids)
+        apply_standings_deltas(self.deltas)
+        for season_id, season_deltas in self.season_deltas.items():
+            apply_standings_deltas(season_deltas, season_id=season_id)
+        if self.earliest_change is not None:
+            invalidate_standing_checkpoints(self.earliest_change)
+        bump_data_version()
+        record_changes([game.id for game in chain(self.added, self.edited.values(), self.deleted)])
+        for game, result in zip(games, results):
+            result['id'] = game.id
+        return True, results
@@ -0,0 +1,152 @@
+# Django Imports
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+
+# App Imports
+from core.models import Game, Team
+from utils.cache_utils import bump_data_version
+from utils.csv_utils import iter_batches, iter_blocks, mapped_file, parse_block, parse_csv_row
+from utils.search_utils import index_team_names
+from utils.standings_utils import rebuild_standings
+
+# 3rd Party Imports
+from contextlib import contextmanager
+from itertools import islice
+import csv
+import io
+import math
+import random
+import time
+import tracemalloc
+
+
+def uniform_score(generator, max_score):
+    return generator.randint(0, max_score)
+
+
+# Goals are roughly Poisson distributed in real leagues, low scores and many draws.
+def poisson_score(generator, max_score):
+    limit, score, product = math.exp(-max_score / 3), 0, generator.random()
+    while product > limit and score < max_score:
+        score += 1
+        product *= generator.random()
+    return score
+
+
+SCORE_DISTRIBUTIONS = {
+    'uniform': uniform_score,
+    'poisson': poisson_score,
+}
+
+
+def generate_results(team_ids, games_count, max_score=5, distribution='uniform', generator=None):
+    generator = generator or random.Random()
+    score = SCORE_DISTRIBUTIONS[distribution]
+    for _ in range(games_count):
+        host_team_id, guest_team_id = generator.sample(team_ids, 2)
+        yield host_team_id, score(generator, max_score), guest_team_id, score(generator, max_score)
+
+
+def generate_league(teams_count, games_count, max_score=5, seed=None, batch_size=10000, distribution='uniform'):
+    generator = random.Random(seed)
+    prefix = f"Bench {generator.getrandbits(32):08x}"
+    Team.objects.bulk_create([Team(name=f"{prefix} {index}") for index in range(teams_count)], batch_size=batch_size)
+    teams = list(Team.objects.filter(name__startswith=prefix))
+    index_team_names(teams, replace=False)
+    team_ids = [team.id for team in teams]
+    results = generate_results(team_ids, games_count, max_score, distribution, generator)
+    for start in range(0, games_count, batch_size):
+        games = [
+            Game(host_team_id=host_team_id, host_team_score=host_team_score,
+                 guest_team_id=guest_team_id, guest_team_score=guest_team_score)
+            for host_team_id, host_team_score, guest_team_id, guest_team_score
+            in islice(results, batch_size)
+        ]
+        Game.objects.bulk_create(games)
+    rebuild_standings()
+    return Team.objects.filter(name__startswith=f"{prefix} ")
+
+
+@contextmanager
+def rolled_back():
+    with transaction.atomic():
+        yield
+        transaction.set_rollback(True)
+
+
+def timed(func, *args, **kwargs):
+    started = time.perf_counter()
+    result = func(*args, **kwargs)
+    return result, time.perf_counter() - started
+
+
+def generate_csv(team_names, games_count, max_score=5, distribution='uniform', seed=None):
+    results = generate_results(team_names, games_count, max_score, distribution, random.Random(seed))
+    return "".join(f"{host},{host_score},{guest},{guest_score}\n" for host, host_score, guest, guest_score in results)
+
+
+# Tracing allocations slows Python code down several times, so time and peak
+# memory come from two runs. Each starts from the same data with cold caches,
+# and its writes are rolled back.
+def measure(func, *args, **kwargs):
+    with rolled_back():
+        bump_data_version()
+        with CaptureQueriesContext(connection) as queries:
+            started = time.perf_counter()
+            func(*args, **kwargs)
+            elapsed = time.perf_counter() - started
+    with rolled_back():
+        bump_data_version()
+        tracemalloc.start()
+        try:
+            func(*args, **kwargs)
+            _, peak_memory = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+    return {'seconds': elapsed, 'queries': len(queries), 'peak_memory': peak_memory}
+
+
+def compare_results(baseline, current, threshold=0.2):
+    baseline = {(result['scenario'], result['games']): result for result in baseline['results']}
+    regressions = []
+    for result in current['results']:
+        previous = baseline.get((result['scenario'], result['games']))
+        if previous is None:
+            continue
+        for metric in ('seconds', 'queries', 'peak_memory'):
+            if result[metric] > previous[metric] * (1 + threshold):
+                regressions.append({
+                    'scenario': result['scenario'], 'games': result['games'], 'metric': metric,
+                    'baseline': previous[metric], 'current': result[metric],
+                })
+    return regressions
+
+
+def write_csv_file(path, size, teams_count=1000, max_score=5, distribution='uniform', seed=None):
+    team_names = [f"Team {index}" for index in range(teams_count)]
+    generator = random.Random(seed)
+    with open(path, 'w') as csv_file:
+        while csv_file.tell() < size:
+            results = generate_results(team_names, 10000, max_score, distribution, generator)
+            csv_file.write("".join(f"{host},{host_score},{guest},{guest_score}\n"
+                                   for host, host_score, guest, guest_score in results))
+
+
+# The two parsers the importers use, without the database writes.
+def read_with_csv_reader(path, batch_size=1000):
+    rows = 0
+    with open(path, 'rb') as csv_file:
+        csv_data = enumerate(csv.reader(io.TextIOWrapper(csv_file, encoding='utf-8')), start=1)
+        for batch in iter_batches(csv_data, batch_size):
+            rows += len([parse_csv_row(row, line_number) for line_number, row in batch])
+    return rows
+
+
+def read_with_blocks(path, block_size=None):
+    rows, line_number, names = 0, 0, {}
+    with mapped_file(path) as mapped:
+        for block in iter_blocks(mapped, block_size):
+            columns, _, line_number = parse_block(block, line_number, names)
+            rows += len(columns[0])
+    return rows
+
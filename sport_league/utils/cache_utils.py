@@ -0,0 +1,114 @@
+# Django Imports
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+# App Imports
+from core.models import DataVersion
+
+# 3rd Party Imports
+from hashlib import md5
+from json import dumps
+from uuid import uuid4
+
+DATA_VERSION_KEY = 'league:data-version'
+HITS_KEY = 'league:response-cache-hits'
+MISSES_KEY = 'league:response-cache-misses'
+
+
+# The version is kept in the database, so a write in any process reaches all of
+# them, and each process reads it at most every DATA_VERSION_CHECK_INTERVAL
+# seconds through its cache.
+def get_data_version():
+    version = cache.get(DATA_VERSION_KEY)
+    if version is None:
+        version = DataVersion.objects.get_or_create(pk=1, defaults={'version': uuid4().hex})[0].version
+        cache.set(DATA_VERSION_KEY, version, timeout=settings.DATA_VERSION_CHECK_INTERVAL)
+    return version
+
+
+async def aget_data_version():
+    version = await cache.aget(DATA_VERSION_KEY)
+    if version is None:
+        version = (await DataVersion.objects.aget_or_create(pk=1, defaults={'version': uuid4().hex}))[0].version
+        await cache.aset(DATA_VERSION_KEY, version, timeout=settings.DATA_VERSION_CHECK_INTERVAL)
+    return version
+
+
+def forget_data_version():
+    cache.delete(DATA_VERSION_KEY)
+
+
+# Every bump stores a brand new random version instead of incrementing, so
+# concurrent bumps can never collapse into a version a reader already cached
+# stale data under. The new version is written in the writer's transaction and
+# the cached one dropped twice: now, so the writer reads its own changes, and
+# after commit, so nothing another thread cached meanwhile outlives the write.
+def bump_data_version():
+    version = uuid4().hex
+    if not DataVersion.objects.filter(pk=1).update(version=version):
+        DataVersion.objects.get_or_create(pk=1, defaults={'version': version})
+    forget_data_version()
+    transaction.on_commit(forget_data_version)
+
+
+def increment(key):
+    cache.add(key, 0, timeout=None)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, 1, timeout=None)
+
+
+async def aincrement(key):
+    await cache.aadd(key, 0, timeout=None)
+    try:
+        await cache.aincr(key)
+    except ValueError:
+        await cache.aset(key, 1, timeout=None)
+
+
+def response_cache_digest(operation, request_body):
+    params = [
+        operation, request_body['search']['value'].strip(), request_body.get('start'), request_body['length'],
+        request_body['order'], request_body.get('pagination'), request_body.get('cursor'),
+        request_body.get('as_of'), request_body.get('season'),
+    ]
+    return md5(dumps(params, sort_keys=True).encode()).hexdigest()
+
+
+def response_cache_key(operation, request_body):
+    return f"league:response:{get_data_version()}:{response_cache_digest(operation, request_body)}"
+
+
+def cached_response(operation, request_body, compute):
+    key = response_cache_key(operation, request_body)
+    response = cache.get(key)
+    if response is not None:
+        increment(HITS_KEY)
+        return dict(response)
+    increment(MISSES_KEY)
+    response = compute()
+    cache.set(key, response, settings.RESPONSE_CACHE_TIMEOUT)
+    return dict(response)
+
+
+async def acached_response(operation, request_body, compute):
+    key = f"league:response:{await aget_data_version()}:{response_cache_digest(operation, request_body)}"
+    response = await cache.aget(key)
+    if response is not None:
+        await aincrement(HITS_KEY)
+        return dict(response)
+    await aincrement(MISSES_KEY)
+    response = await compute()
+    await cache.aset(key, response, settings.RESPONSE_CACHE_TIMEOUT)
+    return dict(response)
+
+
+def get_cache_stats():
+    hits, misses = cache.get(HITS_KEY, 0), cache.get(MISSES_KEY, 0)
+    return {
+        'hits': hits,
+        'misses': misses,
+        'hit_ratio': hits / (hits + misses) if hits + misses else 0,
+    }
@@ -1,25 +1,475 @@
+# Django Imports
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Count
+from django.utils import timezone
+
 # App Imports
-from core.models import Team, Game
+from core.models import Team, Game, ImportedFile
+from utils.cache_utils import bump_data_version
+from utils.feed_utils import record_changes
+from utils.metrics_utils import inc, observe
+from utils.ranking_utils import parse_played_at
+from utils.search_utils import index_team_names
+from utils.standings_utils import add_game_result, apply_standings_deltas, invalidate_standing_checkpoints, \
+    join_season
 
-# 3rd Party 
+# 3rd Party
+from array import array
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from datetime import timezone as dt_timezone
+from functools import partial
+from hashlib import md5, sha256
+from itertools import islice, repeat
 import csv
 import io
+import logging
+import mmap
+import os
+import sys
+import time
+
+logger = logging.getLogger(__name__)
+
+GAME_INSERT_FIELDS = (
+    'season', 'host_team', 'host_team_score', 'guest_team', 'guest_team_score', 'played_at', 'fingerprint',
+    'imported_file'
+)
+
+
+def parse_row_played_at(value, line_number):
+    try:
+        return parse_played_at(value.strip())
+    except ValueError:
+        raise ValueError(f"Line {line_number}: invalid played_at {value.strip()!r}.")
+
+
+# Rows are host, host score, guest, guest score and an optional played_at.
+def parse_csv_row(row, line_number):
+    if len(row) < 4:
+        raise ValueError(f"Line {line_number}: expected 4 columns, got {len(row)}.")
+    host_team_name, host_team_score, guest_team_name, guest_team_score = row[:4]
+    try:
+        host_team_score, guest_team_score = int(host_team_score), int(guest_team_score)
+    except ValueError:
+        raise ValueError(f"Line {line_number}: scores must be integers.")
+    if host_team_score < 0 or guest_team_score < 0:
+        raise ValueError(f"Line {line_number}: scores must not be negative.")
+    played_at = parse_row_played_at(row[4], line_number) if len(row) > 4 else None
+    return host_team_name, host_team_score, guest_team_name, guest_team_score, played_at
+
+
+def iter_batches(rows, batch_size):
+    rows = iter(rows)
+    while batch := list(islice(rows, batch_size)):
+        yield batch
+
+
+def resolve_team_ids(names, team_ids):
+    missing = set(names) - team_ids.keys()
+    if not missing:
+        return team_ids
+    team_ids.update(Team.objects.filter(name__in=missing).values_list('name', 'id'))
+    missing -= team_ids.keys()
+    # Another import may create some of the same teams in the meantime; their
+    # rows are kept and every id is read back by name.
+    if missing:
+        Team.objects.bulk_create([Team(name=name) for name in missing], ignore_conflicts=True)
+        created = list(Team.objects.filter(name__in=missing))
+        team_ids.update((team.name, team.id) for team in created)
+        index_team_names(created, replace=False)
+    return team_ids
+
+
+def file_digest(csv_file, size=None):
+    digest, remaining = sha256(), size
+    while remaining is None or remaining > 0:
+        chunk = csv_file.read(1024 * 1024 if remaining is None else min(1024 * 1024, remaining))
+        if not chunk:
+            break
+        digest.update(chunk)
+        remaining = None if remaining is None else remaining - len(chunk)
+    csv_file.seek(0)
+    return digest.hexdigest()
+
+
+def buffer_digest(buffer, size=None):
+    with memoryview(buffer) as view, view[:size] as content:
+        return sha256(content).hexdigest()
+
+
+@contextmanager
+def mapped_file(path):
+    with open(path, 'rb') as csv_file:
+        if not os.fstat(csv_file.fileno()).st_size:
+            yield b''
+            return
+        with mmap.mmap(csv_file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            yield mapped
+
+
+# Every imported game updates a dozen indexes, the fingerprint's in random order,
+# so with SQLite's default 2MB page cache most inserts read index pages back from
+# disk. Imports run with a larger cache, and the previous size is restored after.
+@contextmanager
+def import_page_cache():
+    cache_kb = settings.CSV_IMPORT_SQLITE_CACHE_KB
+    if connection.vendor != 'sqlite' or not cache_kb:
+        yield
+        return
+    with connection.cursor() as cursor:
+        cursor.execute("PRAGMA cache_size")
+        previous = cursor.fetchone()[0]
+        cursor.execute(f"PRAGMA cache_size = -{int(cache_kb)}")
+    try:
+        yield
+    finally:
+        with connection.cursor() as cursor:
+            cursor.execute(f"PRAGMA cache_size = {int(previous)}")
+
+
+def iter_blocks(buffer, block_size=None):
+    block_size = block_size or settings.CSV_BLOCK_SIZE
+    start, size = 0, len(buffer)
+    while start < size:
+        end = buffer.find(b'\n', min(start + block_size, size) - 1)
+        end = size if end == -1 else end + 1
+        yield buffer[start:end]
+        start = end
+
+
+def new_columns():
+    return [], array('q'), [], array('q'), []
+
+
+# A block where every line has exactly four unquoted columns (host, host score,
+# guest, guest score, so no played_at) is split into fields in one go and its columns taken with
+# stride slices, so the per-row work runs in C. Team names are decoded and
+# interned once per distinct name.
+def parse_regular_block(lines, names, columns):
+    fields = b','.join(lines).split(b',')
+    host_scores, guest_scores = array('q', map(int, fields[1::4])), array('q', map(int, fields[3::4]))
+    if min(host_scores) < 0 or min(guest_scores) < 0:
+        raise ValueError("Scores must not be negative.")
+    hosts, guests = fields[0::4], fields[2::4]
+    for name in set(hosts).union(guests).difference(names):
+        names[name] = sys.intern(name.decode('utf-8'))
+    columns[0].extend(map(names.__getitem__, hosts))
+    columns[1].extend(host_scores)
+    columns[2].extend(map(names.__getitem__, guests))
+    columns[3].extend(guest_scores)
+    columns[4].extend(repeat(None, len(lines)))
+
+
+# Any other block, or one with an invalid value, is parsed line by line and
+# lines with quotes or too few columns go through csv.reader, so the results
+# and errors always match process_csv_file.
+def parse_block(block, line_number, names, columns=None):
+    hosts, host_scores, guests, guest_scores, played_ats = columns = columns or new_columns()
+    errors = []
+    lines = block.split(b'\n')
+    if not lines[-1]:
+        lines.pop()
+    if lines and b'"' not in block and set(map(bytes.count, lines, repeat(b','))) == {3}:
+        try:
+            parse_regular_block(lines, names, columns)
+            return columns, errors, line_number + len(lines)
+        except ValueError:
+            pass
+    for line in lines:
+        line_number += 1
+        fields = line.split(b',', 5)
+        try:
+            if len(fields) < 4 or b'"' in line:
+                host, host_score, guest, guest_score, played_at = parse_csv_row(
+                    next(csv.reader([line.decode('utf-8').rstrip('\r')]), []), line_number
+                )
+                host, guest = sys.intern(host), sys.intern(guest)
+            else:
+                host, guest = names.get(fields[0]), names.get(fields[2])
+                if host is None:
+                    host = names[fields[0]] = sys.intern(fields[0].decode('utf-8'))
+                if guest is None:
+                    guest = names[fields[2]] = sys.intern(fields[2].decode('utf-8'))
+                try:
+                    host_score, guest_score = int(fields[1]), int(fields[3])
+                except ValueError:
+                    raise ValueError(f"Line {line_number}: scores must be integers.")
+                if host_score < 0 or guest_score < 0:
+                    raise ValueError(f"Line {line_number}: scores must not be negative.")
+                played_at = parse_row_played_at(fields[4].decode('utf-8'), line_number) if len(fields) > 4 else None
+        except UnicodeDecodeError:
+            errors.append(f"Line {line_number}: not valid UTF-8.")
+            continue
+        except ValueError as e:
+            errors.append(str(e))
+            continue
+        hosts.append(host)
+        host_scores.append(host_score)
+        guests.append(guest)
+        guest_scores.append(guest_score)
+        played_ats.append(played_at)
+    return columns, errors, line_number
+
 
+# Parses a whole file only to list its errors, as a file that failed to import
+# stops at the first one.
+def csv_path_errors(path):
+    errors = []
+    try:
+        with mapped_file(path) as mapped:
+            line_number, names = 0, {}
+            for block in iter_blocks(mapped):
+                _, block_errors, line_number = parse_block(block, line_number, names)
+                errors.extend(block_errors)
+    except OSError as e:
+        errors.append(str(e))
+    return errors
 
-def process_csv_file(file_path):
-    csv_data = csv.reader(io.TextIOWrapper(file_path, encoding='utf-8'))
-
-    for row in csv_data:
-        host_team_name = row[0]
-        host_team_score = row[1]
-        guest_team_name = row[2]
-        guest_team_score = row[3]
-        host_team, _ = Team.objects.get_or_create(name=host_team_name)
-        guest_team, _ = Team.objects.get_or_create(name=guest_team_name)
-        game = Game(
-            host_team=host_team,
-            host_team_score=host_team_score,
-            guest_team=guest_team,
-            guest_team_score=guest_team_score
+
+# Each block is parsed and written before the next one is read, so only one
+# block's columns are held in memory at a time.
+def write_mapped_file(writer, mapped, progress=None):
+    line_number, names = 0, {}
+    for block in iter_blocks(mapped):
+        columns, errors, line_number = parse_block(block, line_number, names)
+        if errors:
+            raise ValueError(errors[0])
+        writer.write_column_batches(columns)
+        if progress:
+            progress(writer.written)
+
+
+def game_insert_sql():
+    columns = ', '.join(connection.ops.quote_name(Game._meta.get_field(name).column) for name in GAME_INSERT_FIELDS)
+    placeholders = ', '.join(['%s'] * len(GAME_INSERT_FIELDS))
+    return f"INSERT INTO {connection.ops.quote_name(Game._meta.db_table)} ({columns}) VALUES ({placeholders})"
+
+
+# Building a Game instance and compiling its INSERT costs far more than parsing
+# the row, so parsed columns are mapped to team ids and inserted with one
+# executemany per batch.
+#
+# Imports are idempotent. A file whose content was already imported into the
+# same season is skipped with one query, as long as every game it added still
+# exists; games are linked to their file record, so deleting them makes the file
+# importable again. Otherwise every row gets a fingerprint, and rows whose
+# fingerprint is already stored are skipped, so they never count twice in the
+# standings. A row with a played_at is the game of its season, played_at and
+# teams wherever it is imported from. A row without one can only be told apart
+# by its place in a file: it is matched against the earlier versions of its file,
+# by values and how often those values occurred before it, so rows added to or
+# removed from a file leave the fingerprints of the others unchanged. A file
+# continues the series of the file last imported under its name into the same
+# season when it starts with that file's whole content (a results file growing
+# every night); any other file, a new one reusing the name included, starts a
+# series of its own, so its rematches with an earlier result are kept. Counting
+# occurrences keeps one entry per distinct result of the file in memory.
+class GameWriter:
+    """Resolves team names and bulk inserts parsed rows; standings are applied once in `finish`."""
+
+    def __init__(self, season=None, batch_size=None):
+        self.season = int(season) if season else None
+        self.batch_size = batch_size or settings.CSV_IMPORT_BATCH_SIZE
+        self.team_ids = {}
+        self.deltas = defaultdict(Counter)
+        self.played_at = timezone.now()
+        self.earliest_played_at = self.played_at
+        self.written = 0
+        self.skipped = 0
+        self.duplicate_files = 0
+        self.imported_file = None
+        self.check_undated = True
+        self.check_dated = None
+        self.file_prefix = None
+        self.dated_prefix = md5(f"{self.season}\x1fplayed_at".encode())
+        self.occurrences = Counter()
+        self.file_written = 0
+        self.file_skipped = 0
+
+    def file_key(self, digest):
+        return sha256(f"{self.season}:{digest}".encode()).hexdigest()
+
+    # The series of the file last imported under this name, when this file
+    # starts with its content. Files recorded before series were tracked have no
+    # size and keep matching every later file of their name.
+    def find_lineage(self, file_name, prefix_digest):
+        last = ImportedFile.objects.filter(season_id=self.season, file_name=file_name).order_by('-id').first()
+        if last is None or prefix_digest is None:
+            return None
+        if last.size is None:
+            return last.lineage
+        return last.lineage if last.digest == self.file_key(prefix_digest(last.size)) else None
+
+    def begin_file(self, digest, file_name='', size=None, prefix_digest=None):
+        file_name = file_name[-255:]
+        key = self.file_key(digest)
+        imported_file = ImportedFile.objects.filter(digest=key).annotate(game_count=Count('games')).first()
+        if imported_file and imported_file.game_count >= imported_file.rows:
+            self.duplicate_files += 1
+            return False
+        # Some games of this content are gone: import it again within the series
+        # its remaining games were fingerprinted in, so those are skipped.
+        if imported_file:
+            file_name, lineage = imported_file.file_name, imported_file.lineage
+        else:
+            lineage = self.find_lineage(file_name, prefix_digest)
+        # Fingerprinted games without a file record predate file links or lost
+        # their record, so they could match rows of any file.
+        self.check_undated = imported_file is not None or lineage is not None or Game.objects.filter(
+            imported_file=None, fingerprint__isnull=False
+        ).exists()
+        self.imported_file = imported_file or ImportedFile.objects.create(
+            digest=key, file_name=file_name, season_id=self.season, size=size,
+            lineage=key if lineage is None else lineage
         )
-        game.save()
+        self.file_prefix = md5(f"{self.season}\x1f{self.imported_file.lineage or file_name}".encode())
+        self.occurrences = Counter()
+        self.file_written, self.file_skipped = self.written, self.skipped
+        return True
+
+    # The file's transaction was rolled back, teams it created included.
+    def abort_file(self):
+        self.written, self.skipped = self.file_written, self.file_skipped
+        self.deltas = defaultdict(Counter)
+        self.team_ids = {}
+
+    # Rows skipped as already imported were relinked to this file, so they count too.
+    def end_file(self):
+        rows = self.written - self.file_written + self.skipped - self.file_skipped
+        ImportedFile.objects.filter(pk=self.imported_file.pk).update(rows=rows)
+        self.file_written, self.file_skipped = self.written, self.skipped
+
+    def fingerprints(self, columns):
+        occurrences, prefix, dated_prefix, fingerprints = self.occurrences, self.file_prefix, self.dated_prefix, []
+        for host, host_score, guest, guest_score, played_at in zip(*columns):
+            if played_at is None:
+                row = (host, host_score, guest, guest_score)
+                occurrences[row] += 1
+                key = prefix.copy()
+                key.update(f"{host}\x1f{host_score}\x1f{guest}\x1f{guest_score}\x1f{occurrences[row]}".encode())
+            else:
+                played_at = played_at.astimezone(dt_timezone.utc).isoformat()
+                row = (played_at, host, guest)
+                occurrences[row] += 1
+                key = dated_prefix.copy()
+                key.update(f"{played_at}\x1f{host}\x1f{guest}\x1f{occurrences[row]}".encode())
+            fingerprints.append(key.hexdigest())
+        return fingerprints
+
+    def write(self, rows):
+        if rows:
+            self.write_columns(*zip(*rows))
+
+    def write_columns(self, hosts, host_scores, guests, guest_scores, played_ats):
+        columns = (hosts, host_scores, guests, guest_scores, played_ats)
+        fingerprints = self.fingerprints(columns)
+        if self.check_dated is None and any(played_at is not None for played_at in played_ats):
+            self.check_dated = Game.objects.filter(fingerprint__isnull=False).exists()
+        checked = [
+            fingerprint for fingerprint, played_at in zip(fingerprints, played_ats)
+            if (self.check_undated if played_at is None else self.check_dated)
+        ]
+        existing = set()
+        if checked:
+            existing = set(Game.objects.filter(fingerprint__in=checked).values_list('fingerprint', flat=True))
+        if existing:
+            Game.objects.filter(fingerprint__in=existing).exclude(imported_file=self.imported_file) \
+                .update(imported_file=self.imported_file)
+            kept = [index for index, fingerprint in enumerate(fingerprints) if fingerprint not in existing]
+            self.skipped += len(fingerprints) - len(kept)
+            hosts, host_scores, guests, guest_scores, played_ats, fingerprints = (
+                [column[index] for index in kept] for column in (*columns, fingerprints)
+            )
+        team_ids = resolve_team_ids(set(hosts).union(guests), self.team_ids)
+        host_ids, guest_ids = list(map(team_ids.__getitem__, hosts)), list(map(team_ids.__getitem__, guests))
+        for result in zip(host_ids, host_scores, guest_ids, guest_scores):
+            add_game_result(self.deltas, *result)
+        # Rows without a played_at are played at the start of the import.
+        adapt = connection.ops.adapt_datetimefield_value
+        default_played_at = adapt(self.played_at)
+        given = [played_at for played_at in played_ats if played_at is not None]
+        if given:
+            self.earliest_played_at = min(self.earliest_played_at, *given)
+        played_ats = [default_played_at if played_at is None else adapt(played_at) for played_at in played_ats]
+        games = zip(repeat(self.season), host_ids, host_scores, guest_ids, guest_scores, played_ats,
+                    fingerprints, repeat(self.imported_file.pk))
+        with connection.cursor() as cursor:
+            for batch in iter_batches(games, self.batch_size):
+                cursor.executemany(game_insert_sql(), batch)
+        self.written += len(host_ids)
+
+    def write_column_batches(self, columns):
+        for start in range(0, len(columns[0]), self.batch_size):
+            self.write_columns(*(column[start:start + self.batch_size] for column in columns))
+
+    # Rows are inserted without Game signals, so everything those would do for
+    # each game is done here once for the rows written since the last call.
+    def finish(self):
+        if not self.deltas:
+            return
+        apply_standings_deltas(self.deltas)
+        if self.season:
+            join_season(self.season, self.team_ids.values())
+            apply_standings_deltas(self.deltas, season_id=self.season)
+        self.deltas = defaultdict(Counter)
+        invalidate_standing_checkpoints(self.earliest_played_at)
+        self.earliest_played_at = self.played_at
+        bump_data_version()
+        record_changes(reset=True)
+
+
+def import_report(writer, started):
+    elapsed = time.perf_counter() - started
+    rows = writer.written
+    report = {
+        'rows': rows,
+        'skipped': writer.skipped,
+        'duplicate_files': writer.duplicate_files,
+        'seconds': elapsed,
+        'rows_per_second': rows / elapsed if elapsed else 0,
+    }
+    inc('league_games_imported_total', rows)
+    observe('league_import_duration_seconds', elapsed)
+    logger.info("Imported %(rows)d games in %(seconds).2fs (%(rows_per_second).0f rows/sec)", report)
+    return report
+
+
+def process_csv_file(file_path, batch_size=None, progress=None, season=None):
+    started = time.perf_counter()
+    writer = GameWriter(season=season, batch_size=batch_size)
+    digest, size = file_digest(file_path), file_path.seek(0, os.SEEK_END)
+    file_path.seek(0)
+    csv_data = enumerate(csv.reader(io.TextIOWrapper(file_path, encoding='utf-8')), start=1)
+
+    with transaction.atomic():
+        file_name = os.path.basename(getattr(file_path, 'name', None) or '')
+        if writer.begin_file(digest, file_name, size, partial(file_digest, file_path)):
+            with import_page_cache():
+                for batch in iter_batches(csv_data, writer.batch_size):
+                    writer.write([parse_csv_row(row, line_number) for line_number, row in batch])
+                    if progress:
+                        progress(writer.written)
+            writer.end_file()
+            writer.finish()
+
+    return import_report(writer, started)
+
+
+# For files already on disk: the file is memory mapped, hashed in place and
+# parsed block by block, so memory stays flat however large it is.
+def process_csv_path(path, batch_size=None, progress=None, season=None, file_name=None):
+    started = time.perf_counter()
+    writer = GameWriter(season=season, batch_size=batch_size)
+
+    with mapped_file(path) as mapped, transaction.atomic():
+        file_name = file_name or os.path.basename(path)
+        if writer.begin_file(buffer_digest(mapped), file_name, len(mapped), partial(buffer_digest, mapped)):
+            with import_page_cache():
+                write_mapped_file(writer, mapped, progress)
+            writer.end_file()
+            writer.finish()
+
+    return import_report(writer, started)
+
@@ -0,0 +1,100 @@
+# Django Imports
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import F, Value, Window
+from django.db.models.functions import Coalesce, RowNumber
+
+# App Imports
+from core.models import SeasonStanding
+from utils.ranking_utils import season_games, season_teams
+from utils.standings_utils import STANDING_FIELDS
+
+# 3rd Party Imports
+from asgiref.sync import sync_to_async
+from itertools import islice
+from json import dumps
+import csv
+import io
+
+EXPORT_FORMATS = {
+    'csv': 'text/csv',
+    'ndjson': 'application/x-ndjson',
+}
+GAME_EXPORT_COLUMNS = {
+    'id': 'id',
+    'host_team': 'host_team__name',
+    'host_team_score': 'host_team_score',
+    'guest_team': 'guest_team__name',
+    'guest_team_score': 'guest_team_score',
+    'played_at': 'played_at',
+    'season': 'season_id',
+}
+STANDING_EXPORT_COLUMNS = {
+    'rank': 'rank',
+    'team': 'team_name',
+    **{field: field for field in STANDING_FIELDS},
+    'goal_difference': 'goal_difference',
+}
+
+
+def export_games_queryset(season=None):
+    return season_games(season).order_by('id').values_list(*GAME_EXPORT_COLUMNS.values())
+
+
+def export_standings_queryset(season=None):
+    if season is None:
+        standings = season_teams().annotate(
+            team_name=F('name'),
+            **{field: Coalesce(f'standing__{field}', Value(0)) for field in STANDING_FIELDS}
+        )
+    else:
+        standings = SeasonStanding.objects.filter(season_id=season).annotate(team_name=F('team__name'))
+    standings = standings.annotate(
+        goal_difference=F('goals_for') - F('goals_against'),
+        rank=Window(RowNumber(), order_by=[F('points').desc(), F('team_name').asc()]),
+    )
+    return standings.order_by('-points', 'team_name').values_list(*STANDING_EXPORT_COLUMNS.values())
+
+
+EXPORTS = {
+    'games': (tuple(GAME_EXPORT_COLUMNS), export_games_queryset),
+    'standings': (tuple(STANDING_EXPORT_COLUMNS), export_standings_queryset),
+}
+
+
+def format_header(columns, format):
+    return format_rows(columns, [columns], format) if format == 'csv' else ''
+
+
+def format_rows(columns, rows, format):
+    if format == 'ndjson':
+        return ''.join(dumps(dict(zip(columns, row)), cls=DjangoJSONEncoder) + '\n' for row in rows)
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(rows)
+    return buffer.getvalue()
+
+
+def next_chunk(rows, chunk_size):
+    return list(islice(rows, chunk_size))
+
+
+# Rows are read with a chunked server-side iterator and written one chunk at a
+# time, so memory stays flat however many rows are exported.
+def export_chunks(export, format, season=None, chunk_size=None):
+    chunk_size = chunk_size or settings.EXPORT_CHUNK_SIZE
+    columns, queryset = EXPORTS[export]
+    yield format_header(columns, format)
+    rows = queryset(season).iterator(chunk_size=chunk_size)
+    while chunk := next_chunk(rows, chunk_size):
+        yield format_rows(columns, chunk, format)
+
+
+# Django 4.2's values_list().aiterator() runs its query in the event loop, so
+# the sync iterator is advanced one chunk at a time in a worker thread instead.
+async def aexport_chunks(export, format, season=None, chunk_size=None):
+    chunk_size = chunk_size or settings.EXPORT_CHUNK_SIZE
+    columns, queryset = EXPORTS[export]
+    yield format_header(columns, format)
+    rows = queryset(season).iterator(chunk_size=chunk_size)
+    while chunk := await sync_to_async(next_chunk)(rows, chunk_size):
+        yield format_rows(columns, chunk, format)
@@ -0,0 +1,147 @@
+# Django Imports
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+# App Imports
+from core.models import Game
+from utils.cache_utils import forget_data_version
+from utils.ranking_utils import GAME_LIST_COLUMNS, GAME_LIST_KEYS, get_ranking_snapshot
+
+# 3rd Party Imports
+from json import dumps
+from threading import Lock, local
+import asyncio
+import time
+
+CHANGES_SEQ_KEY = 'league:changes:seq'
+
+_pending = local()
+
+# The league ranking as last published by this process, team id -> (rank, points).
+_published_ranking = {}
+_published_ranking_lock = Lock()
+
+
+def change_key(change_id):
+    return f'league:changes:{change_id}'
+
+
+# Game ids touched by the current transaction are collected here and published
+# as one change once it commits. Ids left over from a rolled back transaction
+# ride along with the next change, which re-reads them, so they cost nothing.
+def record_changes(game_ids=(), reset=False):
+    if not settings.CHANGE_FEED_ENABLED:
+        return
+    pending = getattr(_pending, 'changes', None)
+    if pending is None:
+        pending = _pending.changes = {'games': set(), 'reset': False}
+    pending['games'].update(game_ids)
+    pending['reset'] = pending['reset'] or reset
+    transaction.on_commit(publish_changes)
+
+
+# Each change carries the ranking rows that differ from the ranking this
+# process published last, a superset of what the change itself moved when other
+# processes published in between. With nothing to compare against, or more than
+# CHANGE_FEED_RANKING_ROWS rows moved, 'rankings' is None and clients reload.
+def ranking_changes():
+    forget_data_version()
+    snapshot = get_ranking_snapshot()
+    current = dict(zip(snapshot.ids, zip(snapshot.ranks, snapshot.points)))
+    previous = _published_ranking.get('rows')
+    _published_ranking['rows'] = current
+    if previous is None:
+        return None
+    changed = [index for index, team_id in enumerate(snapshot.ids) if previous.get(team_id) != current[team_id]]
+    if len(changed) > settings.CHANGE_FEED_RANKING_ROWS:
+        return None
+    return [snapshot.row(index) for index in changed]
+
+
+def publish_changes():
+    pending = getattr(_pending, 'changes', None)
+    if pending is None:
+        return None
+    _pending.changes = None
+
+    if pending['reset']:
+        change = {'reset': True}
+    else:
+        rows = Game.objects.filter(id__in=pending['games']).values_list(*GAME_LIST_COLUMNS)
+        games = [dict(zip(GAME_LIST_KEYS, row)) for row in rows]
+        change = {'games': games, 'deleted': sorted(pending['games'] - {game['id'] for game in games})}
+
+    # Ranking rows and change ids are taken in the same order, so a client never
+    # applies an older ranking after a newer one from this process.
+    with _published_ranking_lock:
+        if not pending['reset']:
+            change['rankings'] = ranking_changes()
+        cache.add(CHANGES_SEQ_KEY, 0, timeout=None)
+        change['id'] = cache.incr(CHANGES_SEQ_KEY)
+    cache.set(change_key(change['id']), change, settings.CHANGE_FEED_TIMEOUT)
+    return change
+
+
+def format_event(change):
+    return f"id: {change['id']}\ndata: {dumps(change)}\n\n"
+
+
+class ChangeCursor:
+    """Position of one event stream client in the change feed."""
+
+    def __init__(self, last_id=None):
+        self.last_id = last_id
+        self.stalled = False
+
+    def keys(self, latest):
+        if self.last_id is None or not 0 < latest - self.last_id <= settings.CHANGE_FEED_BACKLOG:
+            return []
+        return [change_key(change_id) for change_id in range(self.last_id + 1, latest + 1)]
+
+    def reset(self, latest):
+        self.last_id, self.stalled = latest, False
+        return format_event({'id': latest, 'reset': True})
+
+    # A change id is taken before its body is stored, so a missing body is only
+    # treated as lost (and the client told to reload) when it is still missing
+    # one poll later.
+    def advance(self, latest, stored):
+        if self.last_id is None:
+            self.last_id = latest
+            return ''
+        if latest < self.last_id or latest - self.last_id > settings.CHANGE_FEED_BACKLOG:
+            return self.reset(latest)
+        events = []
+        for change_id in range(self.last_id + 1, latest + 1):
+            change = stored.get(change_key(change_id))
+            if change is None:
+                if self.stalled:
+                    return ''.join(events) + self.reset(latest)
+                self.stalled = True
+                break
+            events.append(format_event(change))
+            self.last_id, self.stalled = change_id, False
+        return ''.join(events)
+
+
+def change_stream(cursor):
+    deadline = time.monotonic() + settings.CHANGE_FEED_STREAM_TIMEOUT
+    yield f"retry: {settings.CHANGE_FEED_RETRY_MS}\n\n"
+    while True:
+        latest = cache.get(CHANGES_SEQ_KEY, 0)
+        yield cursor.advance(latest, cache.get_many(cursor.keys(latest))) or ": keepalive\n\n"
+        if time.monotonic() >= deadline:
+            return
+        time.sleep(settings.CHANGE_FEED_POLL_INTERVAL)
+
+
+async def achange_stream(cursor):
+    deadline = time.monotonic() + settings.CHANGE_FEED_STREAM_TIMEOUT
+    yield f"retry: {settings.CHANGE_FEED_RETRY_MS}\n\n"
+    while True:
+        latest = await cache.aget(CHANGES_SEQ_KEY, 0)
+        yield cursor.advance(latest, await cache.aget_many(cursor.keys(latest))) or ": keepalive\n\n"
+        if time.monotonic() >= deadline:
+            return
+        await asyncio.sleep(settings.CHANGE_FEED_POLL_INTERVAL)
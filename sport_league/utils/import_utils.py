@@ -0,0 +1,201 @@
+# Django Imports
+from django.conf import settings
+from django.db import OperationalError, transaction
+from django.utils import timezone
+
+# App Imports
+from core.models import ImportJob
+from utils.csv_utils import GameWriter, buffer_digest, csv_path_errors, import_page_cache, import_report, \
+    mapped_file, process_csv_path, write_mapped_file
+
+# 3rd Party Imports
+from datetime import timedelta
+from functools import partial
+from glob import glob
+from json import dump, load
+import os
+import random
+import tempfile
+import time
+
+
+def enqueue_import(csv_file, user=None, season=None):
+    os.makedirs(settings.CSV_IMPORT_SPOOL_DIR, exist_ok=True)
+    with tempfile.NamedTemporaryFile(dir=settings.CSV_IMPORT_SPOOL_DIR, suffix='.csv', delete=False) as spooled:
+        for chunk in csv_file.chunks():
+            spooled.write(chunk)
+    return ImportJob.objects.create(file_name=csv_file.name, path=spooled.name, created_by=user, season_id=season)
+
+
+# The import itself runs in a single transaction, so progress written to the
+# ImportJob row would stay invisible until the end. It is kept in a small file
+# next to the spooled upload instead, which every process can read.
+def progress_path(job):
+    return f"{job.path}.progress"
+
+
+def write_progress(job, rows_processed, rows_per_second):
+    temp_path = f"{progress_path(job)}.tmp"
+    with open(temp_path, 'w') as progress_file:
+        dump({'rows_processed': rows_processed, 'rows_per_second': rows_per_second}, progress_file)
+    os.replace(temp_path, progress_path(job))
+
+
+def read_progress(job):
+    progress = {
+        'id': job.id,
+        'file_name': job.file_name,
+        'status': job.status,
+        'rows_processed': job.rows_processed,
+        'rows_per_second': job.rows_per_second,
+        'errors': [job.error] if job.error else [],
+    }
+    if job.status == ImportJob.RUNNING:
+        try:
+            with open(progress_path(job)) as progress_file:
+                progress.update(load(progress_file))
+        except (OSError, ValueError):
+            pass
+    return progress
+
+
+# SQLite allows a single writer, so concurrent workers can hit "database is
+# locked". Imports run in one transaction and roll back fully, so retrying is safe.
+LOCK_RETRIES = 8
+
+
+def retry_on_lock(func, *args, **kwargs):
+    for attempt in range(LOCK_RETRIES):
+        try:
+            return func(*args, **kwargs)
+        except OperationalError:
+            if attempt == LOCK_RETRIES - 1:
+                raise
+            time.sleep(min(2 ** attempt, 10) * random.uniform(0.5, 1.5))
+
+
+# A running job touches its progress file after every batch. A job whose worker
+# died stops doing so, and is claimed again once neither its start nor its last
+# progress is newer than IMPORT_JOB_STALE_TIMEOUT; its import had rolled back.
+def last_seen(job):
+    try:
+        return max(job.started_at.timestamp(), os.path.getmtime(progress_path(job)))
+    except OSError:
+        return job.started_at.timestamp()
+
+
+def claim_stale_job():
+    cutoff = time.time() - settings.IMPORT_JOB_STALE_TIMEOUT
+    running = ImportJob.objects.filter(
+        status=ImportJob.RUNNING, started_at__lt=timezone.now() - timedelta(seconds=settings.IMPORT_JOB_STALE_TIMEOUT)
+    )
+    for job in running.order_by('id')[:10]:
+        if last_seen(job) >= cutoff:
+            continue
+        claimed = ImportJob.objects.filter(id=job.id, status=ImportJob.RUNNING, started_at=job.started_at).update(
+            started_at=timezone.now()
+        )
+        if claimed:
+            return ImportJob.objects.get(id=job.id)
+    return None
+
+
+def claim_next_job():
+    pending_ids = ImportJob.objects.filter(status=ImportJob.PENDING).order_by('id').values_list('id', flat=True)
+    for job_id in pending_ids[:10]:
+        claimed = ImportJob.objects.filter(id=job_id, status=ImportJob.PENDING).update(
+            status=ImportJob.RUNNING, started_at=timezone.now()
+        )
+        if claimed:
+            return ImportJob.objects.get(id=job_id)
+    return claim_stale_job()
+
+
+def import_file(path, progress=None, season=None, file_name=None):
+    return process_csv_path(path, progress=progress, season=season, file_name=file_name)
+
+
+def run_job(job):
+    started = time.perf_counter()
+
+    def progress(rows_processed):
+        elapsed = time.perf_counter() - started
+        write_progress(job, rows_processed, rows_processed / elapsed if elapsed else 0)
+
+    try:
+        report = retry_on_lock(import_file, job.path, progress=progress, season=job.season_id, file_name=job.file_name)
+    except Exception as e:
+        job.status = ImportJob.FAILED
+        job.error = str(e)
+    else:
+        job.status = ImportJob.SUCCEEDED
+        job.rows_processed = report['rows']
+        job.rows_per_second = report['rows_per_second']
+        os.remove(job.path)
+    job.finished_at = timezone.now()
+    retry_on_lock(job.save)
+    if os.path.exists(progress_path(job)):
+        os.remove(progress_path(job))
+    return job
+
+
+def run_next_job():
+    job = retry_on_lock(claim_next_job)
+    if job:
+        run_job(job)
+    return job
+
+
+def run_worker(poll_interval=2, once=False):
+    while True:
+        job = run_next_job()
+        if job:
+            continue
+        if once:
+            return
+        time.sleep(poll_interval)
+
+
+def expand_paths(patterns):
+    paths = []
+    for pattern in patterns:
+        paths.extend(sorted(glob(pattern, recursive=True)) or [pattern])
+    return list(dict.fromkeys(paths))
+
+
+def import_file_rows(writer, path):
+    with mapped_file(path) as mapped, transaction.atomic():
+        file_name = os.path.basename(path)
+        if not writer.begin_file(buffer_digest(mapped), file_name, len(mapped), partial(buffer_digest, mapped)):
+            return True
+        write_mapped_file(writer, mapped)
+        writer.end_file()
+        writer.finish()
+    return False
+
+
+# Parsing is a small fraction of an import next to writing the games, so files
+# are imported one after another by this process alone: each is hashed, then
+# streamed block by block, resolving team names and writing games, so memory
+# stays flat for any number or size of files. Each file is committed on its own,
+# so the database is never locked for the whole backfill. A file with any
+# invalid row is rolled back as a whole and reported with all its errors.
+def import_files(paths, season=None, batch_size=None):
+    started = time.perf_counter()
+    writer = GameWriter(season=season, batch_size=batch_size)
+    files = []
+    with import_page_cache():
+        for path in paths:
+            written, skipped, duplicate, errors = writer.written, writer.skipped, False, []
+            try:
+                duplicate = import_file_rows(writer, path)
+            except (OSError, ValueError) as e:
+                writer.abort_file()
+                errors = csv_path_errors(path) or [str(e)]
+            files.append({
+                'path': path, 'rows': writer.written - written, 'skipped': writer.skipped - skipped,
+                'duplicate': duplicate, 'errors': errors,
+            })
+    report = import_report(writer, started)
+    report['files'] = files
+    return report
@@ -0,0 +1,215 @@
+# App Imports
+from utils.ranking_utils import season_games, season_teams
+from utils.standings_utils import league_points
+
+# 3rd Party Imports
+from array import array
+
+GAME_COLUMNS = ('id', 'host_team_id', 'host_team_score', 'guest_team_id', 'guest_team_score')
+
+
+class TeamRecord:
+    """One team of a LeagueEngine, with the same results API as Team."""
+
+    __slots__ = ('engine', 'index')
+
+    def __init__(self, engine, index):
+        self.engine = engine
+        self.index = index
+
+    @property
+    def id(self):
+        return self.engine.team_ids[self.index]
+
+    pk = id
+
+    @property
+    def name(self):
+        return self.engine.names[self.index]
+
+    @property
+    def games(self):
+        return [GameRecord(self.engine, index) for index in self.engine.team_games(self.index)]
+
+    @property
+    def wins(self):
+        return self.engine.wins[self.index]
+
+    @property
+    def loses(self):
+        return self.engine.losses[self.index]
+
+    @property
+    def draws(self):
+        return self.engine.draws[self.index]
+
+    @property
+    def points(self):
+        win, draw, loss = league_points()
+        return self.wins * win + self.draws * draw + self.loses * loss
+
+    @property
+    def goals_for(self):
+        return self.engine.goals_for[self.index]
+
+    @property
+    def goals_against(self):
+        return self.engine.goals_against[self.index]
+
+    def __str__(self):
+        return self.name if self.name else str(self.id)
+
+
+class GameRecord:
+    """One game of a LeagueEngine, with the same results API as Game."""
+
+    __slots__ = ('engine', 'index')
+
+    def __init__(self, engine, index):
+        self.engine = engine
+        self.index = index
+
+    @property
+    def id(self):
+        return self.engine.game_ids[self.index] or None
+
+    @property
+    def host_team(self):
+        return self.engine.team_at(self.engine.hosts[self.index])
+
+    @property
+    def guest_team(self):
+        return self.engine.team_at(self.engine.guests[self.index])
+
+    @property
+    def host_team_score(self):
+        return self.engine.host_scores[self.index]
+
+    @property
+    def guest_team_score(self):
+        return self.engine.guest_scores[self.index]
+
+    def is_draw(self):
+        return self.host_team_score == self.guest_team_score
+
+    @property
+    def winner(self):
+        if self.is_draw():
+            return None
+        return self.host_team if self.host_team_score > self.guest_team_score else self.guest_team
+
+    @property
+    def loser(self):
+        if self.is_draw():
+            return None
+        return self.host_team if self.host_team_score < self.guest_team_score else self.guest_team
+
+    def __str__(self):
+        return f"{self.host_team} ({self.host_team_score}) - {self.guest_team} ({self.guest_team_score})"
+
+
+# Teams and games are kept as columns of machine integers, and each team's
+# results are totalled as games are added, so ranking, searching and simulating
+# a league need no model instances and no queries once it is loaded. Team and
+# game records are thin views over those columns.
+class LeagueEngine:
+    def __init__(self, teams=(), games=()):
+        self.team_ids = array('q')
+        self.names = []
+        self.positions = {}
+        self.wins, self.draws, self.losses = array('q'), array('q'), array('q')
+        self.goals_for, self.goals_against = array('q'), array('q')
+        self.teams = []
+        # Host and guest columns hold team positions, -1 for teams outside the engine.
+        self.game_ids, self.hosts, self.guests = array('q'), array('q'), array('q')
+        self.host_scores, self.guest_scores = array('q'), array('q')
+        self._team_games = None
+        for team_id, name in teams:
+            self.add_team(team_id, name)
+        for game_id, host_team_id, host_team_score, guest_team_id, guest_team_score in games:
+            self.add_game(host_team_id, host_team_score, guest_team_id, guest_team_score, game_id)
+
+    @classmethod
+    def load(cls, season=None, chunk_size=10000):
+        teams = season_teams(season).order_by('id').values_list('id', 'name')
+        games = season_games(season).order_by('id').values_list(*GAME_COLUMNS)
+        return cls(teams, games.iterator(chunk_size=chunk_size))
+
+    def __len__(self):
+        return len(self.game_ids)
+
+    def add_team(self, team_id, name):
+        if team_id in self.positions:
+            raise ValueError(f"Team {team_id} is already in the league.")
+        index = self.positions[team_id] = len(self.team_ids)
+        self.team_ids.append(team_id)
+        self.names.append(name)
+        for column in (self.wins, self.draws, self.losses, self.goals_for, self.goals_against):
+            column.append(0)
+        self.teams.append(TeamRecord(self, index))
+        if self._team_games is not None:
+            self._team_games.append(array('q'))
+        return self.teams[index]
+
+    # Games without an id are simulated ones, never saved.
+    def add_game(self, host_team_id, host_team_score, guest_team_id, guest_team_score, game_id=None):
+        if host_team_score < 0 or guest_team_score < 0:
+            raise ValueError("Scores must not be negative.")
+        host, guest = self.positions.get(host_team_id, -1), self.positions.get(guest_team_id, -1)
+        index = len(self.game_ids)
+        self.game_ids.append(game_id or 0)
+        self.hosts.append(host)
+        self.guests.append(guest)
+        self.host_scores.append(host_team_score)
+        self.guest_scores.append(guest_team_score)
+        for team, scored, conceded in ((host, host_team_score, guest_team_score),
+                                       (guest, guest_team_score, host_team_score)):
+            if team < 0:
+                continue
+            self.goals_for[team] += scored
+            self.goals_against[team] += conceded
+            if scored > conceded:
+                self.wins[team] += 1
+            elif scored == conceded:
+                self.draws[team] += 1
+            else:
+                self.losses[team] += 1
+            if self._team_games is not None:
+                self._team_games[team].append(index)
+        return GameRecord(self, index)
+
+    def copy(self):
+        engine = LeagueEngine()
+        for name in ('team_ids', 'wins', 'draws', 'losses', 'goals_for', 'goals_against',
+                     'game_ids', 'hosts', 'guests', 'host_scores', 'guest_scores'):
+            setattr(engine, name, array('q', getattr(self, name)))
+        engine.names = list(self.names)
+        engine.positions = dict(self.positions)
+        engine.teams = [TeamRecord(engine, index) for index in range(len(self.teams))]
+        return engine
+
+    def team(self, team_id):
+        return self.team_at(self.positions.get(team_id, -1))
+
+    def team_at(self, index):
+        return self.teams[index] if index >= 0 else None
+
+    def game(self, index):
+        return GameRecord(self, index)
+
+    # Positions of every game of each team, built on first use only.
+    def team_games(self, index):
+        if self._team_games is None:
+            self._team_games = [array('q') for _ in self.team_ids]
+            for game_index, (host, guest) in enumerate(zip(self.hosts, self.guests)):
+                for team in {host, guest}:
+                    if team >= 0:
+                        self._team_games[team].append(game_index)
+        return self._team_games[index]
+
+    def ranked_teams(self):
+        return sorted(self.teams, key=lambda team: (-team.points, team.name))
+
+    def search(self, searchkey):
+        searchkey = searchkey.lower()
+        return [team for team in self.teams if searchkey in team.name.lower()]
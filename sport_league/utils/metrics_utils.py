@@ -0,0 +1,174 @@
+# Django Imports
+from django.conf import settings
+
+# App Imports
+from utils.cache_utils import get_cache_stats
+
+# 3rd Party Imports
+from bisect import bisect_left
+from json import dump, load
+import glob
+import os
+import threading
+import time
+import uuid
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+METRICS = {
+    'league_operation_duration_seconds': ('histogram', "Latency of the GamesHandler operations."),
+    'league_games_imported_total': ('counter', "Games imported from CSV files."),
+    'league_import_duration_seconds': ('histogram', "Duration of CSV imports."),
+    'league_standings_rebuild_duration_seconds': ('histogram', "Duration of full standings rebuilds."),
+}
+
+_lock = threading.Lock()
+_counters = {}
+_histograms = {}
+_last_flush = 0.0
+_owner = None
+
+
+# Every process keeps its own samples and regularly writes them to its own file
+# in METRICS_DIR. The /metrics endpoint sums the files of all processes, which
+# keeps counters and histograms correct no matter which worker serves the scrape.
+# Files are named after the process id and a token of their own, so a process
+# reusing the id of a dead one never overwrites its file, and the files of
+# processes no longer running are deleted when metrics are collected.
+def metrics_path():
+    global _owner
+    if _owner is None or _owner[0] != os.getpid():
+        _owner = (os.getpid(), uuid.uuid4().hex)
+    return os.path.join(settings.METRICS_DIR, "metrics_{}_{}.json".format(*_owner))
+
+
+def process_running(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+def expire_metrics_file(path):
+    try:
+        pid = int(os.path.basename(path).split('_')[1])
+    except (IndexError, ValueError):
+        return False
+    if process_running(pid):
+        return False
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+    return True
+
+
+def labels_key(labels):
+    return tuple(sorted(labels.items()))
+
+
+def inc(name, value=1, **labels):
+    with _lock:
+        key = (name, labels_key(labels))
+        _counters[key] = _counters.get(key, 0) + value
+    flush_metrics()
+
+
+def observe(name, value, **labels):
+    with _lock:
+        key = (name, labels_key(labels))
+        histogram = _histograms.setdefault(key, [[0] * (len(LATENCY_BUCKETS) + 1), 0.0, 0])
+        histogram[0][bisect_left(LATENCY_BUCKETS, value)] += 1
+        histogram[1] += value
+        histogram[2] += 1
+    flush_metrics()
+
+
+def flush_metrics(force=False):
+    global _last_flush
+    now = time.monotonic()
+    if not force and now - _last_flush < settings.METRICS_FLUSH_INTERVAL:
+        return
+    with _lock:
+        _last_flush = now
+        samples = {
+            'counters': [[name, dict(labels), value] for (name, labels), value in _counters.items()],
+            'histograms': [[name, dict(labels), *histogram] for (name, labels), histogram in _histograms.items()],
+        }
+    os.makedirs(settings.METRICS_DIR, exist_ok=True)
+    path = metrics_path()
+    with open(f"{path}.tmp", 'w') as metrics_file:
+        dump(samples, metrics_file)
+    os.replace(f"{path}.tmp", path)
+
+
+def reset_metrics():
+    global _last_flush
+    with _lock:
+        _counters.clear()
+        _histograms.clear()
+        _last_flush = 0.0
+
+
+def collect_metrics():
+    flush_metrics(force=True)
+    counters, histograms = {}, {}
+    for path in glob.glob(os.path.join(settings.METRICS_DIR, "metrics_*.json")):
+        if expire_metrics_file(path):
+            continue
+        try:
+            with open(path) as metrics_file:
+                samples = load(metrics_file)
+        except (OSError, ValueError):
+            continue
+        for name, labels, value in samples['counters']:
+            key = (name, labels_key(labels))
+            counters[key] = counters.get(key, 0) + value
+        for name, labels, buckets, total, count in samples['histograms']:
+            merged = histograms.setdefault((name, labels_key(labels)), [[0] * len(buckets), 0.0, 0])
+            merged[0] = [left + right for left, right in zip(merged[0], buckets)]
+            merged[1] += total
+            merged[2] += count
+    return counters, histograms
+
+
+def format_labels(labels, **extra):
+    labels = [*labels, *extra.items()]
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{value}"' for key, value in labels) + "}"
+
+
+def render_metrics():
+    counters, histograms = collect_metrics()
+    lines = []
+    for name, (kind, help_text) in METRICS.items():
+        lines += [f"# HELP {name} {help_text}", f"# TYPE {name} {kind}"]
+        if kind == 'counter':
+            lines += [f"{name}{format_labels(labels)} {value}"
+                      for (sample_name, labels), value in sorted(counters.items()) if sample_name == name]
+            continue
+        for (sample_name, labels), (buckets, total, count) in sorted(histograms.items()):
+            if sample_name != name:
+                continue
+            cumulative = 0
+            for bound, bucket in zip((*LATENCY_BUCKETS, '+Inf'), buckets):
+                cumulative += bucket
+                lines.append(f"{name}_bucket{format_labels(labels, le=bound)} {cumulative}")
+            lines += [f"{name}_sum{format_labels(labels)} {total}", f"{name}_count{format_labels(labels)} {count}"]
+    cache_stats = get_cache_stats()
+    lines += [
+        "# HELP league_response_cache_hits_total Responses served from the response cache.",
+        "# TYPE league_response_cache_hits_total counter",
+        f"league_response_cache_hits_total {cache_stats['hits']}",
+        "# HELP league_response_cache_misses_total Responses computed on a cache miss.",
+        "# TYPE league_response_cache_misses_total counter",
+        f"league_response_cache_misses_total {cache_stats['misses']}",
+        "# HELP league_response_cache_hit_ratio Share of responses served from the response cache.",
+        "# TYPE league_response_cache_hit_ratio gauge",
+        f"league_response_cache_hit_ratio {cache_stats['hit_ratio']}",
+    ]
+    return "\n".join(lines) + "\n"
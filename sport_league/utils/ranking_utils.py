@@ -1,14 +1,49 @@
 # Django Imports 
-from django.db.models import Q, Count
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Q, Count, Value, F, Case, When, Sum, OuterRef, Subquery, QuerySet, FilteredRelation
+from django.db.models.functions import Coalesce
 from django.core.paginator import Paginator
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
 
 # Project Imports
 from abc import ABC, abstractmethod
+from asgiref.sync import sync_to_async
+from array import array
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from collections import Counter, OrderedDict, defaultdict
+from hashlib import md5
+from itertools import chain, groupby
+from json import dumps, loads
 import math
-from core.forms import GameForm
+import threading
+
+# Optional Imports
+try:
+    import numpy as np
+except ImportError:
+    np = None
 
 # App Imports
-from core.models import Game, Team
+from core.models import Game, SeasonStanding, Team
+from utils.cache_utils import aget_data_version, get_data_version
+from utils.search_utils import search_team_ids, search_teams
+from utils.standings_utils import league_points, standings_as_of
+
+
+def season_games(season=None):
+    season = parse_season(season)
+    if season is None:
+        return Game.objects.all()
+    return Game.objects.filter(season_id=season)
+
+
+def season_teams(season=None):
+    season = parse_season(season)
+    if season is None:
+        return Team.objects.all()
+    return Team.objects.filter(season_standings__season_id=season)
 
 
 class ScoreStrategy(ABC):
@@ -20,13 +55,237 @@ class ScoreStrategy(ABC):
 class FirstStrategy(ScoreStrategy):
     def rank_teams(self, teams):
         teams_scores = []
+        win, draw, loss = league_points()
         for team in teams:
-            score = team.wins * 3 + team.draws
+            score = team.wins * win + team.draws * draw + team.loses * loss
             teams_scores.append({'name': team.name, 'points': score})
         teams_scores.sort(key=lambda team: (-team['points'], team['name']))
         return teams_scores
 
 
+HEAD_TO_HEAD = 'head_to_head'
+
+# The configured tie breakers as orderings of rows with the standings columns
+# and a name. head_to_head needs the games between the tied teams, which stored
+# standings do not keep, so rankings read from them rank those teams by the
+# tie breakers after it; ConfigurableStrategy applies it from the games.
+STANDING_TIE_BREAKERS = {
+    'goal_difference': (F('goals_for') - F('goals_against')).desc(),
+    'goals_for': F('goals_for').desc(),
+    'goals_against': F('goals_against').asc(),
+    'wins': F('wins').desc(),
+    'name': F('name').asc(),
+}
+STANDING_RANK_FIELDS = ('points', 'wins', 'goals_for', 'goals_against')
+
+
+def standing_tie_breakers():
+    return [key for key in settings.LEAGUE_RANKING['tie_breakers'] if key != HEAD_TO_HEAD]
+
+
+def standings_ordering():
+    return [F('points').desc(), *(STANDING_TIE_BREAKERS[key] for key in standing_tie_breakers()), 'name']
+
+
+class StandingsStrategy(ScoreStrategy):
+    def __init__(self, season=None):
+        self.season = season
+
+    def ranked_queryset(self, teams):
+        if self.season is None:
+            standing = 'standing'
+        else:
+            standing = 'season_standing'
+            teams = teams.annotate(season_standing=FilteredRelation(
+                'season_standings', condition=Q(season_standings__season_id=self.season)
+            ))
+        teams = teams.annotate(**{field: Coalesce(f'{standing}__{field}', Value(0)) for field in STANDING_RANK_FIELDS})
+        return teams.order_by(*standings_ordering()).values('name', 'points')
+
+    def rank_teams(self, teams):
+        return list(self.ranked_queryset(teams))
+
+
+class AggregateStrategy(ScoreStrategy):
+    sides = (
+        ('host_team', 'host_team_score', 'guest_team_score'),
+        ('guest_team', 'guest_team_score', 'host_team_score'),
+    )
+
+    def __init__(self, season=None):
+        self.season = season
+
+    def _count_results(self, lookup):
+        totals = []
+        for team_field, scored, conceded in self.sides:
+            result = Case(When(**{f'{scored}__{lookup}': F(conceded)}, then=1), default=0)
+            side_games = season_games(self.season).filter(**{team_field: OuterRef('pk')}).order_by().values(team_field)
+            side_total = side_games.annotate(total=Sum(result)).values('total')
+            totals.append(Coalesce(Subquery(side_total), Value(0)))
+        return totals[0] + totals[1]
+
+    def ranked_queryset(self, teams):
+        if not isinstance(teams, QuerySet):
+            teams = Team.objects.filter(pk__in=[team.pk for team in teams])
+        teams = teams.annotate(
+            wins=self._count_results('gt'), draws=self._count_results('exact'), losses=self._count_results('lt')
+        )
+        win, draw, loss = league_points()
+        teams = teams.annotate(points=F('wins') * win + F('draws') * draw + F('losses') * loss)
+        return teams.order_by('-points', 'name').values('name', 'points')
+
+    def rank_teams(self, teams):
+        return list(self.ranked_queryset(teams))
+
+
+class NumpyStrategy(ScoreStrategy):
+    def __init__(self, games=None, season=None):
+        if np is None:
+            raise ImportError("NumpyStrategy requires numpy, install it with `pip install numpy`.")
+        self.games = games
+        self.season = season
+
+    def load_games(self):
+        games = season_games(self.season).values_list('host_team_id', 'guest_team_id', 'host_team_score', 'guest_team_score')
+        return np.fromiter(chain.from_iterable(games.iterator(chunk_size=10000)), dtype=np.int64).reshape(-1, 4)
+
+    def compute_table(self, team_ids, games):
+        team_ids = np.asarray(team_ids, dtype=np.int64)
+        games = np.asarray(games, dtype=np.int64).reshape(-1, 4)
+        teams_count = len(team_ids)
+        positions = np.full(max(team_ids.max(initial=0), games[:, :2].max(initial=0)) + 1, -1, dtype=np.int64)
+        positions[team_ids] = np.arange(teams_count)
+        host, guest = positions[games[:, 0]], positions[games[:, 1]]
+        host_scores, guest_scores = games[:, 2], games[:, 3]
+
+        def count(index, mask):
+            return np.bincount(index[mask & (index >= 0)], minlength=teams_count)
+
+        def total(index, values):
+            known = index >= 0
+            return np.bincount(index[known], weights=values[known], minlength=teams_count).astype(np.int64)
+
+        wins = count(host, host_scores > guest_scores) + count(guest, guest_scores > host_scores)
+        draws = count(host, host_scores == guest_scores) + count(guest, guest_scores == host_scores)
+        losses = count(host, host_scores < guest_scores) + count(guest, guest_scores < host_scores)
+        goals_for = total(host, host_scores) + total(guest, guest_scores)
+        goals_against = total(host, guest_scores) + total(guest, host_scores)
+        win, draw, loss = league_points()
+        return {
+            'wins': wins,
+            'draws': draws,
+            'losses': losses,
+            'points': wins * win + draws * draw + losses * loss,
+            'goals_for': goals_for,
+            'goals_against': goals_against,
+            'goal_difference': goals_for - goals_against,
+        }
+
+    def rank_teams(self, teams):
+        if isinstance(teams, QuerySet):
+            teams = list(teams.values_list('id', 'name'))
+        else:
+            teams = [(team.id, team.name) for team in teams]
+        team_ids = [team_id for team_id, _ in teams]
+        names = [name for _, name in teams]
+        games = self.games if self.games is not None else self.load_games()
+        points = self.compute_table(team_ids, games)['points']
+        name_ranks = np.empty(len(names), dtype=np.int64)
+        name_ranks[np.argsort(np.array(names, dtype=str), kind='stable')] = np.arange(len(names))
+        order = np.lexsort((name_ranks, -points))
+        return [{'name': names[index], 'points': int(points[index])} for index in order]
+
+
+class ConfigurableStrategy(ScoreStrategy):
+    HEAD_TO_HEAD = HEAD_TO_HEAD
+    tie_breaker_keys = {
+        'goal_difference': lambda stats: stats['goals_against'] - stats['goals_for'],
+        'goals_for': lambda stats: -stats['goals_for'],
+        'goals_against': lambda stats: stats['goals_against'],
+        'wins': lambda stats: -stats['wins'],
+        'name': lambda stats: stats['name'],
+    }
+
+    def __init__(self, points=None, tie_breakers=None, season=None):
+        self.season = season
+        config = settings.LEAGUE_RANKING
+        self.points = {**config['points'], **(points or {})}
+        self.tie_breakers = list(tie_breakers if tie_breakers is not None else config['tie_breakers'])
+        unknown = set(self.tie_breakers) - set(self.tie_breaker_keys) - {self.HEAD_TO_HEAD}
+        if unknown:
+            raise ValueError(f"Unknown tie breakers: {', '.join(sorted(unknown))}.")
+        if self.HEAD_TO_HEAD in self.tie_breakers:
+            split = self.tie_breakers.index(self.HEAD_TO_HEAD)
+            self.keys_before, self.keys_after = self.tie_breakers[:split], self.tie_breakers[split + 1:]
+        else:
+            self.keys_before, self.keys_after = self.tie_breakers, None
+
+    def result_points(self, scored, conceded):
+        if scored > conceded:
+            return self.points['win']
+        return self.points['draw'] if scored == conceded else self.points['loss']
+
+    def collect_stats(self, teams):
+        stats = {team_id: {'name': name, 'points': 0, 'wins': 0, 'goals_for': 0, 'goals_against': 0}
+                 for team_id, name in teams}
+        results = defaultdict(list)
+        games = season_games(self.season).values_list('host_team_id', 'guest_team_id', 'host_team_score', 'guest_team_score')
+        for host_team_id, guest_team_id, host_team_score, guest_team_score in games.iterator(chunk_size=10000):
+            sides = (
+                (host_team_id, guest_team_id, host_team_score, guest_team_score),
+                (guest_team_id, host_team_id, guest_team_score, host_team_score),
+            )
+            for team_id, opponent_id, scored, conceded in sides:
+                team_stats = stats.get(team_id)
+                if team_stats is None:
+                    continue
+                team_stats['points'] += self.result_points(scored, conceded)
+                team_stats['wins'] += scored > conceded
+                team_stats['goals_for'] += scored
+                team_stats['goals_against'] += conceded
+                if self.keys_after is not None:
+                    results[team_id].append((opponent_id, scored, conceded))
+        return stats, results
+
+    def sort_key(self, stats, keys):
+        return tuple(self.tie_breaker_keys[key](stats) for key in keys)
+
+    def break_head_to_head(self, tied_team_ids, stats, results):
+        tied = set(tied_team_ids)
+        mini_table = {}
+        for team_id in tied_team_ids:
+            points = goal_difference = goals_for = 0
+            for opponent_id, scored, conceded in results[team_id]:
+                if opponent_id in tied:
+                    points += self.result_points(scored, conceded)
+                    goal_difference += scored - conceded
+                    goals_for += scored
+            mini_table[team_id] = (-points, -goal_difference, -goals_for)
+        return sorted(
+            tied_team_ids, key=lambda team_id: (mini_table[team_id], self.sort_key(stats[team_id], self.keys_after))
+        )
+
+    def rank_teams(self, teams):
+        if isinstance(teams, QuerySet):
+            teams = teams.values_list('id', 'name')
+        else:
+            teams = [(team.id, team.name) for team in teams]
+        stats, results = self.collect_stats(teams)
+
+        def primary_key(team_id):
+            return (-stats[team_id]['points'],) + self.sort_key(stats[team_id], self.keys_before)
+
+        ordered = sorted(stats, key=primary_key)
+        if self.keys_after is not None:
+            # Only groups still tied on every earlier key need the head-to-head mini table.
+            untied = []
+            for _, group in groupby(ordered, key=primary_key):
+                group = list(group)
+                untied += group if len(group) == 1 else self.break_head_to_head(group, stats, results)
+            ordered = untied
+        return [{'name': stats[team_id]['name'], 'points': stats[team_id]['points']} for team_id in ordered]
+
+
 class RankingSystem:
     def __init__(self, strategy):
         if not isinstance(strategy, ScoreStrategy):
@@ -38,42 +297,137 @@ class RankingSystem:
 
 
 def search_games_by_searchkey(query, searchkey):
-    return query.filter(Q(host_team__name__icontains=searchkey) | Q(guest_team__name__icontains=searchkey))
+    if not searchkey:
+        return query
+    team_ids = search_team_ids(searchkey)
+    return query.filter(Q(host_team_id__in=team_ids) | Q(guest_team_id__in=team_ids))
+
+
+GAME_ORDER_COLUMNS = {
+    0: 'id',
+    1: 'host_team__name',
+    2: 'host_team_score',
+    3: 'guest_team__name',
+    4: 'guest_team_score',
+}
 
 
 def order_games(query, column_index, dir):
-    column_mappings = {
-        0: 'id',
-        1: 'host_team__name',
-        2: 'host_team_score',
-        3: 'guest_team__name',
-        4: 'guest_team_score',
-    }
     direction_mappings = {'asc': "", 'desc': "-"}
-    return query.order_by(direction_mappings[dir] + column_mappings[column_index])
+    return query.order_by(direction_mappings[dir] + GAME_ORDER_COLUMNS[column_index], direction_mappings[dir] + 'id')
 
 
-def get_filtered_games(searchkey, start, length, order_by):
-    games = Game.objects.all()
+GAME_LIST_COLUMNS = ('id', 'host_team__name', 'host_team_score', 'guest_team__name', 'guest_team_score')
+GAME_LIST_KEYS = ('id', 'host_team_id', 'host_team_score', 'guest_team_id', 'guest_team_score')
+
+
+def get_filtered_games(searchkey, start, length, order_by, season=None):
+    games = season_games(season)
     total = games.aggregate(Count("id"))["id__count"]
     filtered_games_by_search_key = search_games_by_searchkey(query=games, searchkey=searchkey)
     filtered_ordered_games = order_games(query=filtered_games_by_search_key, column_index=order_by['column'],
                                          dir=order_by['dir'])
+    filtered_ordered_games = filtered_ordered_games.values_list(*GAME_LIST_COLUMNS)
     paginator = Paginator(filtered_ordered_games, length)
     paginated_games = paginator.page(math.ceil((start + 1) / length)).object_list
-    resulted_games = []
-    for game in paginated_games:
-        game_form = GameForm(game.__dict__)
-        if game_form.is_valid():
-            game_data = game_form.cleaned_data
-            game_data['host_team_id'] = game_form.get_host_team_name()
-            game_data['guest_team_id'] = game_form.get_guest_team_name()
-            resulted_games.append(game_data)
+    resulted_games = [dict(zip(GAME_LIST_KEYS, game)) for game in paginated_games]
     return {'data': resulted_games, 'recordsFiltered': paginator.count, 'recordsTotal': total}
 
 
+async def aget_filtered_games(searchkey, start, length, order_by, season=None):
+    games = season_games(season)
+    total = await games.acount()
+    filtered_games = search_games_by_searchkey(query=games, searchkey=searchkey)
+    filtered_total = await filtered_games.acount()
+    filtered_games = order_games(query=filtered_games, column_index=order_by['column'], dir=order_by['dir'])
+    offset = (math.ceil((start + 1) / length) - 1) * length
+    page = filtered_games.values_list(*GAME_LIST_COLUMNS)[offset:offset + length]
+    resulted_games = [dict(zip(GAME_LIST_KEYS, game)) async for game in page]
+    return {'data': resulted_games, 'recordsFiltered': filtered_total, 'recordsTotal': total}
+
+
+def encode_cursor(values):
+    return urlsafe_b64encode(dumps(values).encode()).decode()
+
+
+def decode_cursor(cursor):
+    try:
+        values = loads(urlsafe_b64decode(cursor.encode()))
+    except (TypeError, ValueError):
+        values = None
+    if not isinstance(values, list) or len(values) != 4:
+        raise ValueError("Invalid cursor.")
+    return values
+
+
+def games_count_key(version, searchkey, season=None):
+    return f"league:games-count:{version}:{season}:{md5(searchkey.encode()).hexdigest()}"
+
+
+def count_games(games, searchkey, season=None):
+    key = games_count_key(get_data_version(), searchkey, season)
+    return cache.get_or_set(key, games.count, settings.GAMES_COUNT_CACHE_TIMEOUT)
+
+
+async def acount_games(games, searchkey, season=None):
+    key = games_count_key(await aget_data_version(), searchkey, season)
+    count = await cache.aget(key)
+    if count is None:
+        count = await games.acount()
+        await cache.aset(key, count, settings.GAMES_COUNT_CACHE_TIMEOUT)
+    return count
+
+
+def keyset_queryset(games, column_index, dir, cursor):
+    if cursor:
+        cursor_column, cursor_dir, value, last_id = decode_cursor(cursor)
+        if (cursor_column, cursor_dir) != (column_index, dir):
+            raise ValueError("Cursor does not match the requested order.")
+        column = GAME_ORDER_COLUMNS[column_index]
+        lookup = 'lt' if dir == 'desc' else 'gt'
+        games = games.filter(Q(**{f'{column}__{lookup}': value}) | Q(**{column: value, f'id__{lookup}': last_id}))
+    return order_games(query=games, column_index=column_index, dir=dir).values_list(*GAME_LIST_COLUMNS)
+
+
+def keyset_page(page, length, column_index, dir):
+    next_cursor = None
+    if len(page) > length:
+        page = page[:length]
+        next_cursor = encode_cursor([column_index, dir, page[-1][column_index], page[-1][0]])
+    return [dict(zip(GAME_LIST_KEYS, game)) for game in page], next_cursor
+
+
+def get_keyset_games(searchkey, length, order_by, cursor=None, season=None):
+    column_index, dir = order_by['column'], order_by['dir']
+    games = search_games_by_searchkey(query=season_games(season), searchkey=searchkey)
+    filtered_total = count_games(games, searchkey, season)
+    games = keyset_queryset(games, column_index, dir, cursor)
+    data, next_cursor = keyset_page(list(games[:length + 1]), length, column_index, dir)
+    return {
+        'data': data,
+        'recordsFiltered': filtered_total,
+        'recordsTotal': count_games(season_games(season), '', season),
+        'cursor': next_cursor,
+    }
+
+
+async def aget_keyset_games(searchkey, length, order_by, cursor=None, season=None):
+    column_index, dir = order_by['column'], order_by['dir']
+    games = search_games_by_searchkey(query=season_games(season), searchkey=searchkey)
+    filtered_total = await acount_games(games, searchkey, season)
+    games = keyset_queryset(games, column_index, dir, cursor)
+    data, next_cursor = keyset_page([game async for game in games[:length + 1]], length, column_index, dir)
+    return {
+        'data': data,
+        'recordsFiltered': filtered_total,
+        'recordsTotal': await acount_games(season_games(season), '', season),
+        'cursor': next_cursor,
+    }
+
+
 def search_teams_by_searchkey(teams_list, searchkey):
-    return [team for team in teams_list if searchkey.lower() in team["name"].lower()]
+    names = set(search_teams(searchkey).values_list('name', flat=True))
+    return [team for team in teams_list if team["name"] in names]
 
 
 def order_teams_by_rank(teams_list, direction):
@@ -82,19 +436,154 @@ def order_teams_by_rank(teams_list, direction):
     return teams_list
 
 
-def get_ranked_teams(searchkey, start, length, order_by):
-    teams = Team.objects.all()
-    total = teams.aggregate(Count("id"))["id__count"]
-    strategy = FirstStrategy()
-    ranker = RankingSystem(strategy)
-    sorted_teams = ranker.rank_teams(teams)
-    for index, team in enumerate(sorted_teams):
-        team['rank'] = index + 1
-    filtered_ranks_by_search_key = search_teams_by_searchkey(teams_list=sorted_teams, searchkey=searchkey)
-    filtered_ordered_teams = order_teams_by_rank(teams_list=filtered_ranks_by_search_key, direction=order_by['dir'])
-    filtered_total = len(filtered_ordered_teams)
-    if start + length < total:
-        filtered_ordered_paginated_teams = filtered_ordered_teams[start: (start + length)]
+class RankingSnapshot:
+    def __init__(self, version, ranked_teams):
+        self.version = version
+        self.ids = array('q')
+        self.names = []
+        self.lower_names = []
+        self.points = array('q')
+        self.ranks = array('q')
+        for index, (team_id, name, points) in enumerate(ranked_teams):
+            self.ids.append(team_id)
+            self.names.append(name)
+            self.lower_names.append(name.lower())
+            self.points.append(points)
+            self.ranks.append(index + 1)
+
+    def __len__(self):
+        return len(self.ids)
+
+    def search(self, searchkey):
+        if not searchkey:
+            return list(range(len(self)))
+        searchkey = searchkey.lower()
+        return [index for index, name in enumerate(self.lower_names) if searchkey in name]
+
+    def row(self, index):
+        return {'name': self.names[index], 'points': self.points[index], 'rank': self.ranks[index]}
+
+
+# One snapshot per season, None being the whole league, for the
+# RANKING_SNAPSHOT_SEASONS most recently used seasons. Snapshots of an older data
+# version are dropped whenever a new one is stored.
+_ranking_snapshots = OrderedDict()
+_ranking_snapshots_lock = threading.Lock()
+
+
+def parse_season(value):
+    if value is None or value == '':
+        return None
+    if isinstance(value, bool) or not isinstance(value, (int, str)) or not str(value).isdigit():
+        raise ValueError(f"Invalid season: {value!r}.")
+    return int(value)
+
+
+# Request threads and the event loop share the snapshots, so every read and
+# write holds the lock; snapshots themselves are built outside it.
+def cached_ranking_snapshot(season, version):
+    with _ranking_snapshots_lock:
+        snapshot = _ranking_snapshots.get(season)
+        if snapshot is None or snapshot.version != version:
+            return None
+        _ranking_snapshots.move_to_end(season)
+        return snapshot
+
+
+def store_ranking_snapshot(season, snapshot):
+    with _ranking_snapshots_lock:
+        for stale in [key for key, cached in _ranking_snapshots.items() if cached.version != snapshot.version]:
+            del _ranking_snapshots[stale]
+        _ranking_snapshots[season] = snapshot
+        _ranking_snapshots.move_to_end(season)
+        while len(_ranking_snapshots) > settings.RANKING_SNAPSHOT_SEASONS:
+            _ranking_snapshots.popitem(last=False)
+    return snapshot
+
+
+def ranked_team_rows(season=None):
+    if season is None:
+        return StandingsStrategy().ranked_queryset(Team.objects.all()).values_list('id', 'name', 'points')
+    standings = SeasonStanding.objects.filter(season_id=season).annotate(name=F('team__name'))
+    return standings.order_by(*standings_ordering()).values_list('team_id', 'name', 'points')
+
+
+def get_ranking_snapshot(season=None):
+    version = get_data_version()
+    snapshot = cached_ranking_snapshot(season, version)
+    if snapshot is None:
+        snapshot = store_ranking_snapshot(season, RankingSnapshot(version, ranked_team_rows(season)))
+    return snapshot
+
+
+async def aget_ranking_snapshot(season=None):
+    version = await aget_data_version()
+    snapshot = cached_ranking_snapshot(season, version)
+    if snapshot is None:
+        ranked_teams = [team async for team in ranked_team_rows(season)]
+        snapshot = store_ranking_snapshot(season, RankingSnapshot(version, ranked_teams))
+    return snapshot
+
+
+def parse_moment(value, field):
+    moment = parse_datetime(value) if isinstance(value, str) else None
+    if moment is None:
+        raise ValueError(f"Invalid {field} datetime: {value!r}.")
+    if timezone.is_naive(moment):
+        moment = timezone.make_aware(moment)
+    return moment
+
+
+def parse_as_of(value):
+    return parse_moment(value, 'as_of')
+
+
+# Games written without a played_at are played when they are written.
+def parse_played_at(value):
+    if value is None or value == '':
+        return None
+    return parse_moment(value, 'played_at')
+
+
+def standings_sort_key(stats):
+    tie_breakers = ConfigurableStrategy.tie_breaker_keys
+    return (-stats['points'], *(tie_breakers[key](stats) for key in standing_tie_breakers()), stats['name'])
+
+
+def get_historical_snapshot(as_of, season=None):
+    totals = standings_as_of(as_of, season_id=season)
+    stats = []
+    for team_id, name in season_teams(season).values_list('id', 'name'):
+        team_stats = Counter(totals.get(team_id, ()))
+        team_stats['id'], team_stats['name'] = team_id, name
+        stats.append(team_stats)
+    stats.sort(key=standings_sort_key)
+    return RankingSnapshot(None, [(team['id'], team['name'], team['points']) for team in stats])
+
+
+def snapshot_page(snapshot, searchkey, start, length, order_by):
+    positions = snapshot.search(searchkey)
+    positions = order_teams_by_rank(teams_list=positions, direction=order_by['dir'])
+    return {
+        'data': [snapshot.row(index) for index in positions[start:start + length]],
+        'recordsFiltered': len(positions),
+        'recordsTotal': len(snapshot),
+    }
+
+
+def get_ranked_teams(searchkey, start, length, order_by, as_of=None, season=None):
+    season = parse_season(season)
+    if as_of:
+        snapshot = get_historical_snapshot(parse_as_of(as_of), season)
+    else:
+        snapshot = get_ranking_snapshot(season)
+    return snapshot_page(snapshot, searchkey, start, length, order_by)
+
+
+async def aget_ranked_teams(searchkey, start, length, order_by, as_of=None, season=None):
+    season = parse_season(season)
+    if as_of:
+        snapshot = await sync_to_async(get_historical_snapshot)(parse_as_of(as_of), season)
     else:
-        filtered_ordered_paginated_teams = filtered_ordered_teams[start:]
-    return {'data': filtered_ordered_paginated_teams, 'recordsFiltered': filtered_total, 'recordsTotal': total}
+        snapshot = await aget_ranking_snapshot(season)
+    return snapshot_page(snapshot, searchkey, start, length, order_by)
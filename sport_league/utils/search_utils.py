@@ -0,0 +1,38 @@
+# Django Imports
+from django.db.models import Count
+
+# App Imports
+from core.models import Team, TeamNameGram
+
+GRAM_SIZE = 3
+
+
+def name_grams(name):
+    name = name.lower()
+    return {name[index:index + GRAM_SIZE] for index in range(len(name) - GRAM_SIZE + 1)}
+
+
+def index_team_names(teams, replace=True):
+    teams = list(teams)
+    if replace:
+        TeamNameGram.objects.filter(team__in=teams).delete()
+    TeamNameGram.objects.bulk_create(
+        [TeamNameGram(team=team, gram=gram) for team in teams for gram in name_grams(team.name)],
+        batch_size=1000, ignore_conflicts=True
+    )
+
+
+# Both return lazy querysets, so callers filter with them as subqueries and no
+# list of ids is ever sent back to the database however many teams match.
+def search_teams(searchkey):
+    teams = Team.objects.filter(name__icontains=searchkey)
+    grams = name_grams(searchkey)
+    if not grams:
+        return teams
+    candidates = TeamNameGram.objects.filter(gram__in=grams).values('team_id')
+    candidates = candidates.annotate(matched=Count('gram')).filter(matched=len(grams)).values('team_id')
+    return teams.filter(id__in=candidates)
+
+
+def search_team_ids(searchkey):
+    return search_teams(searchkey).values_list('id', flat=True)
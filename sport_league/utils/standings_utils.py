@@ -0,0 +1,202 @@
+# Django Imports
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Q
+
+# App Imports
+from core.models import Game, SeasonStanding, Standing, StandingCheckpoint, StandingCheckpointRow
+from utils.cache_utils import bump_data_version
+from utils.metrics_utils import observe
+
+# 3rd Party Imports
+from collections import Counter, defaultdict
+import time
+
+
+# Every table, stored or computed, scores results with LEAGUE_RANKING['points'].
+def league_points():
+    points = settings.LEAGUE_RANKING['points']
+    return points['win'], points['draw'], points['loss']
+
+
+def add_game_result(deltas, host_team_id, host_team_score, guest_team_id, guest_team_score, sign=1):
+    host_team_score, guest_team_score = int(host_team_score), int(guest_team_score)
+    win, draw, loss = league_points()
+    sides = (
+        (host_team_id, host_team_score, guest_team_score),
+        (guest_team_id, guest_team_score, host_team_score),
+    )
+    for team_id, scored, conceded in sides:
+        team_deltas = deltas[team_id]
+        team_deltas['played'] += sign
+        team_deltas['goals_for'] += sign * scored
+        team_deltas['goals_against'] += sign * conceded
+        if scored > conceded:
+            team_deltas['wins'] += sign
+            team_deltas['points'] += sign * win
+        elif scored == conceded:
+            team_deltas['draws'] += sign
+            team_deltas['points'] += sign * draw
+        else:
+            team_deltas['losses'] += sign
+            team_deltas['points'] += sign * loss
+    return deltas
+
+
+STANDING_FIELDS = ('played', 'wins', 'draws', 'losses', 'points', 'goals_for', 'goals_against')
+
+
+def season_standings(season_id=None):
+    if season_id is None:
+        return Standing.objects.all()
+    return SeasonStanding.objects.filter(season_id=season_id)
+
+
+def standings_update_sql(model, scope):
+    quote = connection.ops.quote_name
+    columns = [quote(model._meta.get_field(field).column) for field in STANDING_FIELDS]
+    keys = [quote(model._meta.get_field(field).column) for field in ('team_id', *scope)]
+    return (
+        f"UPDATE {quote(model._meta.db_table)} SET {', '.join(f'{column} = {column} + %s' for column in columns)} "
+        f"WHERE {' AND '.join(f'{key} = %s' for key in keys)}"
+    )
+
+
+# Missing rows are created empty first, then every row is changed with
+# `field = field + delta`, so the database adds the deltas and concurrent
+# writers cannot lose each other's updates. One executemany covers every team.
+# Removals pass create=False: a team whose row is gone, e.g. one being deleted
+# with its games, has nothing left to subtract from.
+@transaction.atomic
+def apply_standings_deltas(deltas, season_id=None, create=True):
+    model = Standing if season_id is None else SeasonStanding
+    scope = {} if season_id is None else {'season_id': season_id}
+    deltas = {team_id: team_deltas for team_id, team_deltas in deltas.items() if any(team_deltas.values())}
+    if create:
+        model.objects.bulk_create(
+            [model(team_id=team_id, **scope) for team_id in deltas], batch_size=500, ignore_conflicts=True
+        )
+    params = [
+        (*(team_deltas[field] for field in STANDING_FIELDS), team_id, *scope.values())
+        for team_id, team_deltas in deltas.items()
+    ]
+    with connection.cursor() as cursor:
+        cursor.executemany(standings_update_sql(model, scope), params)
+
+
+def join_season(season_id, team_ids):
+    SeasonStanding.objects.bulk_create(
+        [SeasonStanding(season_id=season_id, team_id=team_id) for team_id in team_ids],
+        batch_size=500, ignore_conflicts=True
+    )
+
+
+def record_game(game, sign=1):
+    deltas = add_game_result(
+        defaultdict(Counter), host_team_id=game.host_team_id, host_team_score=game.host_team_score,
+        guest_team_id=game.guest_team_id, guest_team_score=game.guest_team_score, sign=sign
+    )
+    apply_standings_deltas(deltas, create=sign > 0)
+    if game.season_id:
+        apply_standings_deltas(deltas, season_id=game.season_id, create=sign > 0)
+
+
+@transaction.atomic
+def rebuild_standings():
+    started = time.perf_counter()
+    deltas = defaultdict(Counter)
+    season_deltas = defaultdict(lambda: defaultdict(Counter))
+    games = Game.objects.values_list(
+        'season_id', 'host_team_id', 'host_team_score', 'guest_team_id', 'guest_team_score'
+    )
+    for season_id, host_team_id, host_team_score, guest_team_id, guest_team_score in games.iterator():
+        add_game_result(deltas, host_team_id, host_team_score, guest_team_id, guest_team_score)
+        if season_id:
+            add_game_result(season_deltas[season_id], host_team_id, host_team_score, guest_team_id, guest_team_score)
+    Standing.objects.all().delete()
+    Standing.objects.bulk_create(
+        [Standing(team_id=team_id, **team_deltas) for team_id, team_deltas in deltas.items()]
+    )
+    # Season rows are reset rather than deleted so members without games stay in their season.
+    SeasonStanding.objects.update(**{field: 0 for field in STANDING_FIELDS})
+    for season_id, team_deltas in season_deltas.items():
+        apply_standings_deltas(team_deltas, season_id=season_id)
+    bump_data_version()
+    observe('league_standings_rebuild_duration_seconds', time.perf_counter() - started)
+    return len(deltas)
+
+
+def games_after(played_at, game_id):
+    return Q(played_at__gt=played_at) | Q(played_at=played_at, id__gt=game_id)
+
+
+def checkpoint_totals(checkpoint):
+    totals = defaultdict(Counter)
+    for row in checkpoint.rows.values('team_id', *STANDING_FIELDS):
+        totals[row.pop('team_id')].update(row)
+    return totals
+
+
+def latest_checkpoint(as_of=None):
+    checkpoints = StandingCheckpoint.objects.order_by('-played_at', '-last_game_id')
+    if as_of is not None:
+        checkpoints = checkpoints.filter(played_at__lte=as_of)
+    return checkpoints.first()
+
+
+def save_checkpoint(totals, played_at, last_game_id, games_count):
+    checkpoint = StandingCheckpoint.objects.create(
+        played_at=played_at, last_game_id=last_game_id, games_count=games_count
+    )
+    StandingCheckpointRow.objects.bulk_create(
+        [StandingCheckpointRow(checkpoint=checkpoint, team_id=team_id, **team_totals)
+         for team_id, team_totals in totals.items()],
+        batch_size=1000
+    )
+    return checkpoint
+
+
+@transaction.atomic
+def build_standing_checkpoints(every=None, rebuild=False):
+    every = every or settings.STANDINGS_CHECKPOINT_INTERVAL
+    if rebuild:
+        StandingCheckpoint.objects.all().delete()
+    checkpoint = latest_checkpoint()
+    games = Game.objects.order_by('played_at', 'id')
+    if checkpoint:
+        games = games.filter(games_after(checkpoint.played_at, checkpoint.last_game_id))
+    totals = checkpoint_totals(checkpoint) if checkpoint else defaultdict(Counter)
+    games_count = checkpoint.games_count if checkpoint else 0
+    created = 0
+    games = games.values_list(
+        'id', 'played_at', 'host_team_id', 'host_team_score', 'guest_team_id', 'guest_team_score'
+    )
+    for game_id, played_at, host_team_id, host_team_score, guest_team_id, guest_team_score in games.iterator():
+        add_game_result(totals, host_team_id, host_team_score, guest_team_id, guest_team_score)
+        games_count += 1
+        if games_count % every == 0:
+            save_checkpoint(totals, played_at, game_id, games_count)
+            created += 1
+    return created
+
+
+def invalidate_standing_checkpoints(played_at):
+    StandingCheckpoint.objects.filter(played_at__gte=played_at).delete()
+
+
+# Checkpoints cover every game, so a season is replayed from its own games,
+# which only costs as much as the season is large.
+def standings_as_of(as_of, season_id=None):
+    if season_id is not None:
+        checkpoint = None
+        games = Game.objects.filter(season_id=season_id, played_at__lte=as_of)
+    else:
+        checkpoint = latest_checkpoint(as_of)
+        games = Game.objects.filter(played_at__lte=as_of)
+    totals = checkpoint_totals(checkpoint) if checkpoint else defaultdict(Counter)
+    if checkpoint:
+        games = games.filter(games_after(checkpoint.played_at, checkpoint.last_game_id))
+    games = games.values_list('host_team_id', 'host_team_score', 'guest_team_id', 'guest_team_score')
+    for host_team_id, host_team_score, guest_team_id, guest_team_score in games.iterator():
+        add_game_result(totals, host_team_id, host_team_score, guest_team_id, guest_team_score)
+    return totals
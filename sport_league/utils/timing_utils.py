@@ -0,0 +1,112 @@
+# Django Imports
+from django.conf import settings
+
+# App Imports
+from utils.metrics_utils import observe
+
+# 3rd Party Imports
+from asgiref.sync import iscoroutinefunction
+from contextvars import ContextVar
+from functools import wraps
+import random
+import time
+
+current_query_timer = ContextVar('current_query_timer', default=None)
+
+
+class QueryTimer:
+    def __init__(self):
+        self.queries = 0
+        self.db_seconds = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries += 1
+            self.db_seconds += time.perf_counter() - started
+
+
+# Installed on every connection when it is opened. Connections are per thread
+# while the context variable follows the request into sync_to_async threads, so
+# queries of async views are counted too.
+def time_query(execute, sql, params, many, context):
+    query_timer = current_query_timer.get()
+    if query_timer is None:
+        return execute(sql, params, many, context)
+    return query_timer(execute, sql, params, many, context)
+
+
+def install_query_timer(sender, connection, **kwargs):
+    if time_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(time_query)
+
+
+class RequestTiming:
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.query_timer = QueryTimer()
+        self.operations = []
+
+    def elapsed(self):
+        return time.perf_counter() - self.started
+
+
+def should_sample():
+    rate = settings.REQUEST_TIMING_SAMPLE_RATE
+    return rate >= 1 or random.random() < rate
+
+
+# Operations may return anything, so only the body of a buffered response is measured.
+def response_size(response):
+    if getattr(response, 'streaming', True):
+        return None
+    return len(response.content)
+
+
+def record_operation(request, operation, started, queries, db_seconds, response):
+    elapsed = time.perf_counter() - started
+    observe('league_operation_duration_seconds', elapsed, operation=operation.__name__)
+    timing = getattr(request, 'timing', None)
+    if timing is not None:
+        timing.operations.append({
+            'operation': operation.__name__,
+            'duration_ms': elapsed * 1000,
+            'queries': timing.query_timer.queries - queries,
+            'db_ms': (timing.query_timer.db_seconds - db_seconds) * 1000,
+            'response_bytes': response_size(response),
+        })
+
+
+def query_totals(request):
+    timing = getattr(request, 'timing', None)
+    return (timing.query_timer.queries, timing.query_timer.db_seconds) if timing is not None else (0, 0.0)
+
+
+def instrumented(operation):
+    if iscoroutinefunction(operation):
+        @wraps(operation)
+        async def async_wrapper(request, *args, **kwargs):
+            started, (queries, db_seconds) = time.perf_counter(), query_totals(request)
+            response = await operation(request, *args, **kwargs)
+            record_operation(request, operation, started, queries, db_seconds, response)
+            return response
+        return async_wrapper
+
+    @wraps(operation)
+    def wrapper(request, *args, **kwargs):
+        started, (queries, db_seconds) = time.perf_counter(), query_totals(request)
+        response = operation(request, *args, **kwargs)
+        record_operation(request, operation, started, queries, db_seconds, response)
+        return response
+    return wrapper
+
+
+def server_timing_header(record):
+    metrics = [
+        f"total;dur={record['duration_ms']:.1f}",
+        f'db;dur={record["db_ms"]:.1f};desc="{record["queries"]} queries"',
+    ]
+    metrics += [f"{operation['operation']};dur={operation['duration_ms']:.1f}" for operation in record['operations']]
+    return ", ".join(metrics)